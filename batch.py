@@ -0,0 +1,305 @@
+# batch.py
+import argparse
+import json
+import sys
+from itertools import chain
+from statistics import NormalDist
+from typing import Dict, Sequence, Tuple
+import numpy as np
+
+# Governors whose choice depends only on the process; windowed governors
+# keep per-CPU state over time and need the scalar engine
+BATCH_GOVERNORS = ("priority", "performance", "powersave")
+
+_NEVER = np.iinfo(np.int64).max
+
+def pack_workloads(workloads: Sequence[Sequence[Tuple[int, int, int, int]]]) -> Dict[str, np.ndarray]:
+    """(batch, process) arrays from lists of (pid, arrival, burst, priority).
+
+    Shorter workloads are padded; ``count`` holds each workload's length.
+    """
+    if not len(workloads):
+        raise ValueError("No workloads to simulate")
+    count = np.array([len(records) for records in workloads], dtype=np.int64)
+    if not count.min():
+        raise ValueError("Every workload needs at least one process")
+    fields = chain.from_iterable(chain.from_iterable(workloads))
+    flat = np.fromiter(fields, dtype=np.int64, count=4 * int(count.sum())).reshape(-1, 4)
+    rows = np.repeat(np.arange(len(workloads)), count)
+    positions = np.arange(len(flat)) - np.repeat(np.cumsum(count) - count, count)
+    columns = {}
+    for i, name in enumerate(("pid", "arrival_time", "burst_time", "priority")):
+        columns[name] = np.zeros((len(workloads), int(count.max())), dtype=np.int64)
+        columns[name][rows, positions] = flat[:, i]
+    columns["count"] = count
+    return columns
+
+
+class BatchResult:
+    """Per-process results (batch, process) and per-workload CPU totals."""
+
+    def __init__(self, workloads, start_time, finish_time, energy, power_consumption, idle_time, switches):
+        self.workloads = workloads
+        self.start_time = start_time
+        self.finish_time = finish_time
+        self.energy = energy
+        self.power_consumption = power_consumption
+        self.idle_time = idle_time
+        self.switches = switches
+
+    def __len__(self):
+        return len(self.power_consumption)
+
+    def metrics(self) -> Dict[str, np.ndarray]:
+        # One value per workload, computed like simulation.calculate_metrics
+        w = self.workloads
+        valid = np.arange(w["arrival_time"].shape[1]) < w["count"][:, None]
+        turnaround = np.where(valid, self.finish_time - w["arrival_time"], 0)
+        waiting = turnaround - np.where(valid, w["burst_time"], 0)
+        response = np.where(valid, self.start_time - w["arrival_time"], 0)
+        return {
+            "avg_turnaround": turnaround.sum(axis=1) / w["count"],
+            "avg_waiting": waiting.sum(axis=1) / w["count"],
+            "avg_response": response.sum(axis=1) / w["count"],
+            "total_power": self.power_consumption,
+            "idle_time": self.idle_time,
+            "makespan": np.where(valid, self.finish_time, 0).max(axis=1),
+            "switches": self.switches,
+        }
+
+    def summary(self, confidence: float = 0.95) -> Dict[str, Dict[str, float]]:
+        """Ensemble mean, standard deviation and normal confidence interval."""
+        if not 0 < confidence < 1:
+            raise ValueError("Confidence must be in (0, 1)")
+        z = NormalDist().inv_cdf((1 + confidence) / 2)
+        result = {}
+        for name, values in self.metrics().items():
+            values = np.asarray(values, dtype=np.float64)
+            mean = float(values.mean())
+            std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+            half = z * std / np.sqrt(len(values))
+            result[name] = {"mean": mean, "std": std, "low": mean - half, "high": mean + half}
+        return result
+
+
+class _Rounds:
+    # State of the unfinished workloads, one row each; finished rows are
+    # dropped every round. The run queues are flat: ``slot`` lists every
+    # queued process as an index into the flattened (batch, process)
+    # arrays, row by row and in queue order, so a round touches only real
+    # slices, and ``fresh`` marks the ones about to run for the first time.
+    ROW_ARRAYS = ("ids", "base", "wide_base", "cursor", "length", "now", "current_frequency",
+                  "power_consumption", "idle_time", "switches")
+
+    def __init__(self, w, max_frequency):
+        arrival, count = w["arrival_time"], w["count"]
+        batch, width = arrival.shape
+        self.width = width
+
+        # Arrival-sorted order per workload; padding sorts last and never
+        # arrives, and a spare last column stops every cursor
+        padded = np.where(np.arange(width) < count[:, None], arrival, _NEVER)
+        self.order = np.argsort(padded, axis=1, kind="stable").ravel()
+        self.arrivals = np.hstack([np.take_along_axis(padded, self.order.reshape(batch, width), axis=1),
+                                   np.full((batch, 1), _NEVER)]).ravel()
+
+        self.ids = np.arange(batch)
+        self.base = self.ids * width
+        self.wide_base = self.ids * (width + 1)
+        self.cursor = np.zeros(batch, dtype=np.int64)
+        self.length = np.zeros(batch, dtype=np.int64)
+        self.now = np.zeros(batch, dtype=np.int64)
+        self.current_frequency = np.full(batch, max_frequency, dtype=np.float64)
+        self.power_consumption = np.zeros(batch)
+        self.idle_time = np.zeros(batch, dtype=np.int64)
+        self.switches = np.zeros(batch, dtype=np.int64)
+        self.slot = np.zeros(0, dtype=np.int64)
+        self.fresh = np.zeros(0, dtype=np.int64)
+
+    def keep(self, rows):
+        for name in self.ROW_ARRAYS:
+            setattr(self, name, getattr(self, name)[rows])
+
+    def due(self, rows):
+        # How many arrivals from each row's cursor on are due by now; the one
+        # at the cursor is, and rows with more binary search for the rest
+        limit, base = self.now[rows], self.wide_base[rows]
+        end = self.cursor[rows] + 1
+        more = np.flatnonzero(self.arrivals[base + end] <= limit)
+        if len(more):
+            low, high = end[more] + 1, np.full(len(more), self.width)
+            limit, base = limit[more], base[more]
+            while (low < high).any():
+                middle = (low + high) // 2
+                later = self.arrivals[base + middle] > limit
+                high = np.where(later, middle, high)
+                low = np.where(later, low, middle + 1)
+            end[more] = low
+        return end - self.cursor[rows]
+
+    def requeue(self, back, row, first, ends, start):
+        # Builds the next round's queues from the round that ended at now:
+        # processes with work left in run order, each followed by the
+        # arrivals up to the end of its slice, which the scalar engine admits
+        # before its next dequeue. A row left with nothing to run idles up to
+        # its next arrival instead.
+        length = np.bincount(row, weights=back, minlength=len(self.ids)).astype(np.int64)
+        upcoming = self.arrivals[self.wide_base + self.cursor]
+        idle = (length == 0) & (upcoming > self.now) & (upcoming != _NEVER)
+        if idle.any():
+            self.idle_time += np.where(idle, upcoming - self.now, 0)
+            self.now = np.where(idle, upcoming, self.now)
+        due = np.flatnonzero(upcoming <= self.now)
+        back = np.flatnonzero(back)
+        queue, fresh = self.slot[back], np.zeros(0, dtype=np.int64)
+
+        if len(due):
+            count = self.due(due)
+            length[due] += count
+            arrival = np.repeat(due, count)
+            column = np.arange(len(arrival)) + np.repeat(self.cursor[due] - (np.cumsum(count) - count), count)
+            self.cursor[due] += count
+            picked = self.order[self.base[arrival] + column]
+            # Times since the round start, offset so that they increase
+            # across rows. A re-queued process goes in after the arrivals up
+            # to the start of its slice, and ahead of the later ones.
+            span = self.now - start + 1
+            shift = np.cumsum(span) - span - start
+            offset = np.repeat(shift, self.length)
+            keys = self.arrivals[self.wide_base[arrival] + column] + shift[arrival]
+            begins = np.empty_like(ends)
+            if len(ends):
+                begins[1:] = ends[:-1]
+                begins[first] = start
+            queue_keys = (begins + offset)[back]
+            # Each slice's arrivals go in index order like scheduler.SortedArrivals
+            if ((arrival[1:] == arrival[:-1]) & (picked[1:] < picked[:-1])).any():
+                group = np.searchsorted(ends + offset, keys)
+                picked = picked[np.lexsort((picked, group, arrival))]
+            order = np.argsort(np.concatenate([keys, queue_keys]), kind="stable")
+            queue = np.concatenate([self.base[arrival] + picked, queue])[order]
+            fresh = np.flatnonzero(order < len(arrival))
+        self.slot, self.fresh, self.length = queue, fresh, length
+
+
+def simulate_batch(workloads, time_quantum: int, base_power: float = 100.0, max_frequency: float = 3.0,
+                   min_frequency: float = 1.0, governor: str = "priority", switch_latency: int = 0,
+                   switch_energy: float = 0.0, speed_scaling: bool = False) -> BatchResult:
+    """Round robin over many independent workloads in lockstep.
+
+    ``workloads`` is a list of record lists or the output of
+    pack_workloads. Every workload goes through exactly the steps of
+    round_robin_scheduling on a CPU with these parameters with the same
+    arithmetic, so per-process times and energies are identical; each loop
+    iteration runs a whole round, one slice for every queued process of
+    every unfinished workload.
+    """
+    if time_quantum <= 0:
+        raise ValueError("Time quantum must be positive")
+    if governor not in BATCH_GOVERNORS:
+        raise ValueError(f"Batch simulation supports the {', '.join(BATCH_GOVERNORS)} governors")
+    if switch_latency < 0 or switch_energy < 0:
+        raise ValueError("Frequency switch costs must not be negative")
+    w = workloads if isinstance(workloads, dict) else pack_workloads(workloads)
+    batch, width = w["arrival_time"].shape
+    start_time = np.full(batch * width, -1, dtype=np.int64)
+    finish_time = np.full(batch * width, -1, dtype=np.int64)
+    energy = np.zeros(batch * width)
+    totals = {name: np.zeros(batch, dtype=dtype) for name, dtype in (
+        ("power_consumption", np.float64), ("idle_time", np.int64), ("switches", np.int64))}
+
+    # The batch governors fix each process's frequency, and so its power, up front
+    if governor == "priority":
+        frequency = np.where(w["priority"].ravel() == 1, max_frequency, min_frequency)
+    else:
+        frequency = np.full(batch * width, max_frequency if governor == "performance" else min_frequency)
+    power = base_power * (frequency / max_frequency)
+    remaining = w["burst_time"].ravel().copy()
+
+    s = _Rounds(w, max_frequency)
+    # The first arrivals are admitted like after an empty round
+    none = np.zeros(0, dtype=np.int64)
+    s.requeue(none.astype(bool), none, none, none, s.now)
+    while len(s.ids):
+        first = np.cumsum(s.length) - s.length
+        last = first + s.length - 1
+        row = np.repeat(np.arange(len(s.ids)), s.length)
+        slot = s.slot
+        left = remaining[slot]
+        units = np.minimum(left, time_quantum)
+
+        selected = frequency[slot]
+        previous = np.empty_like(selected)
+        previous[1:] = selected[:-1]
+        previous[first] = s.current_frequency
+        switched = selected != previous
+        s.switches += np.bincount(row, weights=switched, minlength=len(s.ids)).astype(np.int64)
+        s.current_frequency = selected[last]
+
+        if speed_scaling:
+            run_time = np.ceil(units * max_frequency / selected - 1e-9).astype(np.int64)
+        else:
+            run_time = units
+        cost = power[slot] * run_time
+        if switch_energy:
+            cost = np.where(switched, switch_energy + cost, cost)
+        energy[slot] += cost
+        # Unbuffered, so the CPU totals add the slices one by one in run order
+        np.add.at(s.power_consumption, row, cost)
+
+        elapsed = run_time + switched * switch_latency if switch_latency else run_time
+        ends = np.cumsum(elapsed)
+        ends += np.repeat(s.now - ends[first] + elapsed[first], s.length)
+        start_time[slot[s.fresh]] = ends[s.fresh] - elapsed[s.fresh]
+        left -= units
+        remaining[slot] = left
+        finished = np.flatnonzero(left == 0)
+        finish_time[slot[finished]] = ends[finished]
+        start = s.now
+        s.now = ends[last]
+        s.requeue(left > 0, row, first, ends, start)
+
+        done = s.length == 0
+        if done.any():
+            for name, out in totals.items():
+                out[s.ids[done]] = getattr(s, name)[done]
+            s.keep(~done)
+
+    return BatchResult(w, start_time.reshape(batch, width), finish_time.reshape(batch, width),
+                       energy.reshape(batch, width), **totals)
+
+
+def main(argv=None) -> int:
+    from benchmarks.workloads import GENERATORS, generate
+    parser = argparse.ArgumentParser(prog="python -m batch",
+                                     description="Monte Carlo ensemble of random workloads in one batched run")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="poisson")
+    parser.add_argument("--batch", type=int, default=1000, help="number of workloads")
+    parser.add_argument("--processes", type=int, default=50, help="processes per workload")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first workload")
+    parser.add_argument("--time-quantum", type=int, default=3)
+    parser.add_argument("--base-power", type=float, default=100.0)
+    parser.add_argument("--max-frequency", type=float, default=3.0)
+    parser.add_argument("--min-frequency", type=float, default=1.0)
+    parser.add_argument("--governor", choices=BATCH_GOVERNORS, default="priority")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    args = parser.parse_args(argv)
+    if args.batch <= 0 or args.processes <= 0:
+        parser.error("--batch and --processes must be positive")
+
+    workloads = [generate(args.generator, args.processes, seed=args.seed + b) for b in range(args.batch)]
+    try:
+        result = simulate_batch(workloads, args.time_quantum, base_power=args.base_power,
+                                max_frequency=args.max_frequency, min_frequency=args.min_frequency,
+                                governor=args.governor)
+        summary = result.summary(args.confidence)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    json.dump(summary, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2 @@
+# benchmarks/__init__.py
+from benchmarks.workloads import GENERATORS, generate
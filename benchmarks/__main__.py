@@ -0,0 +1,64 @@
+# benchmarks/__main__.py
+import argparse
+import sys
+from benchmarks.harness import TARGETS, compare, load_results, run_suite, save_results
+from benchmarks.startup import GUI_STARTUP_BUDGET, STARTUP_BUDGET, check_startup, measure_gui_startup, measure_startup
+from benchmarks.workloads import GENERATORS
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Simulator benchmark suite")
+    parser.add_argument("--targets", nargs="+", choices=TARGETS, default=list(TARGETS))
+    parser.add_argument("--generators", nargs="+", choices=sorted(GENERATORS), default=["poisson"])
+    parser.add_argument("--sizes", nargs="+", type=lambda s: int(float(s)), default=[1_000, 10_000, 100_000],
+                        help="process counts, e.g. 1e3 1e5 1e7")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-quantum", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak-memory runs")
+    parser.add_argument("--max-plot-size", type=lambda s: int(float(s)), default=100_000)
+    parser.add_argument("--output", help="write results as JSON")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown/growth (fraction)")
+    parser.add_argument("--no-startup", action="store_true", help="skip the CLI and GUI startup checks")
+    parser.add_argument("--startup-budget", type=float, default=STARTUP_BUDGET, help="CLI startup budget (seconds)")
+    parser.add_argument("--gui-startup-budget", type=float, default=GUI_STARTUP_BUDGET,
+                        help="GUI time-to-first-window budget (seconds)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.targets, args.generators, args.sizes, seed=args.seed,
+                        time_quantum=args.time_quantum, repeat=args.repeat, memory=not args.no_memory,
+                        max_plot_size=args.max_plot_size)
+    failed = False
+    if not args.no_startup:
+        startup = measure_startup()
+        results["startup"] = startup
+        print(f"startup    cli {startup['seconds'] * 1000:>8.1f} ms  (imports {startup['import_seconds'] * 1000:.1f} ms)")
+        for line in check_startup(startup, args.startup_budget):
+            print(f"STARTUP {line}")
+            failed = True
+        gui_startup = measure_gui_startup()
+        if gui_startup is None:
+            print("startup    gui  skipped (no display)")
+        else:
+            results["gui_startup"] = gui_startup
+            print(f"startup    gui  {gui_startup['seconds'] * 1000:>8.1f} ms  "
+                  f"(first window {gui_startup['window_seconds'] * 1000:.1f} ms)")
+            for line in check_startup(gui_startup, args.gui_startup_budget):
+                print(f"STARTUP {line}")
+                failed = True
+    if args.output:
+        save_results(results, args.output)
+
+    if args.compare:
+        regressions = compare(results, load_results(args.compare), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+# benchmarks/harness.py
+import gc
+import json
+import platform
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+from scheduler import Process, CPU, round_robin_scheduling
+from simulation import calculate_metrics
+from benchmarks.workloads import generate
+
+TARGETS = ("scheduler", "metrics", "plotting", "batch")
+
+# Processes per workload for the batch target
+BATCH_WIDTH = 50
+
+
+def _prepare_scheduler(records, time_quantum):
+    processes = [Process(*r) for r in records]
+    cpu = CPU()
+    return lambda: round_robin_scheduling(processes, time_quantum, cpu)
+
+
+def _prepare_metrics(records, time_quantum):
+    cpu = CPU(history="none")
+    completed = round_robin_scheduling([Process(*r) for r in records], time_quantum, cpu)
+    return lambda: calculate_metrics(completed, cpu)
+
+
+def _prepare_plotting(records, time_quantum):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import visualization
+
+    cpu = CPU()
+    completed = round_robin_scheduling([Process(*r) for r in records], time_quantum, cpu)
+
+    def run():
+        visualization.visualize_power_consumption(completed, cpu)
+        visualization.visualize_gantt_chart(completed)
+        visualization.visualize_frequency_usage(cpu)
+        for number in plt.get_fignums():
+            plt.figure(number).canvas.draw()
+        plt.close("all")
+
+    return run
+
+
+def _prepare_batch(records, time_quantum):
+    # The same processes as an ensemble of BATCH_WIDTH-process workloads,
+    # packed up front; against "scheduler" this is the batch speedup
+    from batch import pack_workloads, simulate_batch
+
+    workloads = pack_workloads([records[i:i + BATCH_WIDTH] for i in range(0, len(records), BATCH_WIDTH)])
+    return lambda: simulate_batch(workloads, time_quantum)
+
+
+PREPARE: Dict[str, Callable] = {
+    "scheduler": _prepare_scheduler,
+    "metrics": _prepare_metrics,
+    "plotting": _prepare_plotting,
+    "batch": _prepare_batch,
+}
+
+
+def _time_once(run: Callable) -> float:
+    gc.collect()
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+
+def _peak_memory(run: Callable) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(target: str, generator: str, size: int, seed: int = 0, time_quantum: int = 3,
+            repeat: int = 3, memory: bool = True) -> Dict:
+    if target not in PREPARE:
+        raise ValueError(f"Unknown benchmark target: {target}")
+    records = generate(generator, size, seed=seed)
+
+    # Each repetition gets fresh state; the fastest run is reported
+    timings = [_time_once(PREPARE[target](records, time_quantum)) for _ in range(repeat)]
+    seconds = min(timings)
+    result = {
+        "target": target,
+        "generator": generator,
+        "size": size,
+        "seconds": seconds,
+        "processes_per_second": size / seconds if seconds > 0 else float("inf"),
+    }
+    if memory:
+        # tracemalloc slows execution down, so memory gets its own run
+        result["peak_memory_bytes"] = _peak_memory(PREPARE[target](records, time_quantum))
+    return result
+
+
+def run_suite(targets: Sequence[str], generators: Sequence[str], sizes: Sequence[int], seed: int = 0,
+              time_quantum: int = 3, repeat: int = 3, memory: bool = True, max_plot_size: int = 100_000,
+              log: Callable[[str], None] = print) -> Dict:
+    results = []
+    for target in targets:
+        for generator in generators:
+            for size in sizes:
+                if target == "plotting" and size > max_plot_size:
+                    continue
+                result = measure(target, generator, size, seed, time_quantum, repeat, memory)
+                log(f"{target:<10} {generator:<9} {size:>10,}  "
+                    f"{result['processes_per_second']:>14,.0f} proc/s"
+                    + (f"  {result['peak_memory_bytes'] / 1e6:>9.1f} MB" if memory else ""))
+                results.append(result)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": seed,
+            "time_quantum": time_quantum,
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float = 0.10) -> List[str]:
+    # A regression is throughput falling, or peak memory rising, by more
+    # than threshold (a fraction) against the same target/generator/size.
+    def key(result):
+        return result["target"], result["generator"], result["size"]
+
+    reference = {key(r): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = reference.get(key(result))
+        if base is None:
+            continue
+        label = "{} {} {}".format(*key(result))
+        speed = result["processes_per_second"] / base["processes_per_second"]
+        if speed < 1 - threshold:
+            regressions.append(f"{label}: throughput {speed - 1:+.1%}")
+        if "peak_memory_bytes" in result and base.get("peak_memory_bytes"):
+            growth = result["peak_memory_bytes"] / base["peak_memory_bytes"]
+            if growth > 1 + threshold:
+                regressions.append(f"{label}: peak memory {growth - 1:+.1%}")
+    return regressions
+
+
+def load_results(filepath: str) -> Dict:
+    with open(filepath, 'r') as f:
+        return json.load(f)
+
+
+def save_results(results: Dict, filepath: str):
+    with open(filepath, 'w') as f:
+        json.dump(results, f, indent=2)
@@ -0,0 +1,95 @@
+# benchmarks/loadtest.py
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+from typing import Dict, List
+from metrics import QuantileSketch
+from benchmarks.workloads import GENERATORS, generate
+
+
+def make_payloads(generator: str, processes: int, distinct: int, time_quantum: int = 3) -> List[bytes]:
+    # ``distinct`` different workloads; requests cycle through them, so
+    # fewer distinct payloads means more coalescing on the server
+    return [json.dumps({"processes": generate(generator, processes, seed=seed), "time_quantum": time_quantum}).encode()
+            for seed in range(distinct)]
+
+
+async def _client(host: str, port: int, path: str, payloads: List[bytes], deadline: float, offset: int,
+                  results: Dict):
+    reader, writer = await asyncio.open_connection(host, port)
+    sent = offset
+    try:
+        while time.perf_counter() < deadline:
+            body = payloads[sent % len(payloads)]
+            sent += 1
+            request = (f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                       f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                if name.lower() == "content-length":
+                    length = int(value)
+            await reader.readexactly(length)
+            results["latency"].add((time.perf_counter() - started) * 1000)
+            results["status"][status] += 1
+    finally:
+        writer.close()
+
+
+async def load_test(host: str, port: int, payloads: List[bytes], concurrency: int = 16, duration: float = 10.0,
+                    path: str = "/simulate") -> Dict:
+    """Keep ``concurrency`` keep-alive connections busy for ``duration`` seconds."""
+    results = {"latency": QuantileSketch(), "status": Counter()}
+    started = time.perf_counter()
+    deadline = started + duration
+    await asyncio.gather(*(_client(host, port, path, payloads, deadline, i, results) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    latency = results["latency"]
+    return {
+        "requests": latency.count,
+        "seconds": elapsed,
+        "requests_per_second": latency.count / elapsed,
+        "status": dict(results["status"]),
+        "p50_ms": latency.quantile(0.5),
+        "p95_ms": latency.quantile(0.95),
+        "p99_ms": latency.quantile(0.99),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.loadtest", description="Load test python -m server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=16, help="concurrent connections")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="poisson")
+    parser.add_argument("--processes", type=int, default=1000, help="processes per request")
+    parser.add_argument("--distinct", type=int, default=64, help="distinct workloads to cycle through")
+    args = parser.parse_args(argv)
+    if args.concurrency <= 0 or args.distinct <= 0:
+        parser.error("--concurrency and --distinct must be positive")
+
+    payloads = make_payloads(args.generator, args.processes, args.distinct)
+    try:
+        report = asyncio.run(load_test(args.host, args.port, payloads, args.concurrency, args.duration))
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"{report['requests']} requests in {report['seconds']:.1f}s: {report['requests_per_second']:.1f} req/s")
+    print(f"latency p50 {report['p50_ms']:.1f} ms  p95 {report['p95_ms']:.1f} ms  p99 {report['p99_ms']:.1f} ms")
+    print(f"status {report['status']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# benchmarks/startup.py
+import os
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional, Sequence
+
+# Wall-clock budget for `python -m cli --help`, interpreter start included
+STARTUP_BUDGET = 0.25
+
+# Modules the headless CLI must not load unless plots are requested
+HEAVY_MODULES = ("matplotlib", "tkinter", "numpy")
+
+# Time to the GUI's first window, interpreter start included; the GUI
+# loads matplotlib and NumPy only once there is something to plot
+GUI_STARTUP_BUDGET = 0.5
+GUI_HEAVY_MODULES = ("matplotlib", "numpy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "__import__(sys.argv[1])\n"
+    "elapsed = time.perf_counter() - start\n"
+    "heavy = [m for m in sys.argv[2:] if m in sys.modules]\n"
+    "print(elapsed, *heavy)\n"
+)
+
+# Builds the GUI and waits for the first window to be drawn; exits with 3
+# when there is no display
+_GUI_PROBE = (
+    "import sys, time\n"
+    "start = time.perf_counter()\n"
+    "import tkinter\n"
+    "try:\n"
+    "    root = tkinter.Tk()\n"
+    "except tkinter.TclError:\n"
+    "    sys.exit(3)\n"
+    "import gui\n"
+    "gui.EnergyEfficientSchedulerGUI(root)\n"
+    "root.update()\n"
+    "elapsed = time.perf_counter() - start\n"
+    "root.destroy()\n"
+    "heavy = [m for m in sys.argv[1:] if m in sys.modules]\n"
+    "print(elapsed, *heavy)\n"
+)
+
+
+def measure_startup(module: str = "cli", repeat: int = 5, heavy_modules: Sequence[str] = HEAVY_MODULES) -> Dict:
+    # Each run is a fresh interpreter, so nothing is cached in sys.modules;
+    # the fastest of ``repeat`` runs is reported, as for the other targets.
+    wall, imports, heavy = [], [], set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", module, "--help"], cwd=ROOT, check=True,
+                       stdout=subprocess.DEVNULL)
+        wall.append(time.perf_counter() - start)
+
+        probe = subprocess.run([sys.executable, "-c", _PROBE, module, *heavy_modules], cwd=ROOT, check=True,
+                               capture_output=True, text=True)
+        seconds, *loaded = probe.stdout.split()
+        imports.append(float(seconds))
+        heavy.update(loaded)
+    return {
+        "module": module,
+        "seconds": min(wall),
+        "import_seconds": min(imports),
+        "heavy_modules": sorted(heavy),
+    }
+
+
+def measure_gui_startup(repeat: int = 5, heavy_modules: Sequence[str] = GUI_HEAVY_MODULES) -> Optional[Dict]:
+    # Like measure_startup, up to the first drawn window; None without a display
+    wall, windows, heavy = [], [], set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        probe = subprocess.run([sys.executable, "-c", _GUI_PROBE, *heavy_modules], cwd=ROOT,
+                               capture_output=True, text=True)
+        if probe.returncode == 3:
+            return None
+        probe.check_returncode()
+        wall.append(time.perf_counter() - start)
+        seconds, *loaded = probe.stdout.split()
+        windows.append(float(seconds))
+        heavy.update(loaded)
+    return {
+        "module": "gui",
+        "seconds": min(wall),
+        "window_seconds": min(windows),
+        "heavy_modules": sorted(heavy),
+    }
+
+
+def check_startup(result: Dict, budget: float = STARTUP_BUDGET) -> List[str]:
+    problems = []
+    if result["seconds"] > budget:
+        problems.append(f"{result['module']} startup {result['seconds'] * 1000:.0f} ms "
+                        f"exceeds budget of {budget * 1000:.0f} ms")
+    if result["heavy_modules"]:
+        problems.append(f"{result['module']} imports {', '.join(result['heavy_modules'])} at startup")
+    return problems
@@ -0,0 +1,66 @@
+# benchmarks/sweep_scaling.py
+import argparse
+import os
+import sys
+import time
+from typing import Dict, List, Sequence
+from benchmarks.workloads import GENERATORS, generate
+from scheduler import Process
+from sweep import sweep
+
+# Default grid: 4 quanta x 3 maximum frequencies x 4 governors = 48 points
+GRID = {"time_quantum": [1, 2, 3, 5], "max_frequency": [2.0, 3.0, 4.0],
+        "governor": ["priority", "performance", "powersave", "ondemand"]}
+
+
+def measure_scaling(processes: List[Process], workers: Sequence[int], grid: Dict = GRID, repeat: int = 3) -> List[Dict]:
+    # Fastest of ``repeat`` sweeps per worker count, pool start-up included;
+    # speedup is relative to the first worker count measured
+    results = []
+    for count in workers:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            points = len(sweep(processes, grid, max_workers=count))
+            times.append(time.perf_counter() - start)
+        seconds = min(times)
+        results.append({
+            "workers": count,
+            "points": points,
+            "seconds": seconds,
+            "points_per_second": points / seconds,
+            "speedup": results[0]["seconds"] / seconds if results else 1.0,
+        })
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.sweep_scaling",
+                                     description="Sweep throughput against worker count")
+    parser.add_argument("--workers", nargs="+", type=int, default=None,
+                        help="worker counts (default: 1, 2, 4, ... up to the CPU count)")
+    parser.add_argument("--generator", choices=sorted(GENERATORS), default="poisson")
+    parser.add_argument("--processes", type=lambda s: int(float(s)), default=10_000, help="processes per point")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    workers = args.workers
+    if workers is None:
+        cpus = os.cpu_count() or 1
+        workers = [1 << k for k in range(cpus.bit_length()) if 1 << k <= cpus]
+        if workers[-1] != cpus:
+            workers.append(cpus)
+    if min(workers) <= 0:
+        parser.error("--workers must be positive")
+
+    processes = [Process(*record) for record in generate(args.generator, args.processes, seed=args.seed)]
+    print(f"{len(processes)} processes, {os.cpu_count()} CPUs")
+    for row in measure_scaling(processes, workers, repeat=args.repeat):
+        print(f"workers {row['workers']:>3}  {row['points']} points in {row['seconds']:.2f}s  "
+              f"{row['points_per_second']:.1f} points/s  speedup {row['speedup']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# benchmarks/workloads.py
+import random
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# Synthetic workloads as (pid, arrival, burst, priority) records. Every
+# generator is deterministic for a given seed.
+Record = Tuple[int, int, int, int]
+
+
+def poisson_arrivals(count: int, seed: int = 0, rate: float = 0.2, mean_burst: float = 4.0) -> Iterator[Record]:
+    rng = random.Random(seed)
+    clock = 0.0
+    for pid in range(1, count + 1):
+        clock += rng.expovariate(rate)
+        burst = max(1, round(rng.expovariate(1 / mean_burst)))
+        yield pid, int(clock), burst, rng.randint(1, 2)
+
+
+def pareto_bursts(count: int, seed: int = 0, rate: float = 0.2, alpha: float = 1.5, min_burst: int = 1,
+                  max_burst: int = 10_000) -> Iterator[Record]:
+    # Heavy-tailed service demand: most jobs are short, a few are huge
+    rng = random.Random(seed)
+    clock = 0.0
+    for pid in range(1, count + 1):
+        clock += rng.expovariate(rate)
+        burst = min(max_burst, int(min_burst * rng.paretovariate(alpha)))
+        yield pid, int(clock), burst, rng.randint(1, 2)
+
+
+def bursty_on_off(count: int, seed: int = 0, on_rate: float = 2.0, mean_on: float = 20.0,
+                  mean_off: float = 200.0, mean_burst: float = 3.0) -> Iterator[Record]:
+    # Arrivals come in dense bursts separated by long quiet periods
+    rng = random.Random(seed)
+    clock = 0.0
+    period_end = rng.expovariate(1 / mean_on)
+    for pid in range(1, count + 1):
+        clock += rng.expovariate(on_rate)
+        if clock > period_end:
+            clock = period_end + rng.expovariate(1 / mean_off)
+            period_end = clock + rng.expovariate(1 / mean_on)
+        burst = max(1, round(rng.expovariate(1 / mean_burst)))
+        yield pid, int(clock), burst, rng.randint(1, 2)
+
+
+def priority_mix(count: int, seed: int = 0, rate: float = 0.1,
+                 classes: Tuple[Tuple[int, float, float], ...] = ((1, 0.2, 2.0), (2, 0.5, 5.0), (3, 0.3, 20.0))
+                 ) -> Iterator[Record]:
+    # classes: (priority, share of jobs, mean burst)
+    rng = random.Random(seed)
+    priorities = [c[0] for c in classes]
+    weights = [c[1] for c in classes]
+    mean_bursts = dict((c[0], c[2]) for c in classes)
+    clock = 0.0
+    for pid in range(1, count + 1):
+        clock += rng.expovariate(rate)
+        priority = rng.choices(priorities, weights)[0]
+        burst = max(1, round(rng.expovariate(1 / mean_bursts[priority])))
+        yield pid, int(clock), burst, priority
+
+
+GENERATORS: Dict[str, Callable[..., Iterator[Record]]] = {
+    "poisson": poisson_arrivals,
+    "pareto": pareto_bursts,
+    "bursty": bursty_on_off,
+    "priority": priority_mix,
+}
+
+
+def generate(name: str, count: int, seed: int = 0, **options) -> List[Record]:
+    if name not in GENERATORS:
+        raise ValueError(f"Unknown workload generator: {name}")
+    return list(GENERATORS[name](count, seed=seed, **options))
@@ -0,0 +1,276 @@
+# cache.py
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Optional
+import numpy as np
+from history import StepSeries, set_slice_summaries, slice_summaries
+
+# Bump when the stored layout or the simulation semantics change
+CACHE_VERSION = 3
+
+DEFAULT_DIRECTORY = os.path.join(os.path.expanduser("~"), ".cache", "cpu_scheduler")
+
+_NO_DEADLINE = np.iinfo(np.int64).min
+
+
+def _columns(processes):
+    # (pid, arrival, burst, priority, deadline) as int64 arrays, input order
+    if hasattr(processes, "arrival_order"):
+        size = len(processes)
+        return (processes.pid, processes.arrival_time, processes.burst_time, processes.priority,
+                np.full(size, _NO_DEADLINE, dtype=np.int64))
+    deadlines = [_NO_DEADLINE if getattr(p, "deadline", None) is None else p.deadline for p in processes]
+    return tuple(np.array(column, dtype=np.int64) for column in (
+        [p.pid for p in processes], [p.arrival_time for p in processes], [p.burst_time for p in processes],
+        [p.priority for p in processes], deadlines))
+
+
+def cpu_params(cpu) -> Dict:
+    return {
+        "base_power": cpu.base_power,
+        "max_frequency": cpu.max_frequency,
+        "min_frequency": cpu.min_frequency,
+        "history": cpu.history.level,
+        "coalesce": cpu.history.coalesce,
+        "governor": cpu.governor.describe(),
+        "switch_latency": cpu.switch_latency,
+        "switch_energy": cpu.switch_energy,
+        "speed_scaling": cpu.speed_scaling,
+    }
+
+
+def simulation_key(processes, cpu, policy: str = "rr", **params) -> str:
+    """Stable SHA-256 of the workload, the policy and the CPU parameters."""
+    digest = hashlib.sha256()
+    header = {"version": CACHE_VERSION, "policy": policy, "params": params, "cpu": cpu_params(cpu)}
+    digest.update(json.dumps(header, sort_keys=True).encode())
+    for column in _columns(processes):
+        digest.update(np.ascontiguousarray(column, dtype="<i8").tobytes())
+    return digest.hexdigest()
+
+
+def is_fresh(processes, cpu) -> bool:
+    # Only runs from a clean state can be served from (or stored in) the cache
+    if cpu.power_consumption or cpu.idle_time or len(cpu.power_history) or len(cpu.frequency_history):
+        return False
+    if hasattr(processes, "arrival_order"):
+        return (not len(processes.slices()[0]) and bool(np.all(processes.start_time == -1))
+                and bool(np.all(processes.remaining_time == processes.burst_time)))
+    return all(p.start_time == -1 and p.remaining_time == p.burst_time and not p.execution_history
+               for p in processes)
+
+
+def _series_arrays(series, prefix: str) -> Dict[str, np.ndarray]:
+    if isinstance(series, StepSeries):
+        last = np.nan if series.last_time is None else series.last_time
+        return {f"{prefix}_times": np.array(series.times), f"{prefix}_values": np.array(series.values),
+                f"{prefix}_last": np.array([last])}
+    if isinstance(series, list):
+        # Keep the sample types (integer times) of the original list
+        return {f"{prefix}_times": np.array([t for t, _ in series]),
+                f"{prefix}_values": np.array([v for _, v in series], dtype=np.float64)}
+    return {}
+
+
+def _restore_series(series, arrays, prefix: str):
+    if f"{prefix}_times" not in arrays:
+        return
+    times, values = arrays[f"{prefix}_times"], arrays[f"{prefix}_values"]
+    if isinstance(series, StepSeries):
+        series.times = array("d", times.tolist())
+        series.values = array("d", values.tolist())
+        last = float(arrays[f"{prefix}_last"][0])
+        series.last_time = None if np.isnan(last) else last
+    elif isinstance(series, list):
+        series.extend(zip(times.tolist(), values.tolist()))
+
+
+def encode_run(processes, completed, cpu) -> Dict[str, np.ndarray]:
+    # Compact array form of a finished run, indexed by input position
+    summaries = slice_summaries(processes)
+    if hasattr(processes, "arrival_order"):
+        if summaries is None:
+            rows, starts, ends = processes.slices()
+        result = {name: getattr(processes, name).copy()
+                  for name in ("start_time", "finish_time", "remaining_time", "energy")}
+        result["order"] = np.array(completed.indices, dtype=np.int64)
+    else:
+        position = {id(p): i for i, p in enumerate(processes)}
+        if summaries is None:
+            counts = [len(p.execution_history) for p in processes]
+            flat = np.fromiter((t for p in processes for interval in p.execution_history for t in interval),
+                               dtype=np.int64, count=2 * sum(counts))
+            rows = np.repeat(np.arange(len(processes), dtype=np.int64), counts)
+            starts, ends = flat[0::2], flat[1::2]
+        result = {
+            "start_time": np.array([p.start_time for p in processes], dtype=np.int64),
+            "finish_time": np.array([p.finish_time for p in processes], dtype=np.int64),
+            "remaining_time": np.array([p.remaining_time for p in processes], dtype=np.int64),
+            "energy": np.array([p.energy for p in processes], dtype=np.float64),
+            "order": np.array([position[id(p)] for p in completed], dtype=np.int64),
+        }
+    if summaries is None:
+        result.update(slice_row=rows, slice_start=starts, slice_end=ends)
+    else:
+        result.update(zip(("first_start", "last_finish", "slice_count"), summaries))
+    result["cpu"] = np.array([cpu.power_consumption, cpu.idle_time, cpu.current_frequency, cpu.switches])
+    result.update(_series_arrays(cpu.power_history, "power"))
+    result.update(_series_arrays(cpu.frequency_history, "frequency"))
+    return result
+
+
+def apply_run(arrays, processes, cpu):
+    # Replays a cached run onto fresh processes and CPU; returns the
+    # completed processes exactly as the scheduler would have
+    power_consumption, idle_time, current_frequency, switches = arrays["cpu"].tolist()
+    cpu.power_consumption = power_consumption
+    cpu.idle_time = int(idle_time)
+    cpu.switches = int(switches)
+    cpu.current_frequency = current_frequency
+    _restore_series(cpu.power_history, arrays, "power")
+    _restore_series(cpu.frequency_history, arrays, "frequency")
+
+    summarized = "slice_count" in arrays
+    if summarized:
+        # Summary-level run: no slices, only each process's aggregates
+        set_slice_summaries(processes, np.arange(len(processes)), arrays["first_start"], arrays["last_finish"],
+                            arrays["slice_count"])
+        rows = starts = ends = np.empty(0, dtype=np.int64)
+    else:
+        rows, starts, ends = arrays["slice_row"], arrays["slice_start"], arrays["slice_end"]
+
+    # Entries written from a ProcessTable keep the slice log in time order,
+    # those from a Process list are grouped by row; either may be replayed
+    # onto the other
+    if hasattr(processes, "arrival_order"):
+        for name in ("start_time", "finish_time", "remaining_time", "energy"):
+            getattr(processes, name)[:] = arrays[name]
+        order = np.argsort(starts, kind="stable")
+        processes.extend_slices(rows[order], starts[order], ends[order])
+        completed = processes.completion_list()
+        completed.indices.extend(arrays["order"].tolist())
+        return completed
+
+    order = np.argsort(rows, kind="stable")
+    rows, starts, ends = rows[order], starts[order], ends[order]
+    offsets = np.searchsorted(rows, np.arange(len(processes) + 1)).tolist()
+    intervals = list(zip(starts.tolist(), ends.tolist()))
+    columns = [arrays[name].tolist() for name in ("start_time", "finish_time", "remaining_time", "energy")]
+    for i, (process, start, finish, remaining, energy) in enumerate(zip(processes, *columns)):
+        process.start_time, process.finish_time = start, finish
+        process.remaining_time, process.energy = remaining, energy
+        if not summarized:
+            process.execution_history.extend(intervals[offsets[i]:offsets[i + 1]])
+    return [processes[i] for i in arrays["order"].tolist()]
+
+
+class SimulationCache:
+    """Content-addressed store of finished runs.
+
+    The most recently used ``max_entries`` runs stay in memory. With a
+    ``directory`` every run is also written there as a compressed .npz,
+    and the least recently used files are removed once the directory
+    grows past ``max_bytes``.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 16, max_bytes: int = 256 * 2**20):
+        if max_entries < 0 or max_bytes < 0:
+            raise ValueError("Cache limits must not be negative")
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key: str) -> Optional[Dict[str, np.ndarray]]:
+        with self._lock:
+            arrays = self._memory.get(key)
+            if arrays is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return arrays
+
+        arrays = None
+        if self.directory and os.path.exists(self._path(key)):
+            try:
+                with np.load(self._path(key)) as data:
+                    arrays = {name: data[name] for name in data.files}
+                os.utime(self._path(key))
+            except (OSError, ValueError) as e:
+                logging.warning(f"Ignoring unreadable cache entry {key}: {e}")
+
+        with self._lock:
+            if arrays is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, arrays)
+        return arrays
+
+    def put(self, key: str, arrays: Dict[str, np.ndarray]):
+        with self._lock:
+            self._remember(key, arrays)
+        if self.directory:
+            # Write to a temporary file first so readers never see half an entry
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    np.savez_compressed(f, **arrays)
+                os.replace(tmp, self._path(key))
+            except BaseException:
+                with contextlib.suppress(FileNotFoundError):
+                    os.unlink(tmp)
+                raise
+            self._evict_files()
+
+    def _remember(self, key: str, arrays):
+        self._memory[key] = arrays
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_files(self):
+        entries = []
+        with os.scandir(self.directory) as scan:
+            for entry in scan:
+                if entry.name.endswith(".npz"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for name in os.listdir(self.directory):
+                if name.endswith(".npz"):
+                    os.unlink(os.path.join(self.directory, name))
+
+    def load(self, key: str, processes, cpu):
+        arrays = self.get(key)
+        return None if arrays is None else apply_run(arrays, processes, cpu)
+
+    def store(self, key: str, processes, completed, cpu):
+        self.put(key, encode_run(processes, completed, cpu))
@@ -0,0 +1,226 @@
+# checkpoint.py
+import math
+from collections import namedtuple
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from history import SliceSummary
+from scheduler import CPU, round_robin_scheduling
+
+# Scheduler state right after every arrival up to ``time`` was admitted:
+# the ready queue as pids with the remaining, start and energy columns of
+# the queued processes, their execution history marks or SliceSummary
+# copies (Process lists) or the slice log mark and, at summary level, the
+# queued rows' summary columns (ProcessTable), and CPU.snapshot(). Everything else
+# follows from the finished run: processes that arrived by ``time`` and
+# are not queued had already completed, in completion order.
+Checkpoint = namedtuple("Checkpoint", "time queue remaining start energy histories slices cpu")
+
+# Checkpoints per workload when no interval is given
+DEFAULT_CHECKPOINTS = 64
+
+
+def _history_mark(history):
+    if isinstance(history, SliceSummary):
+        return history.copy()
+    return len(history), history[-1] if history else None
+
+
+class CheckpointLog:
+    """Collects checkpoints from round_robin_scheduling every ``interval``
+    time units (at the first admission after each interval has passed)."""
+
+    def __init__(self, processes, interval: int):
+        if interval <= 0:
+            raise ValueError("Checkpoint interval must be positive")
+        self.interval = interval
+        self.table = processes if hasattr(processes, "arrival_order") else None
+        self.checkpoints: List[Checkpoint] = []
+        self.next_due = 0
+
+    def take(self, now: int, queue, cpu) -> int:
+        table = self.table
+        if table is not None:
+            rows = table.indices_of(queue)
+            summaries = table.slice_summary()
+            histories = None if summaries is None else tuple(column[rows] for column in summaries)
+            checkpoint = Checkpoint(now, table.pid[rows], table.remaining_time[rows], table.start_time[rows],
+                                    table.energy[rows], histories, table.slice_log_mark(), cpu.snapshot())
+        else:
+            histories = [_history_mark(p.execution_history) for p in queue]
+            checkpoint = Checkpoint(now, np.array([p.pid for p in queue], dtype=np.int64),
+                                    np.array([p.remaining_time for p in queue], dtype=np.int64),
+                                    np.array([p.start_time for p in queue], dtype=np.int64),
+                                    np.array([p.energy for p in queue], dtype=np.float64),
+                                    histories, None, cpu.snapshot())
+        self.checkpoints.append(checkpoint)
+        self.next_due = now + self.interval
+        return self.next_due
+
+    def latest_before(self, time) -> Optional[Checkpoint]:
+        # Checkpoints are valid for edits to processes arriving after them
+        found = None
+        for checkpoint in self.checkpoints:
+            if checkpoint.time >= time:
+                break
+            found = checkpoint
+        return found
+
+
+_Run = namedtuple("_Run", "processes columns completed cpu log")
+
+
+def _workload_columns(processes) -> Dict[str, np.ndarray]:
+    names = ("pid", "arrival_time", "burst_time", "priority")
+    if hasattr(processes, "arrival_order"):
+        return {name: getattr(processes, name).astype(np.int64) for name in names}
+    return {name: np.array([getattr(p, name) for p in processes], dtype=np.int64) for name in names}
+
+
+def edit_time(old: Dict[str, np.ndarray], new: Dict[str, np.ndarray]) -> float:
+    """Earliest arrival of a process added, removed or changed between two
+    workloads (matched by pid); -inf when the shared processes were reordered."""
+    if len(np.unique(old["pid"])) != len(old["pid"]) or len(np.unique(new["pid"])) != len(new["pid"]):
+        return -math.inf
+    _, old_index, new_index = np.intersect1d(old["pid"], new["pid"], assume_unique=True, return_indices=True)
+    # Arrival ties are admitted in input order, so that order must be kept
+    if np.any(np.diff(new_index[np.argsort(old_index)]) < 0):
+        return -math.inf
+    changed = np.zeros(len(old_index), dtype=bool)
+    for name in ("arrival_time", "burst_time", "priority"):
+        changed |= old[name][old_index] != new[name][new_index]
+    removed = np.ones(len(old["pid"]), dtype=bool)
+    removed[old_index] = False
+    added = np.ones(len(new["pid"]), dtype=bool)
+    added[new_index] = False
+    times = np.concatenate([old["arrival_time"][removed], new["arrival_time"][added],
+                            old["arrival_time"][old_index[changed]], new["arrival_time"][new_index[changed]]])
+    return float(times.min()) if len(times) else math.inf
+
+
+class IncrementalSimulator:
+    """Round robin runs of successive versions of a workload.
+
+    Each run records checkpoints. The next run restores the latest one
+    taken before the earliest arrival that the edit touched and simulates
+    only the rest; the result is identical to a run from t=0. Processes
+    are matched by pid, which must be unique.
+    """
+
+    def __init__(self, time_quantum: int, cpu_params: Optional[Dict] = None, interval: Optional[int] = None):
+        if time_quantum <= 0:
+            raise ValueError("Time quantum must be positive")
+        self.time_quantum = time_quantum
+        self.cpu_params = dict(cpu_params or {})
+        self.interval = interval
+        self.previous: Optional[_Run] = None
+        # Time of the checkpoint the last run resumed from (None: from t=0)
+        self.resumed_from = None
+
+    def _interval(self, columns) -> int:
+        if self.interval:
+            return self.interval
+        arrivals = columns["arrival_time"]
+        span = int(arrivals.max() - arrivals.min()) if len(arrivals) else 0
+        return max(span // DEFAULT_CHECKPOINTS, 1)
+
+    def run(self, processes: Sequence, on_complete=None, on_slice=None):
+        """Simulate ``processes``; returns (completed, cpu) like simulate_round_robin.
+
+        on_complete and on_slice (see round_robin_scheduling) are called for
+        the re-simulated part only.
+        """
+        if not processes:
+            raise ValueError("Process list is empty")
+        columns = _workload_columns(processes)
+        cpu = CPU(**self.cpu_params)
+        log = CheckpointLog(processes, self._interval(columns))
+        completed = processes.completion_list() if hasattr(processes, "completion_list") else []
+
+        checkpoint = None
+        previous = self.previous
+        if previous is not None and (log.table is None) == (previous.log.table is None):
+            checkpoint = previous.log.latest_before(edit_time(previous.columns, columns))
+        resume = None
+        if checkpoint is not None:
+            resume = self._restore(checkpoint, processes, columns, cpu, completed, log)
+        self.resumed_from = None if checkpoint is None else checkpoint.time
+
+        def complete(process):
+            completed.append(process)
+            if on_complete is not None:
+                on_complete(process)
+
+        round_robin_scheduling(processes, self.time_quantum, cpu, on_complete=complete, checkpoints=log,
+                               resume=resume, on_slice=on_slice)
+        self.previous = _Run(processes, columns, completed, cpu, log)
+        return completed, cpu
+
+    def _restore(self, checkpoint: Checkpoint, processes, columns, cpu, completed, log):
+        # Rebuild the state at the checkpoint on the new workload from the
+        # previous run; nothing of the previous run is modified
+        previous = self.previous
+        old_pid = previous.columns["pid"]
+        by_pid = np.argsort(columns["pid"])
+        old_by_pid = np.argsort(old_pid)
+
+        def new_index(pids):
+            return by_pid[np.searchsorted(columns["pid"], pids, sorter=by_pid)]
+
+        def old_index(pids):
+            return old_by_pid[np.searchsorted(old_pid, pids, sorter=old_by_pid)]
+
+        admitted = int(np.count_nonzero(previous.columns["arrival_time"] <= checkpoint.time))
+        finished = admitted - len(checkpoint.queue)
+        queued_new = new_index(checkpoint.queue)
+
+        if log.table is not None:
+            table, old_table = processes, previous.processes
+            finished_old = np.array(previous.completed.indices[:finished], dtype=np.int64)
+            finished_new = new_index(old_pid[finished_old])
+            for name in ("start_time", "finish_time", "remaining_time", "energy"):
+                getattr(table, name)[finished_new] = getattr(old_table, name)[finished_old]
+            table.remaining_time[queued_new] = checkpoint.remaining
+            table.start_time[queued_new] = checkpoint.start
+            table.energy[queued_new] = checkpoint.energy
+            count, last_length = checkpoint.slices
+            rows, starts, ends = old_table.slices()
+            rows, starts, ends = rows[:count], starts[:count], ends[:count]
+            if count:
+                ends[-1] = starts[-1] + last_length
+            table.extend_slices(new_index(old_pid[rows]), starts, ends)
+            # Summary-level runs: nothing had run yet if the checkpoint has no summary columns
+            if checkpoint.histories is not None:
+                summaries = old_table.slice_summary()
+                table.set_slice_summary(finished_new, *(column[finished_old] for column in summaries))
+                table.set_slice_summary(queued_new, *checkpoint.histories)
+        else:
+            old_processes = previous.processes
+            position = {id(p): i for i, p in enumerate(old_processes)}
+            finished_old = np.array([position[id(p)] for p in previous.completed[:finished]], dtype=np.int64)
+            finished_new = new_index(old_pid[finished_old])
+            for o, n in zip(finished_old.tolist(), finished_new.tolist()):
+                old, new = old_processes[o], processes[n]
+                new.start_time, new.finish_time = old.start_time, old.finish_time
+                new.remaining_time, new.energy = old.remaining_time, old.energy
+                new.execution_history = old.execution_history.copy()
+            queued = zip(old_index(checkpoint.queue).tolist(), queued_new.tolist(), checkpoint.remaining.tolist(),
+                         checkpoint.start.tolist(), checkpoint.energy.tolist(), checkpoint.histories)
+            for o, n, remaining, start, energy, mark in queued:
+                new = processes[n]
+                new.remaining_time, new.start_time, new.energy = remaining, start, energy
+                if isinstance(mark, SliceSummary):
+                    new.execution_history = mark.copy()
+                    continue
+                length, last = mark
+                # Processes that had not run yet may have a SliceSummary since
+                new.execution_history = old_processes[o].execution_history[:length] if length else []
+                if length:
+                    new.execution_history[-1] = last
+
+        for i in finished_new.tolist():
+            completed.append(processes[i])
+        cpu.restore(checkpoint.cpu, source=previous.cpu)
+        # Earlier checkpoints describe the new run just as well
+        log.checkpoints = [c for c in previous.log.checkpoints if c.time <= checkpoint.time]
+        log.next_due = checkpoint.time + log.interval
+        return checkpoint.time, queued_new.tolist()
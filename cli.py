@@ -0,0 +1,225 @@
+# cli.py
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from typing import Dict, List
+from scheduler import CPU, UnsortedStreamError
+from policies import POLICIES, make_policy, policy_scheduling
+from multicore import BALANCERS, MAX_CORES, MultiCoreCPU, multicore_round_robin_scheduling
+from metrics import OnlineMetrics
+from governors import GOVERNORS
+from workload import iter_processes, load_processes
+from tracing import BinaryFileSink, ChromeTraceSink, Tracer, format_report
+
+# Command-line options forwarded to each policy's constructor
+POLICY_OPTIONS = {
+    "rr": ("time_quantum",),
+    "mlfq": ("time_quantum", "levels", "boost_interval"),
+    "edf": ("deadline_factor",),
+    "priority": ("preemptive",),
+}
+
+
+def _make_cpu(args, history: str):
+    params = dict(base_power=args.base_power, max_frequency=args.max_frequency,
+                  min_frequency=args.min_frequency, history=history, governor=args.governor,
+                  switch_latency=args.switch_latency, switch_energy=args.switch_energy,
+                  speed_scaling=args.speed_scaling)
+    if args.cores > 1:
+        return MultiCoreCPU(args.cores, **params)
+    return CPU(**params)
+
+
+def _make_tracer(path: str, args):
+    if not (args.trace or args.profile):
+        return None
+    sinks = []
+    if args.trace:
+        trace_path = args.trace
+        if len(args.workloads) > 1:
+            # One trace per workload: trace.json -> trace-<workload file>.json
+            root, ext = os.path.splitext(args.trace)
+            trace_path = f"{root}-{os.path.basename(path)}{ext}"
+        sinks.append(ChromeTraceSink(trace_path) if trace_path.endswith(".json") else BinaryFileSink(trace_path))
+    return Tracer(*sinks)
+
+
+def _simulate(path: str, processes, args, plotting: bool):
+    # Without plots nothing needs the histories or the finished processes,
+    # so each process is dropped once observed.
+    cpu = _make_cpu(args, "full" if plotting else "none")
+    metrics = OnlineMetrics()
+    completed = []
+    if plotting:
+        def complete(process):
+            metrics.observe(process)
+            completed.append(process)
+    else:
+        complete = metrics.observe
+
+    tracer = _make_tracer(path, args)
+    try:
+        if args.cores > 1:
+            multicore_round_robin_scheduling(processes, args.time_quantum, cpu, balancer=args.balancer,
+                                             on_complete=complete, tracer=tracer)
+        else:
+            options = {name: getattr(args, name) for name in POLICY_OPTIONS.get(args.policy, ())}
+            policy_scheduling(processes, make_policy(args.policy, **options), cpu, on_complete=complete,
+                              tracer=tracer)
+    finally:
+        if tracer is not None:
+            tracer.close()
+    if args.profile:
+        print(f"{path}\n{format_report(tracer.report())}", file=sys.stderr)
+    return cpu, metrics, completed
+
+
+def run_workload(path: str, args) -> Dict:
+    plotting = bool(args.plot_dir or args.show)
+    # The trace is streamed; one that is not sorted by arrival time (e.g.
+    # JSON saved from the GUI) is loaded whole and simulated again
+    try:
+        cpu, metrics, completed = _simulate(path, iter_processes(path), args, plotting)
+    except UnsortedStreamError:
+        logging.info(f"{path} is not sorted by arrival time; loading it whole")
+        cpu, metrics, completed = _simulate(path, load_processes(path), args, plotting)
+
+    if plotting:
+        plot_run(path, completed, cpu, args.plot_dir, args.show)
+
+    row = {
+        "workload": path,
+        "policy": args.policy,
+        "cores": args.cores,
+        "base_power": args.base_power,
+        "max_frequency": args.max_frequency,
+        "min_frequency": args.min_frequency,
+        "governor": args.governor,
+        "switch_latency": args.switch_latency,
+        "switch_energy": args.switch_energy,
+        "speed_scaling": args.speed_scaling,
+    }
+    row.update(metrics.summary(cpu))
+    cores = getattr(cpu, "cores", [cpu])
+    row["frequency_switches"] = sum(core.switches for core in cores)
+    return row
+
+
+def plot_run(path: str, completed, cpu, plot_dir: str = None, show: bool = False):
+    # matplotlib (and tkinter for --show) is only imported here
+    import matplotlib
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from visualization import plot_gantt, plot_step
+
+    cores = getattr(cpu, "cores", [cpu])
+    fig, (power_ax, gantt_ax, freq_ax) = plt.subplots(3, 1, figsize=(10, 12))
+    for number, core in enumerate(cores):
+        label = f" core {number}" if len(cores) > 1 else ""
+        if core.power_history:
+            plot_step(power_ax, core.power_history, label=f"Power (W){label}")
+        if core.frequency_history:
+            plot_step(freq_ax, core.frequency_history, label=f"Frequency (GHz){label}")
+    if completed:
+        plot_gantt(gantt_ax, completed, alpha=0.7)
+        gantt_ax.invert_yaxis()
+
+    power_ax.set_title(os.path.basename(path))
+    power_ax.set_ylabel("Power (Watts)")
+    gantt_ax.set_ylabel("Processes")
+    freq_ax.set_ylabel("Frequency (GHz)")
+    freq_ax.set_xlabel("Time (units)")
+    for ax in (power_ax, freq_ax):
+        if ax.lines:
+            ax.legend()
+    fig.tight_layout()
+
+    if plot_dir:
+        os.makedirs(plot_dir, exist_ok=True)
+        name = os.path.basename(path).split(".")[0] or "workload"
+        fig.savefig(os.path.join(plot_dir, f"{name}.png"))
+    if show:
+        plt.show()
+    plt.close(fig)
+
+
+def write_results(rows: List[Dict], out, output_format: str):
+    if output_format == "json":
+        json.dump(rows, out, indent=2)
+        out.write("\n")
+    elif rows:
+        writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def _output_format(args) -> str:
+    if args.format:
+        return args.format
+    if args.output and args.output.endswith(".csv"):
+        return "csv"
+    return "json"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m cli", description="Run scheduling simulations headlessly")
+    parser.add_argument("workloads", nargs="+", help="workload traces (JSON, JSONL or CSV, optionally gzipped)")
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="rr")
+    parser.add_argument("--time-quantum", type=int, default=3)
+    parser.add_argument("--levels", type=int, default=3, help="MLFQ queue levels")
+    parser.add_argument("--boost-interval", type=int, default=None, help="MLFQ priority boost interval")
+    parser.add_argument("--deadline-factor", type=float, default=2.0, help="EDF implicit deadline factor")
+    parser.add_argument("--preemptive", action="store_true", help="preemptive priority scheduling")
+    parser.add_argument("--cores", type=int, default=1, help="simulate a multi-core CPU (round robin only)")
+    parser.add_argument("--balancer", choices=sorted(BALANCERS), default="global")
+    parser.add_argument("--base-power", type=float, default=100.0)
+    parser.add_argument("--max-frequency", type=float, default=3.0)
+    parser.add_argument("--min-frequency", type=float, default=1.0)
+    parser.add_argument("--governor", choices=sorted(GOVERNORS), default="priority", help="DVFS governor")
+    parser.add_argument("--switch-latency", type=int, default=0, help="time lost per frequency switch")
+    parser.add_argument("--switch-energy", type=float, default=0.0, help="energy per frequency switch")
+    parser.add_argument("--speed-scaling", action="store_true", help="run work at frequency / max_frequency speed")
+    parser.add_argument("--format", choices=("json", "csv"), help="output format (default: from --output, else JSON)")
+    parser.add_argument("--output", help="file to write (default: stdout)")
+    parser.add_argument("--plot-dir", help="save power, Gantt and frequency plots here as PNG")
+    parser.add_argument("--show", action="store_true", help="open the plots in a window")
+    parser.add_argument("--trace", help="write scheduler events (.json: Chrome trace format, else binary)")
+    parser.add_argument("--profile", action="store_true", help="print wall-clock time per engine phase")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log progress to stderr")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.cores > 1 and args.policy != "rr":
+        parser.error("--cores is only supported with the rr policy")
+    if not 1 <= args.cores <= MAX_CORES:
+        parser.error(f"--cores must be between 1 and {MAX_CORES}")
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        rows = []
+        for path in args.workloads:
+            logging.info(f"Simulating {path} with {args.policy}...")
+            rows.append(run_workload(path, args))
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    output_format = _output_format(args)
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            write_results(rows, f, output_format)
+    else:
+        write_results(rows, sys.stdout, output_format)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,503 @@
+# differential.py
+import argparse
+import importlib
+import json
+import math
+import random
+import sys
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from history import SliceSummary, slice_summaries
+from scheduler import Process, CPU, round_robin_scheduling
+
+Record = Tuple[int, int, int, int]
+
+# Everything an engine run must reproduce, per process in input order:
+# start and finish times, energy, execution history and its (first start,
+# last finish, slice count) span, all a summary-level run keeps; and per
+# CPU: total power, idle time and the power and frequency histories
+# run-length normalized (a run of equal samples counts once, so skipping an
+# idle gap in one step matches idling unit by unit). None means not recorded.
+Trace = namedtuple("Trace", "start finish energy histories power_consumption idle_time power_history "
+                            "frequency_history spans", defaults=(None,))
+
+
+class _ReferenceCPU:
+    # Frozen copy of the original CPU (priority frequencies, no switch
+    # costs); only the per-process energy line was added
+    def __init__(self, base_power: float = 100.0, max_frequency: float = 3.0, min_frequency: float = 1.0):
+        self.base_power = base_power
+        self.max_frequency = max_frequency
+        self.min_frequency = min_frequency
+        self.current_frequency = max_frequency
+        self.power_consumption = 0.0
+        self.idle_time = 0
+        self.power_history = []
+        self.frequency_history = []
+
+    def execute(self, process: Process, time_units: int, current_time: int):
+        if process.start_time == -1:
+            process.start_time = current_time
+
+        self.current_frequency = self.max_frequency if process.priority == 1 else self.min_frequency
+        self.frequency_history.append((current_time, self.current_frequency))
+
+        power = self.base_power * (self.current_frequency / self.max_frequency)
+        self.power_consumption += power * time_units
+        process.energy += power * time_units
+        self.power_history.append((current_time, power))
+
+        process.remaining_time -= time_units
+        process.execution_history.append((current_time, current_time + time_units))
+
+        if process.remaining_time <= 0:
+            process.finish_time = current_time + time_units + process.remaining_time
+
+    def idle(self, time_units: int, current_time: int):
+        self.idle_time += time_units
+        self.power_history.append((current_time, self.base_power * 0.1))
+        self.frequency_history.append((current_time, self.min_frequency))
+
+
+def _reference_round_robin(processes: List[Process], time_quantum: int, cpu: _ReferenceCPU) -> List[Process]:
+    # Frozen copy of the original scheduler loop: arrivals are rescanned
+    # before every slice and idle time advances one unit at a time
+    queue = []
+    current_time = 0
+    completed_processes = []
+    remaining_processes = processes.copy()
+
+    while remaining_processes or queue:
+        new_processes = [p for p in remaining_processes if p.arrival_time <= current_time]
+        for p in new_processes:
+            queue.append(p)
+            remaining_processes.remove(p)
+
+        if queue:
+            current_process = queue.pop(0)
+            execution_time = min(time_quantum, current_process.remaining_time)
+            cpu.execute(current_process, execution_time, current_time)
+            current_time += execution_time
+
+            if current_process.remaining_time > 0:
+                queue.append(current_process)
+            else:
+                completed_processes.append(current_process)
+        else:
+            cpu.idle(1, current_time)
+            current_time += 1
+
+    return completed_processes
+
+
+def normalize_series(series) -> Tuple[Tuple[float, float], ...]:
+    # Drops samples that repeat the previous value
+    samples = []
+    for time, value in series:
+        if not samples or samples[-1][1] != value:
+            samples.append((time, value))
+    return tuple(samples)
+
+
+def capture(processes, cpu) -> Trace:
+    """Trace of a finished run of ``processes`` (a Process list or ProcessTable)."""
+    if hasattr(processes, "arrival_order"):
+        rows, starts, ends = processes.slices()
+        histories = [[] for _ in range(len(processes))]
+        for row, start, end in zip(rows.tolist(), starts.tolist(), ends.tolist()):
+            histories[row].append((start, end))
+        start, finish = processes.start_time.tolist(), processes.finish_time.tolist()
+        energy = processes.energy.tolist()
+    else:
+        histories = [p.execution_history for p in processes]
+        start, finish = [p.start_time for p in processes], [p.finish_time for p in processes]
+        energy = [p.energy for p in processes]
+    recorded = getattr(getattr(cpu, "history", None), "level", "full") != "none"
+    summaries = slice_summaries(processes)
+    if summaries is None:
+        spans = tuple((s.first_start, s.last_finish, s.count) for s in map(SliceSummary.of, histories))
+        histories = tuple(tuple(map(tuple, h)) for h in histories)
+    else:
+        spans = tuple(zip(*(column.tolist() for column in summaries)))
+        histories = None
+    return Trace(tuple(start), tuple(finish), tuple(energy), histories if recorded else None,
+                 cpu.power_consumption, cpu.idle_time,
+                 normalize_series(cpu.power_history) if recorded else None,
+                 normalize_series(cpu.frequency_history) if recorded else None,
+                 spans if recorded else None)
+
+
+def golden_trace(records: Sequence[Record], time_quantum: int, **cpu_params) -> Trace:
+    """Trace of the reference engine, the original unoptimized scheduler."""
+    processes = [Process(*r) for r in records]
+    cpu = _ReferenceCPU(**cpu_params)
+    _reference_round_robin(processes, time_quantum, cpu)
+    return capture(processes, cpu)
+
+
+# Candidate engines: (records, time_quantum, **cpu_params) -> Trace
+
+def _run_scheduler(records, time_quantum, **cpu_params):
+    processes = [Process(*r) for r in records]
+    cpu = CPU(**cpu_params)
+    round_robin_scheduling(processes, time_quantum, cpu)
+    return capture(processes, cpu)
+
+
+def _run_summary(records, time_quantum, **cpu_params):
+    processes = [Process(*r) for r in records]
+    cpu = CPU(history="summary", **cpu_params)
+    round_robin_scheduling(processes, time_quantum, cpu)
+    return capture(processes, cpu)
+
+
+def _run_summary_table(records, time_quantum, **cpu_params):
+    from process_table import ProcessTable
+    table = ProcessTable.from_records(records)
+    cpu = CPU(history="summary", **cpu_params)
+    round_robin_scheduling(table, time_quantum, cpu)
+    return capture(table, cpu)
+
+
+def _run_table(records, time_quantum, **cpu_params):
+    from process_table import ProcessTable
+    table = ProcessTable.from_records(records)
+    cpu = CPU(**cpu_params)
+    round_robin_scheduling(table, time_quantum, cpu)
+    return capture(table, cpu)
+
+
+def _run_stream(records, time_quantum, **cpu_params):
+    processes = [Process(*r) for r in records]
+    cpu = CPU(**cpu_params)
+    round_robin_scheduling(iter(processes), time_quantum, cpu, on_complete=lambda p: None)
+    return capture(processes, cpu)
+
+
+# Streams must be in arrival order; unsorted workloads are skipped
+_run_stream.sorted_input = True
+
+
+def _cached_run(records, time_quantum, write_table: bool, read_table: bool, cpu_params):
+    # The second run is served from the cache entry the first one wrote;
+    # lists and ProcessTables share keys, so either can replay the other's
+    from cache import SimulationCache
+    from process_table import ProcessTable
+    from simulation import simulate_round_robin
+
+    def workload(table):
+        return ProcessTable.from_records(records) if table else [Process(*r) for r in records]
+
+    cache = SimulationCache()
+    simulate_round_robin(workload(write_table), time_quantum, CPU(**cpu_params), cache=cache)
+    processes = workload(read_table)
+    _, cpu = simulate_round_robin(processes, time_quantum, CPU(**cpu_params), cache=cache)
+    return capture(processes, cpu)
+
+
+def _run_cached(records, time_quantum, **cpu_params):
+    return _cached_run(records, time_quantum, False, False, cpu_params)
+
+
+def _run_cached_from_table(records, time_quantum, **cpu_params):
+    return _cached_run(records, time_quantum, True, False, cpu_params)
+
+
+def _run_cached_into_table(records, time_quantum, **cpu_params):
+    return _cached_run(records, time_quantum, False, True, cpu_params)
+
+
+def _run_incremental(records, time_quantum, **cpu_params):
+    # Simulates the workload without its last arrival first, so the real
+    # run resumes from a checkpoint
+    from checkpoint import IncrementalSimulator
+    simulator = IncrementalSimulator(time_quantum, cpu_params, interval=1)
+    last = max(range(len(records)), key=lambda i: records[i][1])
+    if len(records) > 1:
+        simulator.run([Process(*r) for i, r in enumerate(records) if i != last])
+    processes = [Process(*r) for r in records]
+    _, cpu = simulator.run(processes)
+    return capture(processes, cpu)
+
+
+def _run_batch(records, time_quantum, **cpu_params):
+    # The batch engine keeps no histories
+    from batch import simulate_batch
+    result = simulate_batch([records], time_quantum, **cpu_params)
+    count = len(records)
+    return Trace(tuple(result.start_time[0, :count].tolist()), tuple(result.finish_time[0, :count].tolist()),
+                 tuple(result.energy[0, :count].tolist()), None, float(result.power_consumption[0]),
+                 int(result.idle_time[0]), None, None)
+
+
+ENGINES: Dict[str, Callable[..., Trace]] = {
+    "scheduler": _run_scheduler,
+    "summary": _run_summary,
+    "table": _run_table,
+    "summary-table": _run_summary_table,
+    "stream": _run_stream,
+    "cached": _run_cached,
+    "cached-from-table": _run_cached_from_table,
+    "cached-into-table": _run_cached_into_table,
+    "incremental": _run_incremental,
+    "batch": _run_batch,
+}
+
+
+def get_engine(name: str) -> Callable[..., Trace]:
+    # A registered name or "module:function"
+    if name in ENGINES:
+        return ENGINES[name]
+    module, _, function = name.partition(":")
+    if not function:
+        raise ValueError(f"Unknown engine: {name} (choose from {', '.join(ENGINES)} or module:function)")
+    return getattr(importlib.import_module(module), function)
+
+
+def _close(a: float, b: float) -> bool:
+    return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def compare(expected: Trace, actual: Trace) -> List[str]:
+    """Differences between two traces; fields either side left out are skipped."""
+    differences = []
+    if expected.histories is not None and actual.histories is not None:
+        # All slices in time order; the first divergence is usually the cause
+        def timeline(trace):
+            return sorted((start, end, i) for i, history in enumerate(trace.histories) for start, end in history)
+
+        want_slices, got_slices = timeline(expected), timeline(actual)
+        for position, (want, got) in enumerate(zip(want_slices, got_slices)):
+            if want != got:
+                differences.append(f"slice {position}: expected [{want[0]}, {want[1]}) of process #{want[2]}, "
+                                   f"got [{got[0]}, {got[1]}) of process #{got[2]}")
+                break
+        else:
+            if len(want_slices) != len(got_slices):
+                differences.append(f"expected {len(want_slices)} slices, got {len(got_slices)}")
+        for i, (want, got) in enumerate(zip(expected.histories, actual.histories)):
+            if tuple(want) != tuple(got):
+                differences.append(f"process #{i} execution history: expected {list(want)}, got {list(got)}")
+                break
+    if expected.spans is not None and actual.spans is not None:
+        for i, (want, got) in enumerate(zip(expected.spans, actual.spans)):
+            if tuple(want) != tuple(got):
+                differences.append(f"process #{i} (first start, last finish, slices): expected {tuple(want)}, "
+                                   f"got {tuple(got)}")
+                break
+    for name in ("start", "finish", "energy"):
+        want, got = getattr(expected, name), getattr(actual, name)
+        if want is None or got is None:
+            continue
+        if len(want) != len(got):
+            differences.append(f"{name}: expected {len(want)} processes, got {len(got)}")
+            continue
+        for i, (a, b) in enumerate(zip(want, got)):
+            if not _close(a, b):
+                differences.append(f"process #{i} {name}: expected {a}, got {b}")
+                break
+    for name in ("power_consumption", "idle_time"):
+        want, got = getattr(expected, name), getattr(actual, name)
+        if not _close(want, got):
+            differences.append(f"{name}: expected {want}, got {got}")
+    for name in ("power_history", "frequency_history"):
+        want, got = getattr(expected, name), getattr(actual, name)
+        if want is None or got is None:
+            continue
+        for position, (a, b) in enumerate(zip(want, got)):
+            if a[0] != b[0] or not _close(a[1], b[1]):
+                differences.append(f"{name} change {position}: expected {tuple(a)}, got {tuple(b)}")
+                break
+        else:
+            if len(want) != len(got):
+                differences.append(f"{name}: expected {len(want)} changes, got {len(got)}")
+    return differences
+
+
+def random_workload(rng: random.Random, max_processes: int = 20) -> Tuple[List[Record], int]:
+    """A random workload and time quantum that stress the edge cases:
+    simultaneous arrivals, idle gaps, zero and sub-quantum bursts, and
+    input not sorted by arrival."""
+    count = rng.randint(1, max_processes)
+    time_quantum = rng.randint(1, 6)
+    spread = rng.choice((0, count // 2, count * 3, count * 20))
+    pids = rng.sample(range(1, 10 * count + 1), count)
+    records = []
+    for pid in pids:
+        arrival = rng.randint(0, spread)
+        burst = rng.choice((0, 1, time_quantum, time_quantum + 1, rng.randint(1, 4 * time_quantum)))
+        records.append((pid, arrival, burst, rng.randint(1, 3)))
+    if rng.random() < 0.5:
+        records.sort(key=lambda r: r[1])
+    return records, time_quantum
+
+
+def _simpler(records: List[Record], time_quantum: int):
+    # Candidate simplifications, biggest first
+    count = len(records)
+    chunk = count // 2
+    while chunk >= 1:
+        for begin in range(0, count, chunk):
+            smaller = records[:begin] + records[begin + chunk:]
+            if smaller:
+                yield smaller, time_quantum
+        chunk //= 2
+    for value in (1, time_quantum // 2, time_quantum - 1):
+        if 0 < value < time_quantum:
+            yield records, value
+    relabeled = [(i + 1,) + tuple(r[1:]) for i, r in enumerate(records)]
+    if relabeled != records:
+        yield relabeled, time_quantum
+    for i, record in enumerate(records):
+        for field, floor in ((1, 0), (2, 0), (3, 1)):
+            value = record[field]
+            for smaller in sorted({floor, value // 2, value - 1}):
+                if floor <= smaller < value:
+                    changed = list(record)
+                    changed[field] = smaller
+                    yield records[:i] + [tuple(changed)] + records[i + 1:], time_quantum
+
+
+def shrink(records: Sequence[Record], time_quantum: int,
+           fails: Callable[[List[Record], int], bool]) -> Tuple[List[Record], int]:
+    """Greedily simplify a failing workload (fewer processes, then smaller
+    quantum, pids, arrivals, bursts and priorities) while ``fails`` holds."""
+    records = [tuple(r) for r in records]
+    progress = True
+    while progress:
+        progress = False
+        for candidate, quantum in _simpler(records, time_quantum):
+            if fails(candidate, quantum):
+                records, time_quantum = candidate, quantum
+                progress = True
+                break
+    return records, time_quantum
+
+
+def _accepts(engine: Callable[..., Trace], records: Sequence[Record]) -> bool:
+    if not getattr(engine, "sorted_input", False):
+        return True
+    return all(a[1] <= b[1] for a, b in zip(records, records[1:]))
+
+
+def _fails(engine: Callable[..., Trace], cpu_params: Dict, golden=golden_trace):
+    def fails(records, time_quantum):
+        if not _accepts(engine, records):
+            return False
+        try:
+            return bool(compare(golden(records, time_quantum, **cpu_params),
+                                engine(records, time_quantum, **cpu_params)))
+        except Exception:
+            return True
+    return fails
+
+
+def check_engine(engine: Callable[..., Trace], cases: Sequence[Tuple[List[Record], int, Trace]],
+                 cpu_params: Optional[Dict] = None) -> Optional[Dict]:
+    """Runs ``engine`` on every (records, time_quantum, golden trace) case.
+
+    Returns None if all match, else the first failure shrunk to a minimal
+    workload with its differences. Engines with a true ``sorted_input``
+    attribute only get workloads in arrival order.
+    """
+    cpu_params = dict(cpu_params or {})
+    for number, (records, time_quantum, expected) in enumerate(cases):
+        if not _accepts(engine, records):
+            continue
+        try:
+            differences = compare(expected, engine(records, time_quantum, **cpu_params))
+        except Exception as e:
+            differences = [f"raised {type(e).__name__}: {e}"]
+        if not differences:
+            continue
+        fails = _fails(engine, cpu_params)
+        if fails(records, time_quantum):
+            records, time_quantum = shrink(records, time_quantum, fails)
+            try:
+                differences = compare(golden_trace(records, time_quantum, **cpu_params),
+                                      engine(records, time_quantum, **cpu_params))
+            except Exception as e:
+                differences = [f"raised {type(e).__name__}: {e}"]
+        return {"case": number, "records": records, "time_quantum": time_quantum, "differences": differences}
+    return None
+
+
+def generate_cases(count: int, seed: int = 0, max_processes: int = 20,
+                   cpu_params: Optional[Dict] = None) -> List[Tuple[List[Record], int, Trace]]:
+    rng = random.Random(seed)
+    cases = []
+    for _ in range(count):
+        records, time_quantum = random_workload(rng, max_processes)
+        cases.append((records, time_quantum, golden_trace(records, time_quantum, **(cpu_params or {}))))
+    return cases
+
+
+def save_cases(path: str, cases, cpu_params: Optional[Dict] = None):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"cpu": dict(cpu_params or {}),
+                   "cases": [{"records": records, "time_quantum": time_quantum, "trace": trace._asdict()}
+                             for records, time_quantum, trace in cases]}, f)
+
+
+def _tuples(value):
+    return tuple(map(_tuples, value)) if isinstance(value, list) else value
+
+
+def load_cases(path: str):
+    # Returns (cases, cpu_params) as saved by save_cases
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    cases = [([tuple(r) for r in case["records"]], case["time_quantum"],
+              Trace(**{name: _tuples(value) for name, value in case["trace"].items()}))
+             for case in data["cases"]]
+    return cases, data.get("cpu", {})
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m differential",
+                                     description="Check scheduler engines against golden traces of the reference")
+    parser.add_argument("--engines", nargs="+", default=list(ENGINES),
+                        help=f"engines to check: {', '.join(ENGINES)} or module:function")
+    parser.add_argument("--cases", type=int, default=500, help="random workloads")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-processes", type=int, default=20)
+    parser.add_argument("--base-power", type=float, default=100.0)
+    parser.add_argument("--max-frequency", type=float, default=3.0)
+    parser.add_argument("--min-frequency", type=float, default=1.0)
+    parser.add_argument("--record", metavar="PATH", help="save the workloads and golden traces as JSON")
+    parser.add_argument("--golden", metavar="PATH", help="check against saved golden traces instead")
+    args = parser.parse_args(argv)
+    if args.cases <= 0 or args.max_processes <= 0:
+        parser.error("--cases and --max-processes must be positive")
+
+    try:
+        engines = {name: get_engine(name) for name in args.engines}
+        if args.golden:
+            cases, cpu_params = load_cases(args.golden)
+        else:
+            cpu_params = {"base_power": args.base_power, "max_frequency": args.max_frequency,
+                          "min_frequency": args.min_frequency}
+            cases = generate_cases(args.cases, args.seed, args.max_processes, cpu_params)
+        if args.record:
+            save_cases(args.record, cases, cpu_params)
+    except (OSError, ValueError, ImportError, AttributeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    failed = False
+    for name, engine in engines.items():
+        failure = check_engine(engine, cases, cpu_params)
+        if failure is None:
+            checked = sum(_accepts(engine, records) for records, _, _ in cases)
+            print(f"{name:<18} ok ({checked} workloads)")
+            continue
+        failed = True
+        print(f"{name:<18} FAILED on workload {failure['case']}; minimal workload "
+              f"(time_quantum={failure['time_quantum']}): {json.dumps(failure['records'])}")
+        for line in failure["differences"]:
+            print(f"  {line}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,268 @@
+# energy.py
+from itertools import product
+from typing import Dict, Optional
+import numpy as np
+from history import series_arrays
+
+
+def model_grid(**axes) -> Dict[str, np.ndarray]:
+    # Cartesian product of parameter values as flat, equally long arrays,
+    # ready to be passed to a power model: LinearPower(**model_grid(...))
+    if not axes:
+        raise ValueError("No model parameters given")
+    values = [np.atleast_1d(axes[name]).tolist() for name in axes]
+    if not all(values):
+        raise ValueError("Every model parameter needs at least one value")
+    columns = zip(*product(*values))
+    return {name: np.array(column, dtype=np.float64) for name, column in zip(axes, columns)}
+
+
+def _broadcast(**params) -> Dict[str, np.ndarray]:
+    arrays = [np.atleast_1d(np.asarray(value, dtype=np.float64)) for value in params.values()]
+    if any(a.ndim != 1 for a in arrays):
+        raise ValueError("Model parameters must be scalars or 1-D arrays")
+    try:
+        arrays = np.broadcast_arrays(*arrays)
+    except ValueError:
+        raise ValueError("Model parameter arrays must have the same length") from None
+    return dict(zip(params, arrays))
+
+
+def _slices(processes):
+    # (rows, starts, ends, pids) for every recorded slice, rows numbered in
+    # the order the processes are given
+    if hasattr(processes, "slice_columns"):
+        pids, rows, starts, lengths = processes.slice_columns()
+        return np.asarray(rows, dtype=np.int64), starts, starts + lengths, pids
+    if hasattr(processes, "table"):
+        table = processes.table
+        indices = np.array(processes.indices, dtype=np.int64)
+        rows, starts, ends = table.slices()
+        position = np.full(len(table), -1, dtype=np.int64)
+        position[indices] = np.arange(len(indices))
+        rows = position[rows]
+        keep = rows >= 0
+        return rows[keep], starts[keep], ends[keep], table.pid[indices]
+
+    pids = np.array([p.pid for p in processes], dtype=np.int64)
+    counts = np.array([len(p.execution_history) for p in processes], dtype=np.int64)
+    flat = np.fromiter((t for p in processes for interval in p.execution_history for t in interval),
+                       dtype=np.int64, count=2 * int(counts.sum()))
+    rows = np.repeat(np.arange(len(processes), dtype=np.int64), counts)
+    return rows, flat[0::2], flat[1::2], pids
+
+
+class Schedule:
+    """A finished single-core run reduced to what energy depends on.
+
+    ``time_at_frequency[i, l]`` is how long process ``i`` ran at
+    ``frequencies[l]`` and ``idle`` holds the length of every idle interval.
+    Frequencies come from the CPU's frequency history, so any slicing of
+    the execution history (including coalesced slices) is priced exactly.
+    Stalls from frequency switches (CPU.switch_latency) count as idle;
+    ``switches`` and ``switch_energy`` are the run's switch count and the
+    energy it charged per switch.
+    """
+
+    def __init__(self, pids, frequencies, time_at_frequency, idle, max_frequency: float, min_frequency: float,
+                 switches: int = 0, switch_energy: float = 0.0):
+        self.pids = np.asarray(pids, dtype=np.int64)
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.time_at_frequency = np.asarray(time_at_frequency, dtype=np.float64)
+        self.idle = np.asarray(idle, dtype=np.int64)
+        self.max_frequency = max_frequency
+        self.min_frequency = min_frequency
+        self.switches = switches
+        self.switch_energy = switch_energy
+        self.idle_lengths, self.idle_counts = np.unique(self.idle, return_counts=True)
+
+    @classmethod
+    def from_run(cls, processes, cpu) -> "Schedule":
+        if hasattr(cpu, "cores"):
+            raise ValueError("Energy repricing needs a single-core schedule")
+        if cpu.history.level != "full":
+            raise ValueError("Energy repricing needs a CPU run with history='full'")
+
+        rows, starts, ends, pids = _slices(processes)
+        busy = ends > starts
+        rows, starts, ends = rows[busy], starts[busy], ends[busy]
+        order = np.argsort(starts, kind="stable")
+        rows, starts, ends = rows[order], starts[order], ends[order]
+
+        times, values = series_arrays(cpu.frequency_history)
+        times = np.asarray(times, dtype=np.float64)
+        frequencies, levels = np.unique(np.asarray(values, dtype=np.float64), return_inverse=True)
+
+        # Cut the busy time at every slice boundary and frequency change;
+        # each piece then has exactly one process and one frequency.
+        cuts = np.unique(np.concatenate([starts, ends, times]))
+        piece_start, piece_length = cuts[:-1], np.diff(cuts)
+        slice_of = np.searchsorted(starts, piece_start, side="right") - 1
+        inside = (slice_of >= 0) & (piece_start < ends[np.maximum(slice_of, 0)])
+        level_of = levels[np.searchsorted(times, piece_start[inside], side="right") - 1]
+
+        L = len(frequencies)
+        time_at_frequency = np.bincount(rows[slice_of[inside]] * L + level_of, weights=piece_length[inside],
+                                        minlength=len(pids) * L).reshape(len(pids), L)
+
+        # Idle intervals are the gaps between busy time, from time 0 on
+        if len(starts):
+            covered = np.maximum.accumulate(ends)
+            gaps = np.concatenate([starts[:1], starts[1:] - covered[:-1]])
+            idle = gaps[gaps > 0]
+        else:
+            idle = np.zeros(0, dtype=np.int64)
+        return cls(pids, frequencies, time_at_frequency, idle, cpu.max_frequency, cpu.min_frequency,
+                   getattr(cpu, "switches", 0), getattr(cpu, "switch_energy", 0.0))
+
+    @property
+    def busy_time(self) -> float:
+        return float(self.time_at_frequency.sum())
+
+    @property
+    def idle_time(self) -> int:
+        return int(self.idle.sum())
+
+    def frequencies_for(self, max_frequency, min_frequency) -> np.ndarray:
+        # (K, L) frequencies after moving the recorded range onto each
+        # configuration's [min_frequency, max_frequency]
+        max_frequency = max_frequency[:, None]
+        min_frequency = min_frequency[:, None]
+        span = self.max_frequency - self.min_frequency
+        if span <= 0:
+            return max_frequency * (self.frequencies / self.max_frequency)
+        position = (self.frequencies - self.min_frequency) / span
+        return min_frequency + position * (max_frequency - min_frequency)
+
+
+class LinearPower:
+    """``base_power * f / max_frequency``, the model CPU.execute uses.
+
+    Each of the run's frequency switches costs ``switch_energy`` (by default
+    what the run charged). With the default ``idle_power`` of zero, as in
+    CPU.idle, pricing the recorded configuration reproduces
+    ``cpu.power_consumption``.
+    """
+
+    def __init__(self, base_power=100.0, max_frequency=None, min_frequency=None, idle_power=0.0,
+                 switch_energy=None):
+        self.params = _broadcast(base_power=base_power,
+                                 max_frequency=np.nan if max_frequency is None else max_frequency,
+                                 min_frequency=np.nan if min_frequency is None else min_frequency,
+                                 idle_power=idle_power,
+                                 switch_energy=np.nan if switch_energy is None else switch_energy)
+
+    def __len__(self):
+        return len(self.params["base_power"])
+
+    def _frequency_range(self, schedule: Schedule):
+        p = self.params
+        max_frequency = np.where(np.isnan(p["max_frequency"]), schedule.max_frequency, p["max_frequency"])
+        min_frequency = np.where(np.isnan(p["min_frequency"]), schedule.min_frequency, p["min_frequency"])
+        return max_frequency, min_frequency
+
+    def active_power(self, schedule: Schedule) -> np.ndarray:
+        max_frequency, min_frequency = self._frequency_range(schedule)
+        frequencies = schedule.frequencies_for(max_frequency, min_frequency)
+        return self.params["base_power"][:, None] * frequencies / max_frequency[:, None]
+
+    def idle_power(self, schedule: Schedule) -> np.ndarray:
+        return self.params["idle_power"]
+
+    def switch_energy(self, schedule: Schedule) -> np.ndarray:
+        energy = self.params["switch_energy"]
+        return np.where(np.isnan(energy), schedule.switch_energy, energy)
+
+
+class CMOSPower(LinearPower):
+    """Dynamic ``C * V**2 * f`` power plus static leakage.
+
+    Voltage scales linearly from ``v_min`` at the minimum frequency to
+    ``v_max`` at the maximum. Leakage is drawn while idle too, unless
+    ``idle_power`` is given or a CStates model prices the idle time.
+    """
+
+    def __init__(self, capacitance=10.0, v_min=0.8, v_max=1.2, leakage=5.0, max_frequency=None,
+                 min_frequency=None, idle_power=None, switch_energy=None):
+        self.params = _broadcast(capacitance=capacitance, v_min=v_min, v_max=v_max, leakage=leakage,
+                                 max_frequency=np.nan if max_frequency is None else max_frequency,
+                                 min_frequency=np.nan if min_frequency is None else min_frequency,
+                                 idle_power=leakage if idle_power is None else idle_power,
+                                 switch_energy=np.nan if switch_energy is None else switch_energy)
+
+    def __len__(self):
+        return len(self.params["capacitance"])
+
+    def active_power(self, schedule: Schedule) -> np.ndarray:
+        p = self.params
+        max_frequency, min_frequency = self._frequency_range(schedule)
+        frequencies = schedule.frequencies_for(max_frequency, min_frequency)
+        span = (max_frequency - min_frequency)[:, None]
+        position = np.divide(frequencies - min_frequency[:, None], span,
+                             out=np.ones_like(frequencies), where=span > 0)
+        voltage = p["v_min"][:, None] + position * (p["v_max"] - p["v_min"])[:, None]
+        return p["capacitance"][:, None] * voltage ** 2 * frequencies + p["leakage"][:, None]
+
+
+class CStates:
+    """Idle states entered by residency: an idle interval of length ``d``
+    uses the deepest state whose ``residency`` is at most ``d`` and pays its
+    ``exit_energy`` once. Parameters are per state, shape (S,) or (K, S);
+    the first state must have zero residency.
+    """
+
+    def __init__(self, power=(10.0, 3.0, 0.5), residency=(0, 5, 20), exit_energy=(0.0, 1.0, 5.0)):
+        power, residency, exit_energy = (np.atleast_2d(np.asarray(a, dtype=np.float64))
+                                         for a in (power, residency, exit_energy))
+        try:
+            power, residency, exit_energy = np.broadcast_arrays(power, residency, exit_energy)
+        except ValueError:
+            raise ValueError("C-state parameters must have the same number of states") from None
+        if power.ndim != 2 or np.any(residency[:, 0] != 0):
+            raise ValueError("The shallowest C-state must have zero residency")
+        if np.any(np.diff(residency, axis=1) < 0):
+            raise ValueError("C-state residencies must be in ascending order")
+        self.power = power
+        self.residency = residency
+        self.exit_energy = exit_energy
+
+    def __len__(self):
+        return len(self.power)
+
+    def idle_energy(self, schedule: Schedule, size: int) -> np.ndarray:
+        lengths, counts = schedule.idle_lengths.astype(np.float64), schedule.idle_counts
+        # (K, U) index of the state used for each distinct idle length
+        state = (lengths[None, :, None] >= self.residency[:, None, :]).sum(axis=2) - 1
+        power = np.take_along_axis(self.power, state, axis=1)
+        exit_energy = np.take_along_axis(self.exit_energy, state, axis=1)
+        energy = (power * lengths + exit_energy) @ counts
+        return np.broadcast_to(energy, (size,))
+
+
+def price(schedule: Schedule, model, cstates: Optional[CStates] = None, per_process: bool = False) -> Dict:
+    """Energy of one schedule under every configuration of ``model``.
+
+    Returns arrays of shape (K,) for ``active``, ``idle``, ``switching``
+    and ``total`` energy, plus a (processes, K) ``per_process`` matrix of
+    active energy when asked for.
+    """
+    size = len(model)
+    if cstates is not None and len(cstates) not in (1, size):
+        raise ValueError("C-state and power model configurations differ in number")
+
+    power = model.active_power(schedule)                      # (K, L)
+    active = power @ schedule.time_at_frequency.sum(axis=0)
+    if cstates is not None:
+        idle = cstates.idle_energy(schedule, size)
+    else:
+        idle = np.broadcast_to(model.idle_power(schedule) * schedule.idle_time, (size,))
+
+    switching = model.switch_energy(schedule) * schedule.switches
+    result = {"active": active, "idle": idle, "switching": switching, "total": active + idle + switching}
+    if per_process:
+        result["per_process"] = schedule.time_at_frequency @ power.T
+    return result
+
+
+def reprice(processes, cpu, model, cstates: Optional[CStates] = None, per_process: bool = False) -> Dict:
+    return price(Schedule.from_run(processes, cpu), model, cstates, per_process)
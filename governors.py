@@ -0,0 +1,206 @@
+# governors.py
+import copy
+import math
+from typing import Dict, Type, Union
+
+
+class Governor:
+    """Chooses the CPU frequency for each execution slice.
+
+    select() is called once per slice and account() with every busy
+    interval, both in O(1). Public attributes are the governor's settings
+    (they go into cache keys); running state is kept in underscored ones.
+    """
+    name = ""
+    # Governors that ignore utilization skip the account() call entirely
+    tracks_utilization = False
+
+    def select(self, cpu, process, now: int) -> float:
+        raise NotImplementedError
+
+    def account(self, start: int, end: int):
+        pass
+
+    def describe(self) -> Dict:
+        settings = {key: value for key, value in vars(self).items() if not key.startswith("_")}
+        return {"name": self.name, **settings}
+
+
+class PriorityGovernor(Governor):
+    """The original rule: maximum frequency for priority 1, minimum otherwise."""
+    name = "priority"
+
+    def select(self, cpu, process, now):
+        return cpu.max_frequency if process.priority == 1 else cpu.min_frequency
+
+
+class PerformanceGovernor(Governor):
+    name = "performance"
+
+    def select(self, cpu, process, now):
+        return cpu.max_frequency
+
+
+class PowersaveGovernor(Governor):
+    name = "powersave"
+
+    def select(self, cpu, process, now):
+        return cpu.min_frequency
+
+
+class _WindowedGovernor(Governor):
+    # Utilization is the busy fraction of the last complete sampling window
+    tracks_utilization = True
+
+    def __init__(self, sampling_period: int = 10):
+        if sampling_period <= 0:
+            raise ValueError("Sampling period must be positive")
+        self.sampling_period = sampling_period
+        self._window_start = 0
+        self._busy = 0
+        self._utilization = 0.0
+
+    def _advance(self, now: int):
+        period = self.sampling_period
+        elapsed = now - self._window_start
+        if elapsed >= period:
+            # A whole window went by without any accounted work: idle
+            self._utilization = self._busy / period if elapsed < 2 * period else 0.0
+            self._window_start += (elapsed // period) * period
+            self._busy = 0
+
+    def account(self, start, end):
+        self._advance(start)
+        period = self.sampling_period
+        window_end = self._window_start + period
+        if end <= window_end:
+            self._busy += end - start
+            return
+        self._busy += window_end - start
+        self._utilization = self._busy / period
+        full, rest = divmod(end - window_end, period)
+        if full:
+            self._utilization = 1.0
+        self._window_start = window_end + full * period
+        self._busy = rest
+
+    def utilization(self, now: int) -> float:
+        self._advance(now)
+        return self._utilization
+
+
+class OndemandGovernor(_WindowedGovernor):
+    """Jumps to maximum above ``up_threshold``, else scales with load."""
+    name = "ondemand"
+
+    def __init__(self, up_threshold: float = 0.8, sampling_period: int = 10):
+        super().__init__(sampling_period)
+        if not 0 < up_threshold <= 1:
+            raise ValueError("Up threshold must be in (0, 1]")
+        self.up_threshold = up_threshold
+
+    def select(self, cpu, process, now):
+        load = self.utilization(now)
+        if load >= self.up_threshold:
+            return cpu.max_frequency
+        return cpu.min_frequency + load * (cpu.max_frequency - cpu.min_frequency)
+
+
+class ConservativeGovernor(_WindowedGovernor):
+    """Steps the frequency by ``freq_step`` of maximum once per window."""
+    name = "conservative"
+
+    def __init__(self, up_threshold: float = 0.8, down_threshold: float = 0.2, freq_step: float = 0.05,
+                 sampling_period: int = 10):
+        super().__init__(sampling_period)
+        if not 0 <= down_threshold < up_threshold <= 1:
+            raise ValueError("Thresholds must satisfy 0 <= down < up <= 1")
+        if not 0 < freq_step <= 1:
+            raise ValueError("Frequency step must be in (0, 1]")
+        self.up_threshold = up_threshold
+        self.down_threshold = down_threshold
+        self.freq_step = freq_step
+        self._target = None
+        self._decided_window = None
+
+    def select(self, cpu, process, now):
+        load = self.utilization(now)
+        if self._target is None:
+            self._target = cpu.min_frequency
+        if self._decided_window != self._window_start:
+            self._decided_window = self._window_start
+            step = self.freq_step * cpu.max_frequency
+            if load > self.up_threshold:
+                self._target = min(self._target + step, cpu.max_frequency)
+            elif load < self.down_threshold:
+                self._target = max(self._target - step, cpu.min_frequency)
+        return self._target
+
+
+class SchedutilGovernor(Governor):
+    """``headroom * max_frequency * util`` with a PELT-like decaying util.
+
+    Utilization moves towards 1 while busy and towards 0 while idle,
+    halving its distance every ``half_life`` time units.
+    """
+    name = "schedutil"
+    tracks_utilization = True
+
+    def __init__(self, half_life: float = 8.0, headroom: float = 1.25):
+        if half_life <= 0:
+            raise ValueError("Half-life must be positive")
+        self.half_life = half_life
+        self.headroom = headroom
+        self._decay = 0.5 ** (1 / half_life)
+        self._util = 0.0
+        self._last = 0
+
+    def _idle_until(self, now):
+        if now > self._last:
+            self._util *= self._decay ** (now - self._last)
+            self._last = now
+
+    def account(self, start, end):
+        self._idle_until(start)
+        self._util = 1.0 - (1.0 - self._util) * self._decay ** (end - start)
+        self._last = end
+
+    def select(self, cpu, process, now):
+        self._idle_until(now)
+        frequency = self.headroom * cpu.max_frequency * self._util
+        return min(max(frequency, cpu.min_frequency), cpu.max_frequency)
+
+
+GOVERNORS: Dict[str, Type[Governor]] = {
+    "priority": PriorityGovernor,
+    "performance": PerformanceGovernor,
+    "powersave": PowersaveGovernor,
+    "ondemand": OndemandGovernor,
+    "conservative": ConservativeGovernor,
+    "schedutil": SchedutilGovernor,
+}
+
+
+def register_governor(governor_class: Type[Governor]):
+    GOVERNORS[governor_class.name] = governor_class
+    return governor_class
+
+
+def make_governor(governor: Union[str, Governor, None] = None, **options) -> Governor:
+    # A name builds a new governor; an instance is used as is
+    if isinstance(governor, Governor):
+        return governor
+    name = governor or "priority"
+    if name not in GOVERNORS:
+        raise ValueError(f"Unknown frequency governor: {name}")
+    return GOVERNORS[name](**options)
+
+
+def clone_governor(governor: Union[str, Governor, None]) -> Union[str, Governor, None]:
+    # Each core of a multi-core CPU needs its own governor state
+    return copy.deepcopy(governor) if isinstance(governor, Governor) else governor
+
+
+def scaled_time(time_units: int, frequency: float, max_frequency: float) -> int:
+    # Wall time to finish time_units of max-frequency work at ``frequency``
+    return math.ceil(time_units * max_frequency / frequency - 1e-9)
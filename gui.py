@@ -1,12 +1,122 @@
 # gui.py
+import queue
+import threading
 import tkinter as tk
+from collections import deque
 from tkinter import ttk, messagebox, filedialog
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-import numpy as np
 import json
-from scheduler import Process, CPU, round_robin_scheduling
-from matplotlib.ticker import MaxNLocator
+from scheduler import CPU, round_robin_scheduling
+from workload import iter_records
+from gui_table import ArrayRows, ProcessModel, VirtualTable
+
+# NumPy, matplotlib and the modules built on them are imported on first
+# use, so the window shows up before they have loaded
+
+POLL_INTERVAL_MS = 100
+
+
+class SimulationCancelled(Exception):
+    pass
+
+
+class SimulationJob:
+    # One queued run. run() executes on a worker thread and reports back
+    # through a queue; the Tk thread only reads progress().
+    def __init__(self, records, quantum, cpu_params, cache=None, simulator=None):
+        self.records = records
+        self.quantum = quantum
+        self.cpu_params = cpu_params
+        self.cache = cache
+        self.cached = False
+        # Cache key of the run; equal keys mean equal results
+        self.key = None
+        # An IncrementalSimulator re-runs only what an edit can change
+        self.simulator = simulator
+        self.resumed_from = None
+        # Work (time units) run so far out of the work left when the run
+        # (or the re-simulated part of it) began
+        self.work_done = 0
+        self.total_work = None
+        self.cancel_event = threading.Event()
+
+    def run(self, results):
+        try:
+            from process_table import ProcessTable
+            processes = ProcessTable.from_records(self.records)
+            cpu = CPU(**self.cpu_params)
+            if self.cache is not None:
+                from cache import simulation_key
+                self.key = simulation_key(processes, cpu, "rr", time_quantum=self.quantum)
+                completed = self.cache.load(self.key, processes, cpu)
+                if completed is not None:
+                    self.cached = True
+                    self.work_done = self.total_work = 1
+                    results.put(("done", (processes, completed, cpu)))
+                    return
+
+            # Checked after every slice, so a long burst can be cancelled
+            def on_slice(process, time_units):
+                if self.cancel_event.is_set():
+                    raise SimulationCancelled()
+                if self.total_work is None:
+                    self.total_work = int(processes.remaining_time.sum()) + time_units
+                self.work_done += time_units
+            
+            if self.simulator is not None:
+                completed, cpu = self.simulator.run(processes, on_slice=on_slice)
+                self.resumed_from = self.simulator.resumed_from
+            else:
+                completed = processes.completion_list()
+                round_robin_scheduling(processes, self.quantum, cpu, on_complete=completed.append,
+                                       on_slice=on_slice)
+            if self.key is not None:
+                self.cache.store(self.key, processes, completed, cpu)
+            results.put(("done", (processes, completed, cpu)))
+        except SimulationCancelled:
+            results.put(("cancelled", None))
+        except Exception as e:
+            results.put(("error", e))
+
+    def progress(self) -> float:
+        if not self.total_work:
+            return 0.0
+        return self.work_done / self.total_work
+
+
+class PlotTab:
+    # A notebook tab whose figure and canvas are only created once it is
+    # shown with something to plot. ``drawn`` is the key of the run on
+    # screen, so a run with the same results is not drawn again.
+    def __init__(self, notebook, title, render):
+        self.frame = ttk.Frame(notebook)
+        self.placeholder = ttk.Label(self.frame, text="Run a simulation to see this plot")
+        self.placeholder.pack(expand=True)
+        notebook.add(self.frame, text=title)
+        self.render = render
+        self.figure = self.ax = self.canvas = self.toolbar = None
+        self.drawn = None
+
+    def build(self):
+        # Figure instead of pyplot: no global figure registry to clean up
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
+        self.placeholder.destroy()
+        self.figure = Figure(figsize=(10, 4))
+        self.ax = self.figure.add_subplot()
+        self.canvas = FigureCanvasTkAgg(self.figure, self.frame)
+        self.toolbar = NavigationToolbar2Tk(self.canvas, self.frame)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def show(self, key, processes, cpu):
+        if self.drawn is not None and self.drawn == key:
+            return
+        if self.figure is None:
+            self.build()
+        self.ax.clear()
+        self.render(self.ax, processes, cpu)
+        self.canvas.draw()
+        self.drawn = key
+
 
 class EnergyEfficientSchedulerGUI:
     def __init__(self, root):
@@ -17,10 +127,31 @@ class EnergyEfficientSchedulerGUI:
         self.style.theme_use('clam')
         self.configure_styles()
         
+        self.processes = ProcessModel()
+        self.last_run = None
+        self.simulator = None
+        self.cache = None
+        # Results behind the plots and their key (see PlotTab)
+        self.plot_data = None
+        self.plot_key = None
         self.create_widgets()
         self.setup_layout()
-        self.processes = []
         
+        # Background simulation state
+        self.pending_jobs = deque()
+        self.active_job = None
+        self.job_results = queue.Queue()
+        
+    def simulation_cache(self):
+        if self.cache is None:
+            from cache import DEFAULT_DIRECTORY, SimulationCache
+            try:
+                self.cache = SimulationCache(DEFAULT_DIRECTORY)
+            except OSError:
+                # No writable cache directory; keep results in memory only
+                self.cache = SimulationCache()
+        return self.cache
+
     def configure_styles(self):
         self.style.configure('TFrame', background='#f5f5f5')
         self.style.configure('TLabel', background='#f5f5f5', font=('Segoe UI', 10))
@@ -60,14 +191,7 @@ class EnergyEfficientSchedulerGUI:
     
     def create_process_input_widgets(self):
         columns = ("PID", "Arrival Time", "Burst Time", "Priority")
-        self.process_table = ttk.Treeview(self.input_frame, columns=columns, show="headings", height=8)
-        
-        for col, width in zip(columns, [50, 90, 80, 70]):
-            self.process_table.heading(col, text=col)
-            self.process_table.column(col, width=width, anchor=tk.CENTER)
-        
-        scrollbar = ttk.Scrollbar(self.input_frame, orient=tk.VERTICAL, command=self.process_table.yview)
-        self.process_table.configure(yscrollcommand=scrollbar.set)
+        self.process_table = VirtualTable(self.input_frame, columns, [50, 90, 80, 70], height=8, source=self.processes)
         
         # Entry fields
         self.pid_var = tk.IntVar()
@@ -99,10 +223,12 @@ class EnergyEfficientSchedulerGUI:
         io_frame.grid(row=4, column=0, columnspan=4)
         ttk.Button(io_frame, text="Import", command=self.import_processes).pack(side=tk.LEFT, padx=5)
         ttk.Button(io_frame, text="Export", command=self.export_processes).pack(side=tk.LEFT, padx=5)
+        ttk.Button(io_frame, text="Save Trace", command=self.save_trace).pack(side=tk.LEFT, padx=5)
+        ttk.Button(io_frame, text="Open Trace", command=self.open_trace).pack(side=tk.LEFT, padx=5)
         
         # Layout
-        self.process_table.grid(row=0, column=0, columnspan=4, sticky='nsew')
-        scrollbar.grid(row=0, column=4, sticky='ns')
+        self.process_table.tree.grid(row=0, column=0, columnspan=4, sticky='nsew')
+        self.process_table.scrollbar.grid(row=0, column=4, sticky='ns')
 
     def add_process(self):
         try:
@@ -114,11 +240,8 @@ class EnergyEfficientSchedulerGUI:
             if pid <= 0 or arrival < 0 or burst <= 0 or priority <= 0:
                 raise ValueError("All values must be positive integers")
             
-            for item in self.process_table.get_children():
-                if self.process_table.item(item)['values'][0] == pid:
-                    raise ValueError(f"PID {pid} already exists")
-            
-            self.process_table.insert("", "end", values=(pid, arrival, burst, priority))
+            self.processes.add(pid, arrival, burst, priority)
+            self.process_table.scroll_to(len(self.processes))
             self.pid_var.set(pid + 1)
             self.arrival_var.set("")
             self.burst_var.set("")
@@ -130,39 +253,45 @@ class EnergyEfficientSchedulerGUI:
 
     def remove_process(self):
         try:
-            selected = self.process_table.selection()
+            selected = self.process_table.selected_rows()
             if not selected:
                 raise ValueError("No process selected")
             
-            pid = self.process_table.item(selected)['values'][0]
-            self.process_table.delete(selected)
-            self.status_var.set(f"Removed process {pid}")
+            records = self.processes.records()
+            pids = [records[row][0] for row in selected]
+            self.processes.remove(pids)
+            self.process_table.refresh()
+            self.status_var.set(f"Removed process {', '.join(map(str, pids))}")
         
         except Exception as e:
             messagebox.showerror("Error", str(e))
             self.status_var.set("Error removing process")
 
     def clear_processes(self):
-        for item in self.process_table.get_children():
-            self.process_table.delete(item)
+        self.processes.clear()
+        self.process_table.set_source(self.processes)
         self.status_var.set("Cleared all processes")
 
     def import_processes(self):
         try:
-            filepath = filedialog.askopenfilename(filetypes=[("JSON", "*.json")])
+            filepath = filedialog.askopenfilename(filetypes=[
+                ("Workloads", "*.json *.jsonl *.csv *.gz"),
+                ("JSON", "*.json"),
+                ("JSON Lines", "*.jsonl"),
+                ("CSV", "*.csv")
+            ])
             if not filepath:
                 return
             
-            with open(filepath, 'r') as f:
-                processes = json.load(f)
-            
-            self.clear_processes()
-            for proc in processes:
-                self.process_table.insert("", "end", values=(
-                    proc['pid'], proc['arrival'], proc['burst'], proc['priority']
-                ))
+            # Load into a fresh model first so a bad file leaves the current one intact
+            model = ProcessModel()
+            count = model.extend(
+                (proc['pid'], proc['arrival'], proc['burst'], proc['priority']) for proc in iter_records(filepath)
+            )
             
-            self.status_var.set(f"Imported {len(processes)} processes")
+            self.processes = model
+            self.process_table.set_source(model)
+            self.status_var.set(f"Imported {count} processes")
         
         except Exception as e:
             messagebox.showerror("Error", str(e))
@@ -170,15 +299,10 @@ class EnergyEfficientSchedulerGUI:
 
     def export_processes(self):
         try:
-            processes = []
-            for item in self.process_table.get_children():
-                pid, arrival, burst, priority = self.process_table.item(item)['values']
-                processes.append({
-                    'pid': pid,
-                    'arrival': arrival,
-                    'burst': burst,
-                    'priority': priority
-                })
+            processes = [
+                {'pid': pid, 'arrival': arrival, 'burst': burst, 'priority': priority}
+                for pid, arrival, burst, priority in self.processes.records()
+            ]
             
             if not processes:
                 raise ValueError("No processes to export")
@@ -200,6 +324,49 @@ class EnergyEfficientSchedulerGUI:
             messagebox.showerror("Error", str(e))
             self.status_var.set("Export failed")
 
+    def save_trace(self):
+        try:
+            if self.last_run is None:
+                raise ValueError("Run a simulation before saving a trace")
+            
+            filepath = filedialog.asksaveasfilename(
+                defaultextension=".sched",
+                filetypes=[("Scheduler traces", "*.sched")]
+            )
+            if not filepath:
+                return
+            
+            from tracefile import write_trace
+            processes, completed, cpu = self.last_run
+            write_trace(filepath, processes, cpu, completed)
+            self.status_var.set(f"Saved trace of {len(processes)} processes")
+        
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            self.status_var.set("Saving trace failed")
+
+    def open_trace(self):
+        try:
+            filepath = filedialog.askopenfilename(filetypes=[("Scheduler traces", "*.sched"), ("All files", "*")])
+            if not filepath:
+                return
+            
+            # The trace stays memory-mapped; results and plots read it lazily
+            from tracefile import TraceFile
+            trace = TraceFile(filepath)
+            model = ProcessModel()
+            model.extend(trace.records())
+            self.processes = model
+            self.process_table.set_source(model)
+            self.last_run = None
+            if trace.metadata.get("completed"):
+                self.show_results(trace, trace, trace.cpu())
+            self.status_var.set(f"Opened trace of {len(trace)} processes")
+        
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+            self.status_var.set("Opening trace failed")
+
     def create_control_widgets(self):
         # Time quantum
         ttk.Label(self.control_frame, text="Time Quantum:").grid(row=0, column=0, sticky='e')
@@ -220,23 +387,22 @@ class EnergyEfficientSchedulerGUI:
             ttk.Label(self.control_frame, text=label).grid(row=i+2, column=0, sticky='e')
             ttk.Entry(self.control_frame, textvariable=getattr(self, var_name), width=8).grid(row=i+2, column=1, sticky='w')
         
-        # Run button
-        ttk.Button(
-            self.control_frame,
-            text="Run Simulation",
-            command=self.run_simulation
-        ).grid(row=5, column=0, columnspan=2, pady=15)
+        # Run / cancel buttons
+        run_frame = ttk.Frame(self.control_frame)
+        run_frame.grid(row=5, column=0, columnspan=2, pady=(15, 5))
+        ttk.Button(run_frame, text="Run Simulation", command=self.run_simulation).pack(side=tk.LEFT, padx=5)
+        self.cancel_button = ttk.Button(run_frame, text="Cancel", command=self.cancel_simulation, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)
+        
+        # Progress of the running job and number of queued runs
+        self.progress = ttk.Progressbar(self.control_frame, mode='determinate', maximum=100)
+        self.progress.grid(row=6, column=0, columnspan=2, sticky='ew', pady=5)
+        self.queue_var = tk.StringVar(value="Queued runs: 0")
+        ttk.Label(self.control_frame, textvariable=self.queue_var).grid(row=7, column=0, columnspan=2)
 
     def create_result_widgets(self):
         columns = ("PID", "Start", "Finish", "Turnaround", "Waiting")
-        self.result_table = ttk.Treeview(self.result_frame, columns=columns, show="headings", height=8)
-        
-        for col, width in zip(columns, [50, 80, 80, 80, 80]):
-            self.result_table.heading(col, text=col)
-            self.result_table.column(col, width=width, anchor=tk.CENTER)
-        
-        scrollbar = ttk.Scrollbar(self.result_frame, orient=tk.VERTICAL, command=self.result_table.yview)
-        self.result_table.configure(yscrollcommand=scrollbar.set)
+        self.result_table = VirtualTable(self.result_frame, columns, [50, 80, 80, 80, 80], height=8)
         
         # Metrics
         self.metrics_frame = ttk.Frame(self.result_frame)
@@ -250,34 +416,18 @@ class EnergyEfficientSchedulerGUI:
             ttk.Label(self.metrics_frame, textvariable=var).pack(anchor=tk.W)
         
         # Layout
-        self.result_table.pack(fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.result_table.tree.pack(fill=tk.BOTH, expand=True)
+        self.result_table.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.metrics_frame.pack(fill=tk.X)
 
     def create_visualization_widgets(self):
         self.notebook = ttk.Notebook(self.visualization_frame)
-        
-        # Power tab
-        self.power_tab = ttk.Frame(self.notebook)
-        self.power_fig, self.power_ax = plt.subplots(figsize=(10, 4))
-        self.power_canvas = FigureCanvasTkAgg(self.power_fig, self.power_tab)
-        self.power_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.notebook.add(self.power_tab, text="Power")
-        
-        # Gantt tab
-        self.gantt_tab = ttk.Frame(self.notebook)
-        self.gantt_fig, self.gantt_ax = plt.subplots(figsize=(10, 4))
-        self.gantt_canvas = FigureCanvasTkAgg(self.gantt_fig, self.gantt_tab)
-        self.gantt_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.notebook.add(self.gantt_tab, text="Gantt")
-        
-        # Freq tab
-        self.freq_tab = ttk.Frame(self.notebook)
-        self.freq_fig, self.freq_ax = plt.subplots(figsize=(10, 4))
-        self.freq_canvas = FigureCanvasTkAgg(self.freq_fig, self.freq_tab)
-        self.freq_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
-        self.notebook.add(self.freq_tab, text="Frequency")
-        
+        self.plot_tabs = [
+            PlotTab(self.notebook, "Power", self.draw_power),
+            PlotTab(self.notebook, "Gantt", self.draw_gantt),
+            PlotTab(self.notebook, "Frequency", self.draw_frequency),
+        ]
+        self.notebook.bind("<<NotebookTabChanged>>", self.show_current_plot)
         self.notebook.pack(fill=tk.BOTH, expand=True)
 
     def setup_layout(self):
@@ -295,100 +445,151 @@ class EnergyEfficientSchedulerGUI:
     def run_simulation(self):
         try:
             # Get processes
-            processes = []
-            for item in self.process_table.get_children():
-                pid, arrival, burst, priority = self.process_table.item(item)['values']
-                processes.append(Process(pid, arrival, burst, priority))
-            
-            if not processes:
+            records = self.processes.records()
+            if not records:
                 raise ValueError("No processes to simulate")
             
             # Get params
             quantum = self.quantum_var.get()
-            cpu = CPU(
-                base_power=self.base_power_var.get(),
-                max_frequency=self.max_freq_var.get(),
-                min_frequency=self.min_freq_var.get()
-            )
-            
-            # Run simulation
-            completed = round_robin_scheduling(processes, quantum, cpu)
-            
-            # Update results
-            self.result_table.delete(*self.result_table.get_children())
-            total_turnaround = 0
-            total_waiting = 0
-            
-            for proc in completed:
-                turnaround = proc.finish_time - proc.arrival_time
-                waiting = turnaround - proc.burst_time
-                total_turnaround += turnaround
-                total_waiting += waiting
-                
-                self.result_table.insert("", "end", values=(
-                    proc.pid,
-                    proc.start_time,
-                    proc.finish_time,
-                    turnaround,
-                    waiting
-                ))
+            if quantum <= 0:
+                raise ValueError("Time quantum must be positive")
+            cpu_params = {
+                "base_power": self.base_power_var.get(),
+                "max_frequency": self.max_freq_var.get(),
+                "min_frequency": self.min_freq_var.get()
+            }
             
-            # Update metrics
-            n = len(completed)
-            self.avg_turnaround_var.set(f"Avg Turnaround: {total_turnaround/n:.2f}")
-            self.avg_waiting_var.set(f"Avg Waiting: {total_waiting/n:.2f}")
-            self.power_var.set(f"Power Used: {cpu.power_consumption:.2f} J")
-            self.idle_var.set(f"Idle Time: {cpu.idle_time}")
+            # Reuse the previous run up to the edited processes when only the
+            # workload changed; jobs run one at a time, so they can share it
+            simulator = self.simulator
+            if simulator is None or (simulator.time_quantum, simulator.cpu_params) != (quantum, cpu_params):
+                from checkpoint import IncrementalSimulator
+                simulator = self.simulator = IncrementalSimulator(quantum, cpu_params)
             
-            # Energy savings
-            baseline = sum(p.burst_time for p in processes) * cpu.base_power
-            savings = ((baseline - cpu.power_consumption) / baseline) * 100
-            self.savings_var.set(f"Energy Saved: {savings:.1f}%")
-            
-            # Update plots
-            self.update_plots(completed, cpu)
-            self.status_var.set("Simulation completed")
+            # Queue the run; the worker thread picks it up when free
+            self.pending_jobs.append(SimulationJob(records, quantum, cpu_params, self.simulation_cache(), simulator))
+            self.queue_var.set(f"Queued runs: {len(self.pending_jobs)}")
+            if self.active_job is None:
+                self.start_next_job()
         
         except Exception as e:
             messagebox.showerror("Error", str(e))
             self.status_var.set("Simulation failed")
 
-    def update_plots(self, processes, cpu):
-        # Power plot
-        self.power_ax.clear()
+    def start_next_job(self):
+        if not self.pending_jobs:
+            self.active_job = None
+            self.cancel_button.configure(state=tk.DISABLED)
+            return
+        
+        job = self.pending_jobs.popleft()
+        self.active_job = job
+        self.queue_var.set(f"Queued runs: {len(self.pending_jobs)}")
+        self.progress.configure(value=0)
+        self.cancel_button.configure(state=tk.NORMAL)
+        self.status_var.set(f"Simulating {len(job.records)} processes...")
+        
+        threading.Thread(target=job.run, args=(self.job_results,), daemon=True).start()
+        self.root.after(POLL_INTERVAL_MS, self.poll_simulation)
+
+    def cancel_simulation(self):
+        if self.active_job is not None:
+            self.active_job.cancel_event.set()
+            self.status_var.set("Cancelling...")
+
+    def poll_simulation(self):
+        # Runs on the Tk thread; the worker only ever touches its job and the result queue
+        job = self.active_job
+        if job is None:
+            return
+        self.progress.configure(value=100 * job.progress())
+        
+        try:
+            outcome, payload = self.job_results.get_nowait()
+        except queue.Empty:
+            self.root.after(POLL_INTERVAL_MS, self.poll_simulation)
+            return
+        
+        if outcome == "done":
+            processes, completed, cpu = payload
+            self.last_run = payload
+            self.show_results(processes, completed, cpu, job.key)
+            if job.cached:
+                self.status_var.set("Simulation completed (cached)")
+            elif job.resumed_from is not None:
+                self.status_var.set(f"Simulation completed (re-simulated from t={job.resumed_from})")
+            else:
+                self.status_var.set("Simulation completed")
+        elif outcome == "cancelled":
+            self.status_var.set("Simulation cancelled")
+        else:
+            messagebox.showerror("Error", str(payload))
+            self.status_var.set("Simulation failed")
+        self.progress.configure(value=0)
+        self.start_next_job()
+
+    def show_results(self, processes, completed, cpu, key=None):
+        # Update results, computed column-wise and shown through the virtual table
+        import numpy as np
+        finish = completed.column("finish_time")
+        turnaround = finish - completed.column("arrival_time")
+        waiting = turnaround - completed.column("burst_time")
+        self.result_table.set_source(ArrayRows(np.column_stack((
+            completed.column("pid"),
+            completed.column("start_time"),
+            finish,
+            turnaround,
+            waiting
+        ))))
+        
+        # Update metrics
+        self.avg_turnaround_var.set(f"Avg Turnaround: {turnaround.mean():.2f}")
+        self.avg_waiting_var.set(f"Avg Waiting: {waiting.mean():.2f}")
+        self.power_var.set(f"Power Used: {cpu.power_consumption:.2f} J")
+        self.idle_var.set(f"Idle Time: {cpu.idle_time}")
+        
+        # Energy savings
+        baseline = int(processes.burst_time.sum()) * cpu.base_power
+        savings = ((baseline - cpu.power_consumption) / baseline) * 100
+        self.savings_var.set(f"Energy Saved: {savings:.1f}%")
+        
+        # Update plots
+        self.update_plots(completed, cpu, key)
+
+    def update_plots(self, processes, cpu, key=None):
+        # Only the visible tab is drawn now, the others once they are selected
+        self.plot_data = (processes, cpu)
+        self.plot_key = key if key is not None else object()
+        self.show_current_plot()
+
+    def show_current_plot(self, event=None):
+        if self.plot_data is None:
+            return
+        tab = self.plot_tabs[self.notebook.index(self.notebook.select())]
+        tab.show(self.plot_key, *self.plot_data)
+
+    def draw_power(self, ax, processes, cpu):
+        from visualization import plot_step
         if cpu.power_history:
-            times, power = zip(*cpu.power_history)
-            self.power_ax.step(times, power, where='post', label='Power (W)')
-            self.power_ax.set_xlabel("Time")
-            self.power_ax.set_ylabel("Power (W)")
-            self.power_ax.legend()
-            self.power_ax.grid(True)
-            self.power_canvas.draw()
-        
-        # Gantt chart
-        self.gantt_ax.clear()
-        for proc in processes:
-            for start, end in proc.execution_history:
-                self.gantt_ax.barh(
-                    f"P{proc.pid}",
-                    end - start,
-                    left=start,
-                    color='skyblue',
-                    edgecolor='black'
-                )
-        self.gantt_ax.set_xlabel("Time")
-        self.gantt_ax.invert_yaxis()
-        self.gantt_canvas.draw()
-        
-        # Frequency plot
-        self.freq_ax.clear()
+            plot_step(ax, cpu.power_history, label='Power (W)')
+            ax.set_xlabel("Time")
+            ax.set_ylabel("Power (W)")
+            ax.legend()
+            ax.grid(True)
+
+    def draw_gantt(self, ax, processes, cpu):
+        from visualization import plot_gantt
+        plot_gantt(ax, processes)
+        ax.set_xlabel("Time")
+        ax.invert_yaxis()
+
+    def draw_frequency(self, ax, processes, cpu):
+        from visualization import plot_step
         if cpu.frequency_history:
-            times, freq = zip(*cpu.frequency_history)
-            self.freq_ax.step(times, freq, where='post', label='Freq (GHz)', color='orange')
-            self.freq_ax.set_xlabel("Time")
-            self.freq_ax.set_ylabel("Frequency (GHz)")
-            self.freq_ax.legend()
-            self.freq_canvas.draw()
+            plot_step(ax, cpu.frequency_history, label='Freq (GHz)', color='orange')
+            ax.set_xlabel("Time")
+            ax.set_ylabel("Frequency (GHz)")
+            ax.legend()
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -0,0 +1,132 @@
+# gui_table.py
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+Record = Tuple[int, int, int, int]
+
+
+class ProcessModel:
+    """GUI process list keyed by PID, kept in insertion order."""
+
+    def __init__(self):
+        self._by_pid: Dict[int, Record] = {}
+        self._rows = None
+
+    def __len__(self):
+        return len(self._by_pid)
+
+    def __contains__(self, pid: int):
+        return pid in self._by_pid
+
+    def add(self, pid: int, arrival: int, burst: int, priority: int):
+        if pid in self._by_pid:
+            raise ValueError(f"PID {pid} already exists")
+        self._by_pid[pid] = (pid, arrival, burst, priority)
+        self._rows = None
+
+    def extend(self, records: Iterable[Sequence[int]]) -> int:
+        # Bulk insert; nothing is added if any PID would be duplicated
+        added = {}
+        for pid, arrival, burst, priority in records:
+            pid = int(pid)
+            if pid in self._by_pid or pid in added:
+                raise ValueError(f"PID {pid} already exists")
+            added[pid] = (pid, int(arrival), int(burst), int(priority))
+        self._by_pid.update(added)
+        self._rows = None
+        return len(added)
+
+    def remove(self, pids: Iterable[int]):
+        for pid in pids:
+            del self._by_pid[pid]
+        self._rows = None
+
+    def clear(self):
+        self._by_pid.clear()
+        self._rows = None
+
+    def records(self) -> List[Record]:
+        if self._rows is None:
+            self._rows = list(self._by_pid.values())
+        return self._rows
+
+    def window(self, first: int, count: int) -> List[Record]:
+        return self.records()[first:first + count]
+
+
+class ArrayRows:
+    """Row source over a 2-D array, e.g. bulk-computed simulation results."""
+
+    def __init__(self, array):
+        self.array = array
+
+    def __len__(self):
+        return len(self.array)
+
+    def window(self, first: int, count: int) -> List[tuple]:
+        rows = self.array[first:first + count]
+        if hasattr(rows, "tolist"):
+            rows = rows.tolist()
+        return [tuple(row) for row in rows]
+
+
+class VirtualTable:
+    """Treeview that only holds the rows currently on screen.
+
+    The source needs ``__len__`` and ``window(first, count)``. Scrolling
+    re-renders the visible window, so the widget cost stays constant no
+    matter how many rows the source has.
+    """
+
+    def __init__(self, parent, columns: Sequence[str], widths: Sequence[int], height: int = 8, source=None):
+        self.height = height
+        self.first = 0
+        self.source = source if source is not None else ArrayRows([])
+
+        self.tree = ttk.Treeview(parent, columns=columns, show="headings", height=height)
+        for col, width in zip(columns, widths):
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=width, anchor=tk.CENTER)
+
+        self.scrollbar = ttk.Scrollbar(parent, orient=tk.VERTICAL, command=self._on_scroll)
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_wheel)
+
+    def set_source(self, source):
+        self.source = source
+        self.first = 0
+        self.refresh()
+
+    def refresh(self):
+        total = len(self.source)
+        self.first = max(0, min(self.first, total - self.height))
+        self.tree.delete(*self.tree.get_children())
+        # Item ids are absolute row positions, so selections map back to the source
+        for offset, values in enumerate(self.source.window(self.first, self.height)):
+            self.tree.insert("", "end", iid=str(self.first + offset), values=values)
+        if total:
+            self.scrollbar.set(self.first / total, min(1.0, (self.first + self.height) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll_to(self, first: int):
+        self.first = first
+        self.refresh()
+
+    def selected_rows(self) -> List[int]:
+        return [int(iid) for iid in self.tree.selection()]
+
+    def _on_scroll(self, action, amount, unit=None):
+        if action == tk.MOVETO:
+            self.scroll_to(int(float(amount) * len(self.source)))
+        elif action == tk.SCROLL:
+            step = self.height if unit == tk.PAGES else 1
+            self.scroll_to(self.first + int(amount) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, "delta", 0) > 0:
+            self.scroll_to(self.first - 3)
+        else:
+            self.scroll_to(self.first + 3)
+        return "break"
@@ -0,0 +1,232 @@
+# history.py
+from array import array
+from itertools import chain
+from typing import Iterator, List, Tuple, Union
+
+LEVELS = ("none", "summary", "full")
+
+
+class NullSeries:
+    """Discards every sample; used when only totals are wanted."""
+    __slots__ = ()
+
+    def append(self, sample: Tuple[float, float]):
+        pass
+
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+
+class StepSeries:
+    """Run-length-encoded (time, value) step series.
+
+    Only samples whose value differs from the previous one are stored, in
+    typed arrays. The time of the latest sample is kept so the series still
+    spans the same range when plotted.
+    """
+    __slots__ = ("times", "values", "last_time")
+
+    def __init__(self):
+        self.times = array("d")
+        self.values = array("d")
+        self.last_time = None
+
+    def append(self, sample: Tuple[float, float]):
+        time, value = sample
+        if not self.values or self.values[-1] != value:
+            self.times.append(time)
+            self.values.append(value)
+        self.last_time = time
+
+    def _has_tail(self) -> bool:
+        return bool(self.times) and self.last_time > self.times[-1]
+
+    def __len__(self):
+        return len(self.times) + self._has_tail()
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        yield from zip(self.times, self.values)
+        if self._has_tail():
+            yield self.last_time, self.values[-1]
+
+    def arrays(self):
+        import numpy as np
+        times = np.array(self.times, dtype=np.float64)
+        values = np.array(self.values, dtype=np.float64)
+        if self._has_tail():
+            times = np.append(times, self.last_time)
+            values = np.append(values, values[-1])
+        return times, values
+
+
+class SliceSummary:
+    """Execution history kept at summary level: when a process first
+    started and last stopped running and how many slices it ran, without
+    the slices themselves."""
+    __slots__ = ("first_start", "last_finish", "count")
+
+    def __init__(self, first_start: int = -1, last_finish: int = -1, count: int = 0):
+        self.first_start = first_start
+        self.last_finish = last_finish
+        self.count = count
+
+    @classmethod
+    def of(cls, intervals) -> "SliceSummary":
+        if not intervals:
+            return cls()
+        return cls(intervals[0][0], intervals[-1][1], len(intervals))
+
+    def add(self, start: int, end: int, merge: bool = False):
+        # With merge set, a slice starting where the last one ended extends it
+        if not self.count:
+            self.first_start = start
+        elif merge and self.last_finish == start:
+            self.last_finish = end
+            return
+        self.last_finish = end
+        self.count += 1
+
+    def copy(self) -> "SliceSummary":
+        return SliceSummary(self.first_start, self.last_finish, self.count)
+
+    def __len__(self):
+        return self.count
+
+    def __eq__(self, other):
+        return isinstance(other, SliceSummary) and (self.first_start, self.last_finish, self.count) == \
+            (other.first_start, other.last_finish, other.count)
+
+    def __repr__(self):
+        return f"SliceSummary(first_start={self.first_start}, last_finish={self.last_finish}, count={self.count})"
+
+
+class HistoryRecorder:
+    """Decides how much power, frequency and execution history a CPU keeps.
+
+    ``none`` keeps totals only, ``summary`` keeps run-length-encoded change
+    points and per process only a SliceSummary, and ``full`` keeps every
+    sample and slice. With ``coalesce`` set, a slice that starts where the
+    same process's previous slice ended extends that slice instead of
+    adding a new one, and zero-length slices are dropped.
+    """
+
+    def __init__(self, level: str = "full", coalesce: bool = False):
+        if level not in LEVELS:
+            raise ValueError(f"History level must be one of {', '.join(LEVELS)}")
+        self.level = level
+        self.coalesce = coalesce
+
+    def new_series(self) -> Union[List[Tuple[float, float]], StepSeries, NullSeries]:
+        if self.level == "full":
+            return []
+        if self.level == "summary":
+            return StepSeries()
+        return NullSeries()
+
+    def slice_recorder(self):
+        if self.level == "none":
+            return _skip_slice
+        if self.level == "summary":
+            return _merge_summary if self.coalesce else _add_summary
+        if self.coalesce:
+            return _coalesce_slice
+        return _append_slice
+
+
+def _skip_slice(process, start: int, end: int):
+    pass
+
+
+def _append_slice(process, start: int, end: int):
+    process.execution_history.append((start, end))
+
+
+def _coalesce_slice(process, start: int, end: int):
+    if start == end:
+        return
+    history = process.execution_history
+    if isinstance(history, list):
+        if history and history[-1][1] == start:
+            history[-1] = (history[-1][0], end)
+            return
+    elif history.extend_last(start, end):
+        return
+    history.append((start, end))
+
+
+def _summary_of(process):
+    # Process lists start out with an empty list; ProcessRow views add to
+    # their table's summary columns
+    history = process.execution_history
+    if isinstance(history, list):
+        history = process.execution_history = SliceSummary.of(history)
+    return history
+
+
+def _add_summary(process, start: int, end: int):
+    _summary_of(process).add(start, end)
+
+
+def _merge_summary(process, start: int, end: int):
+    if start != end:
+        _summary_of(process).add(start, end, merge=True)
+
+
+def slice_summaries(processes):
+    # (first_start, last_finish, count) arrays in input order when the
+    # processes were run at summary level, else None
+    if hasattr(processes, "slice_summary"):
+        return processes.slice_summary()
+    histories = [p.execution_history for p in processes]
+    if not any(isinstance(h, SliceSummary) for h in histories):
+        return None
+    import numpy as np
+    histories = [h if isinstance(h, SliceSummary) else SliceSummary.of(h) for h in histories]
+    return tuple(np.array([getattr(h, name) for h in histories], dtype=np.int64) for name in SliceSummary.__slots__)
+
+
+def set_slice_summaries(processes, rows, first_start, last_finish, count):
+    # Inverse of slice_summaries for the given rows
+    if hasattr(processes, "set_slice_summary"):
+        processes.set_slice_summary(rows, first_start, last_finish, count)
+        return
+    import numpy as np
+    columns = (np.asarray(a, dtype=np.int64).tolist() for a in (rows, first_start, last_finish, count))
+    for row, first, last, n in zip(*columns):
+        processes[row].execution_history = SliceSummary(first, last, n)
+
+
+def series_mark(series):
+    # Opaque position in a series that restore_series can cut back to
+    if isinstance(series, StepSeries):
+        return len(series.times), series.last_time
+    return len(series)
+
+
+def restore_series(series, source, mark):
+    # Make ``series`` the prefix of ``source`` (possibly itself) up to mark
+    if isinstance(series, StepSeries):
+        count, series.last_time = mark
+        series.times, series.values = source.times[:count], source.values[:count]
+    elif isinstance(series, list):
+        series[:] = source[:mark]
+
+
+def get_recorder(history: Union[str, HistoryRecorder, None]) -> HistoryRecorder:
+    if isinstance(history, HistoryRecorder):
+        return history
+    return HistoryRecorder(history or "full")
+
+
+def series_arrays(series):
+    # (times, values) for plotting, straight from the compact form if possible
+    if hasattr(series, "arrays"):
+        return series.arrays()
+    if not series:
+        return (), ()
+    import numpy as np
+    flat = np.fromiter(chain.from_iterable(series), dtype=np.float64, count=2 * len(series))
+    return flat[0::2], flat[1::2]
@@ -1,9 +1,10 @@
 #  main.py
+import logging
 from scheduler import Process
 from simulation import simulate_round_robin
-from visualization import visualize_power_consumption
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
     try:
         processes = [
             Process(1, 0, 100, 1),
@@ -14,6 +15,9 @@ if __name__ == "__main__":
         
         time_quantum = 3
         completed, cpu = simulate_round_robin(processes, time_quantum)
+
+        # Plotting pulls in matplotlib, so only load it once there is something to show
+        from visualization import visualize_power_consumption
         visualize_power_consumption(completed, cpu)
     
     except Exception as e:
@@ -0,0 +1,147 @@
+# metrics.py
+import math
+from typing import Dict, Iterable
+
+QUANTILES = (0.5, 0.95, 0.99)
+METRICS = ("turnaround", "waiting", "response", "energy")
+
+
+class RunningStats:
+    """Streaming count, mean, variance (Welford), min and max."""
+    __slots__ = ("count", "mean", "_m2", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """Fixed-memory quantile sketch with relative error guarantees.
+
+    Values are counted in logarithmically sized buckets (as in DDSketch),
+    so any quantile is within ``relative_accuracy`` of the true value. When
+    more than ``max_buckets`` buckets are in use the lowest ones are
+    merged, which only costs accuracy in the far low tail.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 2048):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1")
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.max_buckets = max_buckets
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.negative = None
+        self.count = 0
+
+    def add(self, value: float):
+        self.count += 1
+        if value > 0:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            buckets = self.buckets
+            buckets[key] = buckets.get(key, 0) + 1
+            if len(buckets) > self.max_buckets:
+                self._collapse()
+        elif value == 0:
+            self.zero_count += 1
+        else:
+            # Negative values are rare here; mirror them into a second sketch
+            if self.negative is None:
+                self.negative = QuantileSketch(1 - 2 / (self.gamma + 1), self.max_buckets)
+            self.negative.add(-value)
+
+    def _collapse(self):
+        keys = sorted(self.buckets)
+        lowest, target = keys[0], keys[1]
+        self.buckets[target] += self.buckets.pop(lowest)
+
+    def _value(self, key: int) -> float:
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return math.nan
+        rank = q * (self.count - 1)
+
+        negatives = self.negative.count if self.negative is not None else 0
+        if rank < negatives:
+            return -self.negative.quantile(1 - rank / max(negatives - 1, 1))
+        seen = negatives + self.zero_count
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return self._value(key)
+        return self._value(max(self.buckets))
+
+
+class OnlineMetrics:
+    """Per-process metrics accumulated as processes complete.
+
+    Pass ``observe`` (or the instance itself) as a scheduler's on_complete
+    callback so finished processes need not be kept.
+    """
+
+    def __init__(self, quantiles: Iterable[float] = QUANTILES, relative_accuracy: float = 0.01):
+        self.quantiles = tuple(quantiles)
+        self.stats = {name: RunningStats() for name in METRICS}
+        self.sketches = {name: QuantileSketch(relative_accuracy) for name in METRICS}
+        self.count = 0
+
+    def observe(self, process):
+        turnaround = process.finish_time - process.arrival_time
+        values = (
+            turnaround,
+            turnaround - process.burst_time,
+            process.start_time - process.arrival_time,
+            process.energy,
+        )
+        for name, value in zip(METRICS, values):
+            self.stats[name].add(value)
+            self.sketches[name].add(value)
+        self.count += 1
+
+    __call__ = observe
+
+    def summary(self, cpu=None) -> Dict[str, float]:
+        if not self.count:
+            raise ValueError("No completed processes observed")
+        result = {"count": self.count}
+        for name in METRICS:
+            stats = self.stats[name]
+            result[f"avg_{name}"] = stats.mean
+            result[f"std_{name}"] = stats.std
+            result[f"max_{name}"] = stats.max
+            for q in self.quantiles:
+                result[f"p{_percentile_label(q)}_{name}"] = self.sketches[name].quantile(q)
+        if cpu is not None:
+            result["total_power"] = cpu.power_consumption
+            result["idle_time"] = cpu.idle_time
+        return result
+
+
+def _percentile_label(q: float) -> str:
+    return f"{q * 100:g}".replace(".", "_")
@@ -0,0 +1,185 @@
+# multicore.py
+import heapq
+from collections import deque
+from typing import Callable, Iterable, List, Optional, Union
+from scheduler import CPU, Process, arrival_feed
+from history import HistoryRecorder
+from governors import Governor, clone_governor
+from tracing import Tracer
+
+MAX_CORES = 256
+
+
+class MultiCoreCPU:
+    def __init__(self, cores: int = 4, base_power: float = 100.0, max_frequency: float = 3.0,
+                 min_frequency: float = 1.0, history: Union[str, HistoryRecorder] = "full",
+                 governor: Union[str, Governor] = "priority", switch_latency: int = 0, switch_energy: float = 0.0,
+                 speed_scaling: bool = False):
+        if not 1 <= cores <= MAX_CORES:
+            raise ValueError(f"Core count must be between 1 and {MAX_CORES}")
+        self.base_power = base_power
+        self.max_frequency = max_frequency
+        self.min_frequency = min_frequency
+        # Every core keeps its own frequency state, energy totals and histories
+        self.cores = [CPU(base_power, max_frequency, min_frequency, history=history, governor=clone_governor(governor),
+                          switch_latency=switch_latency, switch_energy=switch_energy, speed_scaling=speed_scaling)
+                      for _ in range(cores)]
+
+    @property
+    def core_count(self) -> int:
+        return len(self.cores)
+
+    @property
+    def power_consumption(self) -> float:
+        return sum(core.power_consumption for core in self.cores)
+
+    @property
+    def idle_time(self) -> int:
+        return sum(core.idle_time for core in self.cores)
+
+
+class GlobalQueueBalancer:
+    """One FIFO ready queue shared by all cores."""
+
+    def __init__(self, cores: int):
+        self.queue = deque()
+
+    def push(self, process: Process, core: Optional[int]):
+        self.queue.append(process)
+
+    def pop(self, core: int) -> Optional[Process]:
+        return self.queue.popleft() if self.queue else None
+
+    def __len__(self):
+        return len(self.queue)
+
+
+class WorkStealingBalancer:
+    """Per-core FIFO queues; an empty core steals from the tail of another.
+
+    New arrivals are spread over the cores in turn and preempted processes
+    go back to the core they ran on.
+    """
+
+    def __init__(self, cores: int):
+        self.queues = [deque() for _ in range(cores)]
+        self.nonempty = set()
+        self.size = 0
+        self._next_core = 0
+
+    def push(self, process: Process, core: Optional[int]):
+        if core is None:
+            core = self._next_core
+            self._next_core = (core + 1) % len(self.queues)
+        self.queues[core].append(process)
+        self.nonempty.add(core)
+        self.size += 1
+
+    def pop(self, core: int) -> Optional[Process]:
+        if not self.size:
+            return None
+        queue = self.queues[core]
+        if queue:
+            process = queue.popleft()
+        else:
+            core = next(iter(self.nonempty))
+            queue = self.queues[core]
+            process = queue.pop()
+        if not queue:
+            self.nonempty.discard(core)
+        self.size -= 1
+        return process
+
+    def __len__(self):
+        return self.size
+
+
+BALANCERS = {
+    "global": GlobalQueueBalancer,
+    "work_stealing": WorkStealingBalancer,
+}
+
+# Pseudo core id for the timer that wakes parked cores at the next arrival
+_ARRIVAL = -1
+
+
+def multicore_round_robin_scheduling(processes: Iterable[Process], time_quantum: int, cpu: MultiCoreCPU,
+                                     balancer: str = "global",
+                                     on_complete: Optional[Callable[[Process], None]] = None,
+                                     tracer: Optional[Tracer] = None) -> List[Process]:
+    if balancer not in BALANCERS:
+        raise ValueError(f"Unknown load balancer: {balancer}")
+    if time_quantum <= 0:
+        raise ValueError("Time quantum must be positive")
+
+    feed = arrival_feed(processes)
+    completed_processes = feed.completion_list()
+    complete = on_complete or completed_processes.append
+
+    cores = cpu.cores
+    if tracer is not None:
+        tracer.start()
+        feed = tracer.traced_feed(feed)
+        cores = [tracer.traced_cpu(core, core_id) for core_id, core in enumerate(cores)]
+        complete = tracer.timed("complete", complete)
+    ready = BALANCERS[balancer](len(cores))
+    running = [None] * len(cores)
+    parked = deque()          # (core id, time it went idle)
+    timer_armed = False
+    sequence = len(cores)
+    events = [(0, core_id, core_id) for core_id in range(len(cores))]
+    now = 0
+
+    # A single heap of (time, sequence, core) events drives every core, so
+    # each dispatch costs O(log cores) regardless of how many are idle.
+    while events:
+        now, _, core_id = heapq.heappop(events)
+
+        if core_id == _ARRIVAL:
+            timer_armed = False
+        else:
+            # Preempted work goes back before new arrivals, as on one core
+            process = running[core_id]
+            if process is not None:
+                running[core_id] = None
+                if process.remaining_time > 0:
+                    ready.push(process, core_id)
+                else:
+                    complete(process)
+
+        if feed.next_time is not None and feed.next_time <= now:
+            for process in feed.admit(now):
+                ready.push(process, None)
+
+        # Wake as many parked cores as there is ready work for
+        for _ in range(min(len(parked), len(ready))):
+            parked_id, since = parked.popleft()
+            if now > since:
+                cores[parked_id].idle(now - since, since)
+            sequence += 1
+            heapq.heappush(events, (now, sequence, parked_id))
+
+        if core_id != _ARRIVAL:
+            process = ready.pop(core_id)
+            if process is None:
+                parked.append((core_id, now))
+            else:
+                execution_time = min(time_quantum, process.remaining_time)
+                elapsed = cores[core_id].execute(process, execution_time, now)
+                running[core_id] = process
+                sequence += 1
+                heapq.heappush(events, (now + elapsed, sequence, core_id))
+
+        if parked and feed.next_time is not None and not timer_armed:
+            timer_armed = True
+            sequence += 1
+            heapq.heappush(events, (feed.next_time, sequence, _ARRIVAL))
+
+    # Cores that ran out of work stay idle until the last one finishes
+    for core_id, since in parked:
+        if now > since:
+            cores[core_id].idle(now - since, since)
+
+    if tracer is not None:
+        tracer.stop()
+    return completed_processes
@@ -0,0 +1,257 @@
+# policies.py
+import heapq
+from collections import deque
+from itertools import count
+from typing import Callable, Dict, Iterable, List, Optional, Type
+from scheduler import CPU, Process, arrival_feed
+from tracing import Tracer
+
+
+class SchedulingPolicy:
+    """Ready-queue discipline plugged into policy_scheduling.
+
+    push/pop manage the ready queue, time_slice decides how long the popped
+    process may run (``next_arrival`` is None when nothing else will
+    arrive) and requeue puts back a process that still has work left.
+    """
+    name = ""
+
+    def push(self, process: Process, now: int):
+        raise NotImplementedError
+
+    def pop(self) -> Process:
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def time_slice(self, process: Process, now: int, next_arrival: Optional[int]) -> int:
+        return process.remaining_time
+
+    def requeue(self, process: Process, now: int, ran: int):
+        self.push(process, now)
+
+
+class RoundRobinPolicy(SchedulingPolicy):
+    name = "rr"
+
+    def __init__(self, time_quantum: int = 3):
+        if time_quantum <= 0:
+            raise ValueError("Time quantum must be positive")
+        self.time_quantum = time_quantum
+        self.queue = deque()
+
+    def push(self, process, now):
+        self.queue.append(process)
+
+    def pop(self):
+        return self.queue.popleft()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def time_slice(self, process, now, next_arrival):
+        return min(self.time_quantum, process.remaining_time)
+
+
+class _HeapPolicy(SchedulingPolicy):
+    # Binary heap of (key, admission order, process); ties run FIFO
+    preemptive = False
+
+    def __init__(self):
+        self.heap = []
+        self._order = count()
+
+    def key(self, process: Process):
+        raise NotImplementedError
+
+    def push(self, process, now):
+        heapq.heappush(self.heap, (self.key(process), next(self._order), process))
+
+    def pop(self):
+        return heapq.heappop(self.heap)[2]
+
+    def __len__(self):
+        return len(self.heap)
+
+    def time_slice(self, process, now, next_arrival):
+        # Preemptive policies re-decide at the next arrival
+        if self.preemptive and next_arrival is not None:
+            return min(process.remaining_time, next_arrival - now)
+        return process.remaining_time
+
+
+class SJFPolicy(_HeapPolicy):
+    name = "sjf"
+
+    def key(self, process):
+        return process.burst_time
+
+
+class SRTFPolicy(_HeapPolicy):
+    name = "srtf"
+    preemptive = True
+
+    def key(self, process):
+        return process.remaining_time
+
+
+class PriorityPolicy(_HeapPolicy):
+    name = "priority"
+
+    def __init__(self, preemptive: bool = False):
+        super().__init__()
+        self.preemptive = preemptive
+
+    def key(self, process):
+        return process.priority
+
+
+class EDFPolicy(_HeapPolicy):
+    """Earliest deadline first.
+
+    Processes without an explicit deadline get
+    ``arrival_time + deadline_factor * burst_time``.
+    """
+    name = "edf"
+    preemptive = True
+
+    def __init__(self, deadline_factor: float = 2.0):
+        super().__init__()
+        self.deadline_factor = deadline_factor
+
+    def key(self, process):
+        deadline = getattr(process, "deadline", None)
+        if deadline is None:
+            deadline = process.arrival_time + self.deadline_factor * process.burst_time
+        return deadline
+
+
+class MLFQPolicy(SchedulingPolicy):
+    """Multi-level feedback queue with a bitmap of non-empty levels.
+
+    Level ``i`` runs round robin with quantum ``time_quantum * 2**i``. A
+    process that uses its whole quantum drops one level; lower levels are
+    preempted by arrivals. With ``boost_interval`` set, every process is
+    moved back to the top level that often.
+    """
+    name = "mlfq"
+
+    def __init__(self, time_quantum: int = 3, levels: int = 3, boost_interval: Optional[int] = None):
+        if time_quantum <= 0:
+            raise ValueError("Time quantum must be positive")
+        if levels <= 0:
+            raise ValueError("MLFQ needs at least one level")
+        self.quanta = [time_quantum << level for level in range(levels)]
+        self.queues = [deque() for _ in range(levels)]
+        self.bitmap = 0
+        self.size = 0
+        self.boost_interval = boost_interval
+        self._next_boost = boost_interval
+        self._running_level = 0
+
+    def _enqueue(self, process, level):
+        self.queues[level].append(process)
+        self.bitmap |= 1 << level
+        self.size += 1
+
+    def push(self, process, now):
+        self._enqueue(process, 0)
+
+    def pop(self):
+        level = (self.bitmap & -self.bitmap).bit_length() - 1
+        queue = self.queues[level]
+        process = queue.popleft()
+        if not queue:
+            self.bitmap &= ~(1 << level)
+        self.size -= 1
+        self._running_level = level
+        return process
+
+    def __len__(self):
+        return self.size
+
+    def time_slice(self, process, now, next_arrival):
+        run = min(self.quanta[self._running_level], process.remaining_time)
+        if self._running_level and next_arrival is not None:
+            run = min(run, next_arrival - now)
+        return run
+
+    def requeue(self, process, now, ran):
+        level = self._running_level
+        if ran >= self.quanta[level]:
+            level = min(level + 1, len(self.queues) - 1)
+        self._enqueue(process, level)
+        if self._next_boost is not None and now >= self._next_boost:
+            self._boost()
+            self._next_boost = now + self.boost_interval
+
+    def _boost(self):
+        top = self.queues[0]
+        for queue in self.queues[1:]:
+            top.extend(queue)
+            queue.clear()
+        self.bitmap = 1 if top else 0
+
+
+POLICIES: Dict[str, Type[SchedulingPolicy]] = {
+    "rr": RoundRobinPolicy,
+    "sjf": SJFPolicy,
+    "srtf": SRTFPolicy,
+    "priority": PriorityPolicy,
+    "edf": EDFPolicy,
+    "mlfq": MLFQPolicy,
+}
+
+
+def register_policy(policy_class: Type[SchedulingPolicy]):
+    POLICIES[policy_class.name] = policy_class
+    return policy_class
+
+
+def make_policy(name: str, **options) -> SchedulingPolicy:
+    if name not in POLICIES:
+        raise ValueError(f"Unknown scheduling policy: {name}")
+    return POLICIES[name](**options)
+
+
+def policy_scheduling(processes: Iterable[Process], policy: SchedulingPolicy, cpu: CPU,
+                      on_complete: Optional[Callable[[Process], None]] = None,
+                      tracer: Optional[Tracer] = None) -> List[Process]:
+    feed = arrival_feed(processes)
+    completed_processes = feed.completion_list()
+    complete = on_complete or completed_processes.append
+    current_time = 0
+
+    push = policy.push
+    execute = cpu.execute
+
+    if tracer is not None:
+        # Traced runs go through timing proxies; untraced runs are untouched
+        tracer.start()
+        feed, cpu = tracer.traced_feed(feed), tracer.traced_cpu(cpu)
+        execute = cpu.execute
+        complete = tracer.timed("complete", complete)
+
+    while feed.next_time is not None or len(policy):
+        if feed.next_time is not None and feed.next_time <= current_time:
+            for process in feed.admit(current_time):
+                push(process, current_time)
+
+        if len(policy):
+            current_process = policy.pop()
+            execution_time = policy.time_slice(current_process, current_time, feed.next_time)
+            current_time += execute(current_process, execution_time, current_time)
+
+            if current_process.remaining_time > 0:
+                policy.requeue(current_process, current_time, execution_time)
+            else:
+                complete(current_process)
+        else:
+            gap = feed.next_time - current_time
+            cpu.idle(gap, current_time)
+            current_time += gap
+
+    if tracer is not None:
+        tracer.stop()
+    return completed_processes
@@ -0,0 +1,385 @@
+# process_table.py
+from array import array
+from operator import attrgetter
+from typing import Iterable, Iterator, List, Sequence, Tuple
+import numpy as np
+
+COLUMNS = ("pid", "arrival_time", "burst_time", "priority", "remaining_time", "start_time", "finish_time", "energy")
+# Columns a scheduler changes; RunningRow keeps them as Python values
+RUN_COLUMNS = ("priority", "remaining_time", "start_time", "finish_time", "energy")
+
+_INT32 = np.iinfo(np.int32)
+
+
+def _int_column(values) -> np.ndarray:
+    # int32 when every value fits, else int64
+    column = np.array(values, dtype=np.int64)
+    if len(column) and (column.min() < _INT32.min or column.max() > _INT32.max):
+        return column
+    return column.astype(np.int32)
+
+
+def _column_property(name):
+    def fget(self):
+        return getattr(self._table, name)[self._index].item()
+
+    def fset(self, value):
+        getattr(self._table, name)[self._index] = value
+
+    return property(fget, fset)
+
+
+class ProcessRow:
+    """Lightweight view of one row of a ProcessTable, readable like a Process."""
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "ProcessTable", index: int):
+        self._table = table
+        self._index = index
+
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @property
+    def execution_history(self) -> "ExecutionHistory":
+        return ExecutionHistory(self._table, self._index)
+
+    def __eq__(self, other):
+        return isinstance(other, ProcessRow) and other._table is self._table and other._index == self._index
+
+    def __hash__(self):
+        return hash((id(self._table), self._index))
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)}" for name in COLUMNS)
+        return f"ProcessRow({fields})"
+
+
+for _name in COLUMNS:
+    setattr(ProcessRow, _name, _column_property(_name))
+
+
+class RunningRow(ProcessRow):
+    """Row handed to a scheduler: the columns it changes are plain slots.
+
+    Reading and writing them costs what a Process attribute does instead of
+    a NumPy scalar access per slice. The row is registered with its table
+    until finish_time is set; then its values are queued for the table to
+    write to its columns in bulk (ProcessTable.flush), and changes made
+    after that are not written back.
+    """
+    __slots__ = ("priority", "remaining_time", "start_time", "_finish_time", "energy", "_history")
+
+    def __init__(self, table: "ProcessTable", index: int, priority: int, remaining_time: int, start_time: int,
+                 finish_time: int, energy: float):
+        self._table = table
+        self._index = index
+        self.priority = priority
+        self.remaining_time = remaining_time
+        self.start_time = start_time
+        self._finish_time = finish_time
+        self.energy = energy
+        self._history = None
+        table._running[index] = self
+
+    @property
+    def execution_history(self) -> "ExecutionHistory":
+        # Made on the first recorded slice, none at all at history="none"
+        history = self._history
+        if history is None:
+            history = self._history = ExecutionHistory(self._table, self._index)
+        return history
+
+    @property
+    def finish_time(self) -> int:
+        return self._finish_time
+
+    @finish_time.setter
+    def finish_time(self, value: int):
+        self._finish_time = value
+        if value != -1:
+            table = self._table
+            table._running.pop(self._index, None)
+            table._retired.append(_row_state(self))
+
+
+_row_state = attrgetter("_index", *RUN_COLUMNS)
+_ROW_STATE = np.dtype([("index", np.int64)] +
+                      [(name, np.float64 if name == "energy" else np.int64) for name in RUN_COLUMNS])
+
+
+class RowBatch:
+    """Current column values of a run of table rows; slicing it makes RunningRows."""
+    __slots__ = ("_table", "_states")
+
+    def __init__(self, table: "ProcessTable", indices: Sequence[int]):
+        table.flush()
+        self._table = table
+        rows = np.asarray(indices, dtype=np.int64)
+        columns = [getattr(table, f"_{name}")[rows].tolist() for name in RUN_COLUMNS]
+        self._states = list(zip(rows.tolist(), *columns))
+
+    def __len__(self):
+        return len(self._states)
+
+    def __getitem__(self, item: slice) -> List[RunningRow]:
+        table = self._table
+        return [RunningRow(table, *state) for state in self._states[item]]
+
+
+class ExecutionHistory:
+    """List-like view of the (start, end) slices recorded for one table row."""
+    __slots__ = ("_table", "_index")
+
+    def __init__(self, table: "ProcessTable", index: int):
+        self._table = table
+        self._index = index
+
+    def append(self, interval: Tuple[int, int]):
+        start, end = interval
+        table = self._table
+        table._slice_row.append(self._index)
+        table._slice_start.append(start)
+        table._slice_length.append(end - start)
+
+    def extend_last(self, start: int, end: int) -> bool:
+        return self._table.extend_last_slice(self._index, start, end)
+
+    def add(self, start: int, end: int, merge: bool = False):
+        # Summary level: SliceSummary.add on the table's summary columns
+        self._table.summarize_slice(self._index, start, end, merge)
+
+    def _bounds(self):
+        order, offsets = self._table.slice_index()
+        return order, offsets[self._index], offsets[self._index + 1]
+
+    def __len__(self):
+        if self._table._summary is not None:
+            return int(self._table._summary[2][self._index])
+        _, lo, hi = self._bounds()
+        return int(hi - lo)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        order, lo, hi = self._bounds()
+        starts = self._table._slice_start
+        lengths = self._table._slice_length
+        for k in order[lo:hi].tolist():
+            yield starts[k], starts[k] + lengths[k]
+
+    def __getitem__(self, item):
+        return list(self)[item]
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class ProcessTable:
+    """Column-oriented process storage backed by NumPy arrays.
+
+    Execution slices of all rows are kept in one shared, append-only log
+    instead of a list per process; runs at summary level only keep each
+    row's first start, last finish and slice count.
+    """
+
+    def __init__(self, pid, arrival_time, burst_time, priority):
+        # Unfinished RunningRows by index, and values of finished ones not
+        # yet written back; see RunningRow and flush
+        self._running = {}
+        self._retired = []
+        self.pid = _int_column(pid)
+        self.arrival_time = _int_column(arrival_time)
+        self.burst_time = _int_column(burst_time)
+        self.priority = np.array(priority, dtype=np.int32)
+        if not (len(self.pid) == len(self.arrival_time) == len(self.burst_time) == len(self.priority)):
+            raise ValueError("All process columns must have the same length")
+
+        self.remaining_time = self.burst_time.copy()
+        self.start_time = np.full(len(self.pid), -1, dtype=np.int64)
+        self.finish_time = np.full(len(self.pid), -1, dtype=np.int64)
+        self.energy = np.zeros(len(self.pid), dtype=np.float64)
+
+        # Slice log: row index, start time and slice length (end - start)
+        self._slice_row = array("i")
+        self._slice_start = array("q")
+        self._slice_length = array("i")
+        self._slice_index = None
+        # Summary columns (first start, last finish, slice count), made on
+        # the first summarized slice
+        self._summary = None
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[int, int, int, int]]) -> "ProcessTable":
+        columns = list(zip(*records)) or [(), (), (), ()]
+        return cls(*columns)
+
+    @classmethod
+    def from_processes(cls, processes: Sequence) -> "ProcessTable":
+        return cls.from_records((p.pid, p.arrival_time, p.burst_time, p.priority) for p in processes)
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __getitem__(self, index: int) -> ProcessRow:
+        if index < 0:
+            index += len(self.pid)
+        if not 0 <= index < len(self.pid):
+            raise IndexError("process index out of range")
+        return self._running.get(index) or ProcessRow(self, index)
+
+    def __iter__(self) -> Iterator[ProcessRow]:
+        running = self._running
+        for index in range(len(self.pid)):
+            yield running.get(index) or ProcessRow(self, index)
+
+    def running_rows(self, indices: Sequence[int]) -> RowBatch:
+        # RunningRows for a scheduler, loaded in one pass over the columns;
+        # rows made from a batch replace any still running for their index
+        return RowBatch(self, indices)
+
+    def flush(self):
+        # Write finished and running rows' values back to the columns
+        states = self._retired
+        self._retired = []
+        states.extend(map(_row_state, self._running.values()))
+        if not states:
+            return
+        states = np.array(states, dtype=_ROW_STATE)
+        for name in RUN_COLUMNS:
+            getattr(self, f"_{name}")[states["index"]] = states[name]
+
+    def arrival_order(self):
+        return np.argsort(self.arrival_time, kind="stable").tolist()
+
+    def completion_list(self) -> "ProcessTableView":
+        return ProcessTableView(self)
+
+    def record_slice(self, index: int, start: int, end: int):
+        self._slice_row.append(index)
+        self._slice_start.append(start)
+        self._slice_length.append(end - start)
+
+    def extend_slices(self, rows, starts, ends):
+        # Bulk append to the slice log, e.g. when restoring a saved run
+        starts = np.asarray(starts, dtype=np.int64)
+        self._slice_row.frombytes(np.asarray(rows, dtype=np.int32).tobytes())
+        self._slice_start.frombytes(starts.tobytes())
+        self._slice_length.frombytes((np.asarray(ends, dtype=np.int64) - starts).astype(np.int32).tobytes())
+
+    def extend_last_slice(self, index: int, start: int, end: int) -> bool:
+        # Grow the most recent log entry if it is this row's and ends at start
+        if not self._slice_row or self._slice_row[-1] != index:
+            return False
+        if self._slice_start[-1] + self._slice_length[-1] != start:
+            return False
+        self._slice_length[-1] = end - self._slice_start[-1]
+        return True
+
+    def _summary_columns(self):
+        if self._summary is None:
+            size = len(self.pid)
+            self._summary = (np.full(size, -1, dtype=np.int64), np.full(size, -1, dtype=np.int64),
+                             np.zeros(size, dtype=np.int64))
+        return self._summary
+
+    def summarize_slice(self, index: int, start: int, end: int, merge: bool = False):
+        first_start, last_finish, count = self._summary_columns()
+        if not count[index]:
+            first_start[index] = start
+        elif merge and last_finish[index] == start:
+            last_finish[index] = end
+            return
+        last_finish[index] = end
+        count[index] += 1
+
+    def slice_summary(self):
+        # Copies of the summary columns, or None if the table kept slices
+        if self._summary is None:
+            return None
+        return tuple(column.copy() for column in self._summary)
+
+    def set_slice_summary(self, rows, first_start, last_finish, count):
+        for column, values in zip(self._summary_columns(), (first_start, last_finish, count)):
+            column[rows] = values
+
+    def indices_of(self, rows: Iterable[ProcessRow]) -> np.ndarray:
+        return np.fromiter(map(attrgetter("_index"), rows), dtype=np.int64)
+
+    def slice_log_mark(self) -> Tuple[int, int]:
+        # Log length and last slice length; extend_last_slice only ever
+        # changes the latter, so the two pin down the log's current prefix
+        count = len(self._slice_row)
+        return count, self._slice_length[-1] if count else 0
+
+    def slices(self):
+        rows = np.array(self._slice_row, dtype=np.int64)
+        starts = np.array(self._slice_start, dtype=np.int64)
+        return rows, starts, starts + np.array(self._slice_length, dtype=np.int64)
+
+    def slice_index(self):
+        # CSR-style index over the slice log, rebuilt only after it grows
+        count = len(self._slice_row)
+        if self._slice_index is None or self._slice_index[0] != count:
+            rows = np.array(self._slice_row, dtype=np.int64)
+            order = np.argsort(rows, kind="stable")
+            offsets = np.zeros(len(self.pid) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=len(self.pid)), out=offsets[1:])
+            self._slice_index = (count, order, offsets)
+        return self._slice_index[1], self._slice_index[2]
+
+    def nbytes(self) -> int:
+        # Column and slice log storage; running rows are written back first
+        columns = sum(getattr(self, name).nbytes for name in COLUMNS)
+        log = sum(a.itemsize * len(a) for a in (self._slice_row, self._slice_start, self._slice_length))
+        if self._summary is not None:
+            log += sum(column.nbytes for column in self._summary)
+        return columns + log
+
+
+def _run_column(name):
+    # While rows run, the column is only current after a flush
+    attribute = f"_{name}"
+
+    def fget(self):
+        if self._running or self._retired:
+            self.flush()
+        return getattr(self, attribute)
+
+    def fset(self, value):
+        if self._running or self._retired:
+            self.flush()
+        setattr(self, attribute, value)
+
+    return property(fget, fset)
+
+
+for _name in RUN_COLUMNS:
+    setattr(ProcessTable, _name, _run_column(_name))
+
+
+class ProcessTableView:
+    """Ordered, appendable selection of rows from a ProcessTable."""
+
+    def __init__(self, table: ProcessTable, indices: Iterable[int] = ()):
+        self.table = table
+        self.indices = array("i", indices)
+
+    def append(self, row: ProcessRow):
+        self.indices.append(row._index)
+
+    def column(self, name: str) -> np.ndarray:
+        return getattr(self.table, name)[np.array(self.indices, dtype=np.int64)]
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, position: int) -> ProcessRow:
+        return self.table[self.indices[position]]
+
+    def __iter__(self) -> Iterator[ProcessRow]:
+        table = self.table
+        for index in self.indices:
+            yield table._running.get(index) or ProcessRow(table, index)
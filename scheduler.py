@@ -1,9 +1,16 @@
 # scheduler.py
+import copy
+from bisect import bisect_right
+from collections import deque
 from dataclasses import dataclass
-from typing import List, Tuple
-import logging
+from operator import attrgetter
+from typing import Callable, Iterable, List, Optional, Tuple, Union
+from history import HistoryRecorder, get_recorder, restore_series, series_mark
+from governors import Governor, make_governor, scaled_time
+from tracing import Tracer
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+# ProcessTable column values are loaded this many arrivals at a time
+ROW_BATCH = 4096
 
 @dataclass
 class Process:
@@ -15,68 +22,266 @@ class Process:
     start_time: int = -1
     finish_time: int = -1
     execution_history: List[Tuple[int, int]] = None
+    deadline: int = None
+    energy: float = 0.0
 
     def __post_init__(self):
         self.remaining_time = self.burst_time
         self.execution_history = []
 
 class CPU:
-    def __init__(self, base_power: float = 100.0, max_frequency: float = 3.0, min_frequency: float = 1.0):
+    def __init__(self, base_power: float = 100.0, max_frequency: float = 3.0, min_frequency: float = 1.0,
+                 history: Union[str, HistoryRecorder] = "full", governor: Union[str, Governor] = "priority",
+                 switch_latency: int = 0, switch_energy: float = 0.0, speed_scaling: bool = False):
+        if switch_latency < 0 or switch_energy < 0:
+            raise ValueError("Frequency switch costs must not be negative")
         self.base_power = base_power
         self.max_frequency = max_frequency
         self.min_frequency = min_frequency
         self.current_frequency = max_frequency
         self.power_consumption = 0.0
         self.idle_time = 0
-        self.power_history = []
-        self.frequency_history = []
+        self.history = get_recorder(history)
+        self.power_history = self.history.new_series()
+        self.frequency_history = self.history.new_series()
+        self._record_slice = self.history.slice_recorder()
 
-    def execute(self, process: Process, time_units: int, current_time: int):
+        # Frequency selection; a switch stalls the CPU for switch_latency
+        # and costs switch_energy. With speed_scaling, work runs at
+        # frequency / max_frequency speed instead of taking the same time
+        # at every frequency.
+        self._set_governor(make_governor(governor))
+        self.switch_latency = switch_latency
+        self.switch_energy = switch_energy
+        self.speed_scaling = speed_scaling
+        self.switches = 0
+
+    def _set_governor(self, governor: Governor):
+        self.governor = governor
+        self._select_frequency = governor.select
+        self._account = governor.account if governor.tracks_utilization else None
+
+    def snapshot(self) -> dict:
+        # Accumulators, governor state and history lengths at this point
+        return {
+            "current_frequency": self.current_frequency,
+            "power_consumption": self.power_consumption,
+            "idle_time": self.idle_time,
+            "switches": self.switches,
+            "governor": copy.deepcopy(self.governor),
+            "power_history": series_mark(self.power_history),
+            "frequency_history": series_mark(self.frequency_history),
+        }
+
+    def restore(self, snapshot: dict, source: Optional["CPU"] = None):
+        # Roll back to a snapshot. Histories are cut back in place, or copied
+        # up to the snapshot from ``source``, the CPU that took it.
+        source = source or self
+        self.current_frequency = snapshot["current_frequency"]
+        self.power_consumption = snapshot["power_consumption"]
+        self.idle_time = snapshot["idle_time"]
+        self.switches = snapshot["switches"]
+        self._set_governor(copy.deepcopy(snapshot["governor"]))
+        restore_series(self.power_history, source.power_history, snapshot["power_history"])
+        restore_series(self.frequency_history, source.frequency_history, snapshot["frequency_history"])
+
+    def execute(self, process: Process, time_units: int, current_time: int) -> int:
+        # Runs time_units of the process's work; returns the elapsed time
         if process.start_time == -1:
             process.start_time = current_time
 
-        self.current_frequency = self.max_frequency if process.priority == 1 else self.min_frequency
-        self.frequency_history.append((current_time, self.current_frequency))
+        frequency = self._select_frequency(self, process, current_time)
+        energy = 0.0
+        start = current_time
+        if frequency != self.current_frequency:
+            self.switches += 1
+            start += self.switch_latency
+            energy = self.switch_energy
+        self.current_frequency = frequency
+        self.frequency_history.append((current_time, frequency))
 
-        power = self.base_power * (self.current_frequency / self.max_frequency)
-        self.power_consumption += power * time_units
+        run_time = scaled_time(time_units, frequency, self.max_frequency) if self.speed_scaling else time_units
+        power = self.base_power * (frequency / self.max_frequency)
+        energy += power * run_time
+        self.power_consumption += energy
+        process.energy += energy
         self.power_history.append((current_time, power))
 
+        end = start + run_time
         process.remaining_time -= time_units
-        process.execution_history.append((current_time, current_time + time_units))
+        self._record_slice(process, start, end)
+        if self._account is not None:
+            self._account(current_time, end)
 
         if process.remaining_time <= 0:
-            process.finish_time = current_time + time_units + process.remaining_time
+            process.finish_time = end + process.remaining_time
+        return end - current_time
 
     def idle(self, time_units: int, current_time: int):
         self.idle_time += time_units
         self.power_history.append((current_time, self.base_power * 0.1))
         self.frequency_history.append((current_time, self.min_frequency))
 
-def round_robin_scheduling(processes: List[Process], time_quantum: int, cpu: CPU) -> List[Process]:
-    queue = []
+class SortedArrivals:
+    # Arrivals are fed through a cursor over the arrival-sorted order; each
+    # batch is admitted in list order, matching a rescan of the whole list.
+    def __init__(self, processes):
+        self.processes = processes
+        if hasattr(processes, "arrival_order"):
+            # ProcessTable: sort the arrival column directly, and hand out
+            # RunningRows from values loaded ROW_BATCH arrivals at a time
+            self.order = processes.arrival_order()
+            self.arrivals = processes.arrival_time[self.order].tolist()
+            self.loader = processes.running_rows
+        else:
+            self.order = sorted(range(len(processes)), key=lambda i: processes[i].arrival_time)
+            self.arrivals = [processes[i].arrival_time for i in self.order]
+            self.loader = None
+        self.cursor = 0
+        self.next_time = self.arrivals[0] if self.arrivals else None
+        self._loaded = []
+        self._loaded_from = self._loaded_to = 0
+
+    def admit(self, now: int) -> list:
+        cursor = self.cursor
+        end = bisect_right(self.arrivals, now, cursor)
+        self.cursor = end
+        self.next_time = self.arrivals[end] if end < len(self.arrivals) else None
+        if self.loader is None:
+            batch = self.order[cursor:end]
+            if len(batch) > 1:
+                batch.sort()
+            processes = self.processes
+            return [processes[i] for i in batch]
+
+        if end > self._loaded_to:
+            self._loaded_to = max(end, cursor + ROW_BATCH)
+            self._loaded = self.loader(self.order[cursor:self._loaded_to])
+            self._loaded_from = cursor
+        batch = self._loaded[cursor - self._loaded_from:end - self._loaded_from]
+        if len(batch) > 1:
+            batch.sort(key=attrgetter("_index"))
+        return batch
+
+    def rows(self, indices: List[int]) -> list:
+        if self.loader is not None:
+            return self.loader(indices)[:]
+        return [self.processes[i] for i in indices]
+
+    def skip_to(self, now: int):
+        # Treat every arrival up to now as already admitted (resumed runs)
+        self.cursor = bisect_right(self.arrivals, now)
+        self.next_time = self.arrivals[self.cursor] if self.cursor < len(self.arrivals) else None
+        self._loaded, self._loaded_from, self._loaded_to = [], self.cursor, self.cursor
+
+    def completion_list(self):
+        # ProcessTable completions are kept as row indices, not objects
+        if hasattr(self.processes, "completion_list"):
+            return self.processes.completion_list()
+        return []
+
+
+class UnsortedStreamError(ValueError):
+    """A streamed workload was not in arrival-time order."""
+
+
+class StreamedArrivals:
+    # Pulls processes lazily from an iterator that is already in
+    # arrival-time order, so only live processes are held in memory.
+    def __init__(self, processes: Iterable[Process]):
+        self.iterator = iter(processes)
+        self.next_time = None
+        self._pending = None
+        self._advance()
+
+    def _advance(self):
+        process = next(self.iterator, None)
+        if process is not None and self.next_time is not None and process.arrival_time < self.next_time:
+            raise UnsortedStreamError(f"Process {process.pid} arrives before an earlier process in the stream")
+        self._pending = process
+        self.next_time = None if process is None else process.arrival_time
+
+    def admit(self, now: int) -> list:
+        batch = []
+        while self._pending is not None and self.next_time <= now:
+            batch.append(self._pending)
+            self._advance()
+        return batch
+
+    def completion_list(self):
+        return []
+
+
+def arrival_feed(processes):
+    if hasattr(processes, "__len__") and hasattr(processes, "__getitem__"):
+        return SortedArrivals(processes)
+    return StreamedArrivals(processes)
+
+
+def round_robin_scheduling(processes: Iterable[Process], time_quantum: int, cpu: CPU,
+                           on_complete: Optional[Callable[[Process], None]] = None,
+                           tracer: Optional[Tracer] = None, checkpoints=None,
+                           resume: Optional[Tuple[int, List[int]]] = None,
+                           on_slice: Optional[Callable[[Process, int], None]] = None) -> List[Process]:
+    # processes may be a list, a ProcessTable or an arrival-ordered iterator.
+    # With on_complete, finished processes are handed over instead of kept;
+    # on_slice(process, time_units) is called after every slice and may
+    # raise to stop the run.
+    # checkpoints (a checkpoint.CheckpointLog) is handed the state after
+    # admissions now and then; resume=(time, queued indices) continues from
+    # such a state, see checkpoint.IncrementalSimulator.
+    feed = arrival_feed(processes)
+    completed_processes = feed.completion_list()
+
+    queue = deque()
     current_time = 0
-    completed_processes = []
-    remaining_processes = processes.copy()
+    if resume is not None:
+        current_time, queued = resume
+        feed.skip_to(current_time)
+        queue.extend(feed.rows(queued))
+    checkpoint_due = None if checkpoints is None else checkpoints.next_due
+
+    enqueue = queue.append
+    dequeue = queue.popleft
+    execute = cpu.execute
+    complete = on_complete or completed_processes.append
+
+    if tracer is not None:
+        # Traced runs go through timing proxies; untraced runs are untouched
+        tracer.start()
+        feed, cpu = tracer.traced_feed(feed), tracer.traced_cpu(cpu)
+        execute = cpu.execute
+        complete = tracer.timed("complete", complete)
+
+    if on_slice is not None:
+        run_slice = execute
+
+        def execute(process, time_units, now):
+            elapsed = run_slice(process, time_units, now)
+            on_slice(process, time_units)
+            return elapsed
 
-    while remaining_processes or queue:
-        new_processes = [p for p in remaining_processes if p.arrival_time <= current_time]
-        for p in new_processes:
-            queue.append(p)
-            remaining_processes.remove(p)
+    while feed.next_time is not None or queue:
+        if feed.next_time is not None and feed.next_time <= current_time:
+            queue.extend(feed.admit(current_time))
+            if checkpoint_due is not None and current_time >= checkpoint_due:
+                checkpoint_due = checkpoints.take(current_time, queue, cpu)
 
         if queue:
-            current_process = queue.pop(0)
+            current_process = dequeue()
             execution_time = min(time_quantum, current_process.remaining_time)
-            cpu.execute(current_process, execution_time, current_time)
-            current_time += execution_time
+            current_time += execute(current_process, execution_time, current_time)
 
             if current_process.remaining_time > 0:
-                queue.append(current_process)
+                enqueue(current_process)
             else:
-                completed_processes.append(current_process)
+                complete(current_process)
         else:
-            cpu.idle(1, current_time)
-            current_time += 1
+            # Skip the whole idle gap up to the next arrival in one step
+            gap = feed.next_time - current_time
+            cpu.idle(gap, current_time)
+            current_time += gap
 
+    if tracer is not None:
+        tracer.stop()
     return completed_processes
\ No newline at end of file
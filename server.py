@@ -0,0 +1,363 @@
+# server.py
+import argparse
+import asyncio
+import json
+import logging
+import math
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from types import SimpleNamespace
+from typing import Dict, Optional, Tuple
+from metrics import QuantileSketch
+
+# Upper bounds (ms) of the latency histogram buckets; the last one is open
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000)
+
+CPU_PARAMS = ("base_power", "max_frequency", "min_frequency", "governor", "switch_latency", "switch_energy",
+              "speed_scaling")
+MAX_BODY_BYTES = 64 * 2**20
+
+
+class HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+class LatencyHistogram:
+    """Request latencies in fixed buckets plus sketched percentiles."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.sketch = QuantileSketch()
+        self.total = 0.0
+
+    def add(self, seconds: float):
+        ms = seconds * 1000
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS_MS) and ms > LATENCY_BUCKETS_MS[bucket]:
+            bucket += 1
+        self.counts[bucket] += 1
+        self.sketch.add(ms)
+        self.total += ms
+
+    def report(self) -> Dict:
+        count = self.sketch.count
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "count": count,
+            "mean_ms": self.total / count if count else None,
+            "p50_ms": self.sketch.quantile(0.5) if count else None,
+            "p95_ms": self.sketch.quantile(0.95) if count else None,
+            "p99_ms": self.sketch.quantile(0.99) if count else None,
+            "buckets_ms": dict(zip(labels, self.counts)),
+        }
+
+
+def parse_request(body: Dict) -> Tuple[list, int, Dict, bool]:
+    # Validated (records, time_quantum, cpu_params, details) from a /simulate body
+    if not isinstance(body, dict):
+        raise ValueError("Request body must be a JSON object")
+    processes = body.get("processes")
+    if not isinstance(processes, list) or not processes:
+        raise ValueError("'processes' must be a non-empty list")
+    records = []
+    for proc in processes:
+        if isinstance(proc, dict):
+            record = (proc["pid"], proc["arrival"], proc["burst"], proc.get("priority", 1))
+        else:
+            record = tuple(proc)
+        if len(record) != 4 or not all(isinstance(v, int) and not isinstance(v, bool) for v in record):
+            raise ValueError(f"Invalid process {proc!r}: expected integer pid, arrival, burst and priority")
+        if record[1] < 0 or record[2] < 0:
+            raise ValueError(f"Process {record[0]} has a negative arrival or burst time")
+        records.append(record)
+
+    time_quantum = body.get("time_quantum", 3)
+    if not isinstance(time_quantum, int) or time_quantum <= 0:
+        raise ValueError("Time quantum must be a positive integer")
+    cpu_params = body.get("cpu", {})
+    if not isinstance(cpu_params, dict) or set(cpu_params) - set(CPU_PARAMS):
+        raise ValueError(f"'cpu' may only set {', '.join(CPU_PARAMS)}")
+    return records, time_quantum, cpu_params, bool(body.get("details", False))
+
+
+def prepare_simulation(body: bytes):
+    # Parses and validates a /simulate body and computes its coalescing key;
+    # run off the event loop, since both walk the whole workload
+    from cache import simulation_key
+    from process_table import ProcessTable
+    from scheduler import CPU
+
+    records, time_quantum, cpu_params, details = parse_request(json.loads(body or b"{}"))
+    key = simulation_key(ProcessTable.from_records(records), CPU(history="none", **cpu_params), "rr",
+                         time_quantum=time_quantum, details=details)
+    return key, records, time_quantum, cpu_params, details
+
+
+def _warm_up():
+    # Worker initializer: load the simulation modules before the first request
+    import process_table, simulation  # noqa: F401
+
+
+def _ready() -> bool:
+    return True
+
+
+def run_simulation(records, time_quantum: int, cpu_params: Dict, details: bool) -> Dict:
+    """Worker-side run: simulate_round_robin plus calculate_metrics."""
+    from process_table import ProcessTable
+    from scheduler import CPU
+    from simulation import calculate_metrics, simulate_round_robin
+
+    processes = ProcessTable.from_records(records)
+    cpu = CPU(history="none", **cpu_params)
+    completed, cpu = simulate_round_robin(processes, time_quantum, cpu)
+    result = {"metrics": calculate_metrics(completed, cpu), "switches": cpu.switches}
+    if details:
+        result["processes"] = [
+            {"pid": pid, "start": start, "finish": finish, "energy": energy}
+            for pid, start, finish, energy in zip(*(completed.column(name).tolist() for name in
+                                                    ("pid", "start_time", "finish_time", "energy")))
+        ]
+    return result
+
+
+def metrics_request(body: Dict) -> Dict:
+    # calculate_metrics over already finished processes; cheap, so inline
+    from scheduler import Process
+    from simulation import calculate_metrics
+
+    if not isinstance(body, dict) or not isinstance(body.get("processes"), list) or not body["processes"]:
+        raise ValueError("'processes' must be a non-empty list")
+    completed = []
+    for proc in body["processes"]:
+        process = Process(proc["pid"], proc["arrival"], proc["burst"], proc.get("priority", 1))
+        process.finish_time = proc["finish"]
+        completed.append(process)
+    cpu = body.get("cpu", {})
+    if not isinstance(cpu, dict):
+        raise ValueError("'cpu' must be an object")
+    totals = SimpleNamespace(power_consumption=cpu.get("power_consumption", 0.0), idle_time=cpu.get("idle_time", 0))
+    for name, value in vars(totals).items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value) or value < 0:
+            raise ValueError(f"'cpu.{name}' must be a non-negative number")
+    return calculate_metrics(completed, totals)
+
+
+class SimulationServer:
+    """JSON over HTTP/1.1 front end to a bounded process pool.
+
+    POST /simulate runs simulate_round_robin in a worker process and POST
+    /metrics applies calculate_metrics to finished processes; GET /stats
+    reports queue depth, counters and latency histograms. At most
+    ``max_pending`` distinct runs may be queued or running; beyond that
+    requests get 503 with Retry-After. A request waiting longer than
+    ``timeout`` seconds gets 504 (its run keeps going for other waiters).
+    Identical concurrent /simulate requests share one run.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: int = 64, timeout: float = 30.0):
+        if max_pending <= 0 or timeout <= 0:
+            raise ValueError("max_pending and timeout must be positive")
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.pool = None
+        self.server = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.counters = {"requests": 0, "runs": 0, "coalesced": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+        self.latency = {"simulate": LatencyHistogram(), "metrics": LatencyHistogram()}
+        self.run_latency = LatencyHistogram()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765):
+        # Workers are started before the listening socket exists, and not
+        # by forking this process: a forked worker would inherit the client
+        # sockets open at that moment and keep those connections from
+        # ever reaching EOF
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context, initializer=_warm_up)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _ready) for _ in range(self.workers)))
+        self.server = await asyncio.start_server(self._handle_connection, host, port)
+        return self.server
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": len(self._inflight),
+            "max_pending": self.max_pending,
+            **self.counters,
+            "latency": {name: histogram.report() for name, histogram in self.latency.items()},
+            "run_latency": self.run_latency.report(),
+        }
+
+    async def simulate(self, body: bytes) -> Dict:
+        loop = asyncio.get_running_loop()
+        key, records, time_quantum, cpu_params, details = await loop.run_in_executor(None, prepare_simulation, body)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.counters["coalesced"] += 1
+        else:
+            if len(self._inflight) >= self.max_pending:
+                self.counters["rejected"] += 1
+                raise HTTPError(HTTPStatus.SERVICE_UNAVAILABLE, "Simulation queue is full", {"Retry-After": "1"})
+            future = self._submit(key, records, time_quantum, cpu_params, details)
+        try:
+            # shield: a timed-out waiter must not cancel a run others share
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.counters["timeouts"] += 1
+            raise HTTPError(HTTPStatus.GATEWAY_TIMEOUT, f"Simulation did not finish within {self.timeout:g}s")
+
+    def _submit(self, key, records, time_quantum, cpu_params, details) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        future = loop.run_in_executor(self.pool, run_simulation, records, time_quantum, cpu_params, details)
+        self._inflight[key] = future
+        self.counters["runs"] += 1
+
+        def finished(done):
+            self._inflight.pop(key, None)
+            self.run_latency.add(time.perf_counter() - started)
+            if not done.cancelled():
+                done.exception()  # mark retrieved even if every waiter timed out
+
+        future.add_done_callback(finished)
+        return future
+
+    async def _dispatch(self, method: str, path: str, body: bytes) -> Tuple[HTTPStatus, Dict]:
+        if path == "/stats" and method == "GET":
+            return HTTPStatus.OK, self.stats()
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok"}
+        if path in ("/simulate", "/metrics"):
+            if method != "POST":
+                raise HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, f"{path} only accepts POST", {"Allow": "POST"})
+            try:
+                if path == "/simulate":
+                    return HTTPStatus.OK, await self.simulate(body)
+                return HTTPStatus.OK, metrics_request(json.loads(body or b"{}"))
+            except (ValueError, KeyError, TypeError) as e:
+                raise HTTPError(HTTPStatus.BAD_REQUEST, str(e))
+        raise HTTPError(HTTPStatus.NOT_FOUND, f"No such endpoint: {path}")
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                started = time.perf_counter()
+                self.counters["requests"] += 1
+                extra = {}
+                try:
+                    status, payload = await self._dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                except Exception as e:
+                    logging.exception(f"Error handling {method} {path}")
+                    status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+                if status >= 500 and status not in (HTTPStatus.SERVICE_UNAVAILABLE, HTTPStatus.GATEWAY_TIMEOUT):
+                    self.counters["errors"] += 1
+                endpoint = path.strip("/")
+                if endpoint in self.latency:
+                    self.latency[endpoint].add(time.perf_counter() - started)
+
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(_response(status, payload, extra, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except HTTPError as e:
+            writer.write(_response(e.status, {"error": str(e)}, e.headers, False))
+        finally:
+            writer.close()
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, path, _ = line.decode("latin-1").split(" ", 2)
+    except ValueError:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    try:
+        length = int(headers.get("content-length", 0) or 0)
+    except ValueError:
+        length = -1
+    if length < 0:
+        raise HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path.split("?", 1)[0], headers, body
+
+
+def _response(status: HTTPStatus, payload: Dict, headers: Dict[str, str], keep_alive: bool) -> bytes:
+    body = json.dumps(payload).encode()
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", "Content-Type: application/json",
+             f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+async def serve(host: str, port: int, workers: Optional[int], max_pending: int, timeout: float):
+    server = SimulationServer(workers, max_pending, timeout)
+    await server.start(host, port)
+    logging.info(f"Serving on http://{host}:{server.port} with {server.workers} workers")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m server", description="Scheduling simulations over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=None, help="simulation processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=64, help="queued or running runs before 503")
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before a request gets 504")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log requests to stderr")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_pending, args.timeout))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
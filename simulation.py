@@ -1,10 +1,21 @@
 # simulation.py
 from scheduler import Process, CPU, round_robin_scheduling
+from policies import make_policy, policy_scheduling
+from metrics import OnlineMetrics
 import logging
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
-
 def calculate_metrics(completed_processes, cpu):
+    if hasattr(completed_processes, "column"):
+        # ProcessTable results: reduce whole columns at once
+        turnaround = completed_processes.column("finish_time") - completed_processes.column("arrival_time")
+        waiting = turnaround - completed_processes.column("burst_time")
+        return {
+            "avg_turnaround": float(turnaround.mean()),
+            "avg_waiting": float(waiting.mean()),
+            "total_power": cpu.power_consumption,
+            "idle_time": cpu.idle_time
+        }
+
     total_turnaround = sum(p.finish_time - p.arrival_time for p in completed_processes)
     total_waiting = sum((p.finish_time - p.arrival_time - p.burst_time) for p in completed_processes)
     
@@ -15,15 +26,50 @@ def calculate_metrics(completed_processes, cpu):
         "idle_time": cpu.idle_time
     }
 
-def simulate_round_robin(processes, time_quantum):
+def simulate_round_robin(processes, time_quantum, cpu=None, cache=None):
     if not processes:
         raise ValueError("Process list is empty")
     if time_quantum <= 0:
         raise ValueError("Time quantum must be positive")
 
     logging.info("Starting simulation...")
-    cpu = CPU()
-    completed_processes = round_robin_scheduling(processes, time_quantum, cpu)
+    if cpu is None:
+        cpu = CPU()
+
+    # A cache (see cache.SimulationCache) serves repeated runs of the same
+    # workload and parameters; only runs from a clean state qualify
+    key = None
+    completed_processes = None
+    if cache is not None and hasattr(processes, "__len__"):
+        from cache import is_fresh, simulation_key
+        if is_fresh(processes, cpu):
+            key = simulation_key(processes, cpu, "rr", time_quantum=time_quantum)
+            completed_processes = cache.load(key, processes, cpu)
+            if completed_processes is not None:
+                logging.info("Loaded simulation from cache")
+
+    if completed_processes is None:
+        completed_processes = round_robin_scheduling(processes, time_quantum, cpu)
+        if key is not None:
+            cache.store(key, processes, completed_processes, cpu)
+
+    metrics = calculate_metrics(completed_processes, cpu)
+    logging.info(f"Average Turnaround Time: {metrics['avg_turnaround']:.2f}")
+    logging.info(f"Average Waiting Time: {metrics['avg_waiting']:.2f}")
+    logging.info(f"Total Power: {metrics['total_power']:.2f} Joules")
+    logging.info(f"Idle Time: {metrics['idle_time']} units")
+
+    return completed_processes, cpu
+
+def simulate(processes, policy="rr", cpu=None, **options):
+    if not processes:
+        raise ValueError("Process list is empty")
+
+    scheduling_policy = make_policy(policy, **options) if isinstance(policy, str) else policy
+    logging.info(f"Starting {scheduling_policy.name} simulation...")
+    if cpu is None:
+        cpu = CPU()
+    completed_processes = policy_scheduling(processes, scheduling_policy, cpu)
 
     metrics = calculate_metrics(completed_processes, cpu)
     logging.info(f"Average Turnaround Time: {metrics['avg_turnaround']:.2f}")
@@ -31,4 +77,23 @@ def simulate_round_robin(processes, time_quantum):
     logging.info(f"Total Power: {metrics['total_power']:.2f} Joules")
     logging.info(f"Idle Time: {metrics['idle_time']} units")
 
-    return completed_processes, cpu
\ No newline at end of file
+    return completed_processes, cpu
+
+def simulate_online(processes, policy="rr", cpu=None, **options):
+    # Like simulate, but completed processes are folded into an
+    # OnlineMetrics accumulator and dropped instead of being returned.
+    scheduling_policy = make_policy(policy, **options) if isinstance(policy, str) else policy
+    logging.info(f"Starting {scheduling_policy.name} simulation...")
+    if cpu is None:
+        cpu = CPU()
+    metrics = OnlineMetrics()
+    policy_scheduling(processes, scheduling_policy, cpu, on_complete=metrics.observe)
+
+    summary = metrics.summary(cpu)
+    logging.info(f"Processes: {summary['count']}")
+    logging.info(f"Turnaround mean/p95/p99: {summary['avg_turnaround']:.2f} / "
+                 f"{summary['p95_turnaround']:.2f} / {summary['p99_turnaround']:.2f}")
+    logging.info(f"Total Power: {summary['total_power']:.2f} Joules")
+    logging.info(f"Idle Time: {summary['idle_time']} units")
+
+    return metrics, cpu
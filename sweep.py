@@ -0,0 +1,111 @@
+# sweep.py
+import argparse
+import csv
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Sequence
+from scheduler import CPU, Process, round_robin_scheduling
+from simulation import calculate_metrics
+from governors import GOVERNORS
+from workload import load_processes, process_records
+
+PARAMETERS = ("time_quantum", "base_power", "max_frequency", "min_frequency", "governor")
+DEFAULTS = {"time_quantum": [3], "base_power": [100.0], "max_frequency": [3.0], "min_frequency": [1.0],
+            "governor": ["priority"]}
+
+# Workload columns, installed once per worker process by _init_worker
+_workload = None
+
+
+def _init_worker(columns):
+    global _workload
+    _workload = columns
+
+
+def _run_point(params: Dict) -> Dict:
+    processes = [Process(*record) for record in zip(*_workload)]
+    cpu = CPU(
+        base_power=params["base_power"],
+        max_frequency=params["max_frequency"],
+        min_frequency=params["min_frequency"],
+        history="none",
+        governor=params["governor"]
+    )
+    completed = round_robin_scheduling(processes, params["time_quantum"], cpu)
+    return {**params, **calculate_metrics(completed, cpu)}
+
+
+def parameter_grid(grid: Dict[str, Sequence]) -> List[Dict]:
+    unknown = set(grid) - set(PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {', '.join(sorted(unknown))}")
+
+    axes = [list(grid.get(name) or DEFAULTS[name]) for name in PARAMETERS]
+    points = [dict(zip(PARAMETERS, values)) for values in itertools.product(*axes)]
+    for point in points:
+        if point["time_quantum"] <= 0:
+            raise ValueError("Time quantum must be positive")
+        if point["max_frequency"] <= 0 or point["min_frequency"] <= 0:
+            raise ValueError("Frequencies must be positive")
+        if point["min_frequency"] > point["max_frequency"]:
+            raise ValueError(f"Minimum frequency {point['min_frequency']} exceeds maximum frequency "
+                             f"{point['max_frequency']}")
+        if point["governor"] not in GOVERNORS:
+            raise ValueError(f"Unknown frequency governor: {point['governor']}")
+    return points
+
+
+def sweep(processes, grid: Dict[str, Sequence], max_workers: int = None, chunksize: int = None) -> List[Dict]:
+    if not processes:
+        raise ValueError("Process list is empty")
+
+    columns = tuple(zip(*process_records(processes)))
+    points = parameter_grid(grid)
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers == 1 or len(points) == 1:
+        _init_worker(columns)
+        return [_run_point(point) for point in points]
+
+    # The workload travels once per worker through the initializer, not
+    # once per task; tasks only carry their parameter dict.
+    if chunksize is None:
+        chunksize = max(1, len(points) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(columns,)) as pool:
+        return list(pool.map(_run_point, points, chunksize=chunksize))
+
+
+def write_table(rows: List[Dict], out):
+    if not rows:
+        return
+    writer = csv.DictWriter(out, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep round robin simulations over a parameter grid")
+    parser.add_argument("workload", help="JSON workload file (GUI export format)")
+    parser.add_argument("--time-quantum", type=int, nargs="+", default=DEFAULTS["time_quantum"])
+    parser.add_argument("--base-power", type=float, nargs="+", default=DEFAULTS["base_power"])
+    parser.add_argument("--max-frequency", type=float, nargs="+", default=DEFAULTS["max_frequency"])
+    parser.add_argument("--min-frequency", type=float, nargs="+", default=DEFAULTS["min_frequency"])
+    parser.add_argument("--governor", nargs="+", choices=sorted(GOVERNORS), default=DEFAULTS["governor"])
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--output", help="CSV file to write (default: stdout)")
+    args = parser.parse_args(argv)
+
+    grid = {name: getattr(args, name) for name in PARAMETERS}
+    rows = sweep(load_processes(args.workload), grid, max_workers=args.workers)
+
+    if args.output:
+        with open(args.output, 'w', newline='') as f:
+            write_table(rows, f)
+    else:
+        write_table(rows, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
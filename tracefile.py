@@ -0,0 +1,276 @@
+# tracefile.py
+import contextlib
+import json
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from history import HistoryRecorder, series_arrays, slice_summaries
+
+# Layout: a 64-byte header (magic, version, directory offset and length),
+# then fixed-width little-endian columns, each aligned to 64 bytes, then a
+# JSON directory giving every column's dtype, offset and length. Columns
+# can be opened with numpy.memmap without reading the rest of the file.
+TRACE_MAGIC = b"CPUSCHED"
+TRACE_VERSION = 1
+_HEADER = struct.Struct("<8sIIQQ")
+_ALIGN = 64
+
+# Processes are stored in completion order (unfinished ones last);
+# input_order maps each row back to its position in the original workload
+PROCESS_COLUMNS = {
+    "pid": "<i8",
+    "arrival_time": "<i8",
+    "burst_time": "<i8",
+    "priority": "<i8",
+    "start_time": "<i8",
+    "finish_time": "<i8",
+    "remaining_time": "<i8",
+    "energy": "<f8",
+    "input_order": "<i8",
+}
+# Execution slices sorted by start time; slice_row indexes the process rows
+SLICE_COLUMNS = {"slice_row": "<i4", "slice_start": "<i8", "slice_length": "<i8"}
+# Runs at summary level keep no slices, only these per-process columns
+SUMMARY_COLUMNS = {"first_start": "<i8", "last_finish": "<i8", "slice_count": "<i8"}
+SERIES_COLUMNS = {"power_times": "<f8", "power_values": "<f8", "frequency_times": "<f8", "frequency_values": "<f8"}
+
+NO_DEADLINE = np.iinfo(np.int64).min
+
+
+def _process_columns(processes) -> Tuple[Dict[str, np.ndarray], np.ndarray, np.ndarray, np.ndarray]:
+    # Per-process columns in input order plus every slice as (row, start, end)
+    summaries = slice_summaries(processes)
+    if hasattr(processes, "arrival_order"):
+        columns = {name: getattr(processes, name) for name in PROCESS_COLUMNS if name != "input_order"}
+        rows, starts, ends = processes.slices()
+    else:
+        columns = {name: np.array([getattr(p, name) for p in processes], dtype=dtype)
+                   for name, dtype in PROCESS_COLUMNS.items() if name != "input_order"}
+        if any(getattr(p, "deadline", None) is not None for p in processes):
+            columns["deadline"] = np.array([NO_DEADLINE if getattr(p, "deadline", None) is None else p.deadline
+                                            for p in processes], dtype=np.int64)
+        if summaries is None:
+            counts = [len(p.execution_history) for p in processes]
+            flat = np.fromiter((t for p in processes for interval in p.execution_history for t in interval),
+                               dtype=np.int64, count=2 * sum(counts))
+            rows = np.repeat(np.arange(len(processes), dtype=np.int64), counts)
+            starts, ends = flat[0::2], flat[1::2]
+        else:
+            rows = starts = ends = np.empty(0, dtype=np.int64)
+    if summaries is not None:
+        columns.update(zip(SUMMARY_COLUMNS, summaries))
+    return columns, rows, starts, ends
+
+
+def _completion_order(processes, completed) -> np.ndarray:
+    size = len(processes)
+    if completed is None:
+        return np.arange(size, dtype=np.int64)
+    if hasattr(completed, "indices"):
+        finished = np.array(completed.indices, dtype=np.int64)
+    elif hasattr(processes, "arrival_order"):
+        finished = np.array([row.index for row in completed], dtype=np.int64)
+    else:
+        position = {id(p): i for i, p in enumerate(processes)}
+        finished = np.array([position[id(p)] for p in completed], dtype=np.int64)
+    seen = np.zeros(size, dtype=bool)
+    seen[finished] = True
+    return np.concatenate([finished, np.flatnonzero(~seen)])
+
+
+def _cpu_metadata(cpu) -> Dict:
+    from cache import cpu_params
+    cores = getattr(cpu, "cores", [cpu])
+    return {
+        "params": cpu_params(cores[0]),
+        "cores": len(cores),
+        "power_consumption": cpu.power_consumption,
+        "idle_time": cpu.idle_time,
+        "switches": sum(core.switches for core in cores),
+    }
+
+
+def write_trace(filepath: str, processes, cpu=None, completed=None, metadata: Optional[Dict] = None):
+    """Write a workload and, if given, its run to ``filepath``.
+
+    ``processes`` is a list of Process objects or a ProcessTable in input
+    order and ``completed`` the scheduler's result. Power and frequency
+    histories are stored for single-core CPUs that kept them; runs at
+    summary level store per-process slice summaries instead of slices.
+    """
+    columns, rows, starts, ends = _process_columns(processes)
+    order = _completion_order(processes, completed)
+    position = np.empty(len(order), dtype=np.int64)
+    position[order] = np.arange(len(order))
+
+    data = {name: np.asarray(columns[name])[order] for name in columns}
+    data["input_order"] = order
+    by_start = np.argsort(starts, kind="stable")
+    data["slice_row"] = position[rows[by_start]]
+    data["slice_start"] = starts[by_start]
+    data["slice_length"] = (ends - starts)[by_start]
+
+    info = {"processes": len(order), "completed": None if completed is None else len(completed)}
+    if len(starts):
+        info["time_span"] = [int(starts.min()), int(ends.max())]
+        info["max_slice_length"] = int(data["slice_length"].max())
+    elif "slice_count" in data and np.any(data["slice_count"]):
+        ran = data["slice_count"] > 0
+        info["time_span"] = [int(data["first_start"][ran].min()), int(data["last_finish"][ran].max())]
+    if cpu is not None:
+        info["cpu"] = _cpu_metadata(cpu)
+        if not hasattr(cpu, "cores"):
+            for prefix in ("power", "frequency"):
+                times, values = series_arrays(getattr(cpu, f"{prefix}_history"))
+                if len(times):
+                    data[f"{prefix}_times"] = times
+                    data[f"{prefix}_values"] = values
+    info.update(metadata or {})
+
+    dtypes = {**PROCESS_COLUMNS, "deadline": "<i8", **SUMMARY_COLUMNS, **SLICE_COLUMNS, **SERIES_COLUMNS}
+    # Write next to the target and rename, so readers never map half a file
+    tmp = f"{filepath}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(bytes(_ALIGN))
+            entries = {}
+            for name, values in data.items():
+                column = np.ascontiguousarray(values, dtype=dtypes[name])
+                f.write(bytes(-f.tell() % _ALIGN))
+                entries[name] = {"dtype": dtypes[name], "offset": f.tell(), "length": len(column)}
+                f.write(column.tobytes())
+            index = json.dumps({"columns": entries, "metadata": info}).encode()
+            index_offset = f.tell()
+            f.write(index)
+            f.seek(0)
+            f.write(_HEADER.pack(TRACE_MAGIC, TRACE_VERSION, 0, index_offset, len(index)))
+        os.replace(tmp, filepath)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp)
+        raise
+
+
+class MappedSeries:
+    """A power or frequency history backed by two mapped columns."""
+
+    def __init__(self, times, values):
+        self.times = times
+        self.values = values
+
+    def arrays(self):
+        return self.times, self.values
+
+    def __len__(self):
+        return len(self.times)
+
+    def __iter__(self):
+        return zip(self.times.tolist(), self.values.tolist())
+
+
+class RecordedCPU:
+    """CPU totals and histories of a stored run, for code that reads a CPU."""
+
+    def __init__(self, trace: "TraceFile"):
+        cpu = trace.metadata.get("cpu", {})
+        params = cpu.get("params", {})
+        self.base_power = params.get("base_power", 100.0)
+        self.max_frequency = params.get("max_frequency", 3.0)
+        self.min_frequency = params.get("min_frequency", 1.0)
+        self.history = HistoryRecorder(params.get("history", "full") if trace.has("power_times") else "none")
+        self.power_consumption = cpu.get("power_consumption", 0.0)
+        self.idle_time = cpu.get("idle_time", 0)
+        self.switches = cpu.get("switches", 0)
+        self.switch_energy = params.get("switch_energy", 0.0)
+        self.power_history = MappedSeries(trace.column("power_times"), trace.column("power_values"))
+        self.frequency_history = MappedSeries(trace.column("frequency_times"), trace.column("frequency_values"))
+
+
+class TraceFile:
+    """Read side of write_trace. Nothing is loaded until a column is used.
+
+    Columns come back as read-only numpy.memmap arrays, so plotting and
+    analysis of a multi-GB trace only touch the pages they read. A trace
+    also reads like a finished ProcessTableView (``column()``, per-process
+    attributes in completion order) and ``cpu()`` like the CPU that ran it.
+    """
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        with open(filepath, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:len(TRACE_MAGIC)] != TRACE_MAGIC:
+                raise ValueError(f"Not a scheduler trace file: {filepath}")
+            _, self.version, _, index_offset, index_length = _HEADER.unpack(header)
+            if self.version > TRACE_VERSION:
+                raise ValueError(f"Unsupported trace file version {self.version}")
+            f.seek(index_offset)
+            index = json.loads(f.read(index_length))
+        self._columns = index["columns"]
+        self.metadata = index["metadata"]
+        self._mapped = {}
+
+    def has(self, name: str) -> bool:
+        return name in self._columns
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._mapped:
+            entry = self._columns.get(name)
+            if entry is None:
+                dtype = {**PROCESS_COLUMNS, **SUMMARY_COLUMNS, **SLICE_COLUMNS, **SERIES_COLUMNS}.get(name)
+                if dtype is None:
+                    raise KeyError(name)
+                self._mapped[name] = np.empty(0, dtype=dtype)
+            elif entry["length"] == 0:
+                # numpy.memmap refuses empty mappings
+                self._mapped[name] = np.empty(0, dtype=entry["dtype"])
+            else:
+                self._mapped[name] = np.memmap(self.filepath, dtype=entry["dtype"], mode="r",
+                                               offset=entry["offset"], shape=(entry["length"],))
+        return self._mapped[name]
+
+    def __getattr__(self, name):
+        if name.startswith("_") or (name not in PROCESS_COLUMNS and name not in SUMMARY_COLUMNS
+                                    and name != "deadline"):
+            raise AttributeError(name)
+        return self.column(name)
+
+    def __len__(self):
+        return self.metadata["processes"]
+
+    def slice_columns(self):
+        # (pids, row, start, width) like visualization.gantt_segments, all mapped
+        return self.column("pid"), self.column("slice_row"), self.column("slice_start"), self.column("slice_length")
+
+    def slice_summary(self):
+        # (first_start, last_finish, count) per row of a summary-level run, else None
+        if not self.has("slice_count"):
+            return None
+        return tuple(self.column(name) for name in SUMMARY_COLUMNS)
+
+    def time_span(self) -> Optional[Tuple[int, int]]:
+        span = self.metadata.get("time_span")
+        return tuple(span) if span else None
+
+    @property
+    def max_slice_length(self) -> int:
+        return self.metadata.get("max_slice_length", 0)
+
+    def cpu(self) -> RecordedCPU:
+        return RecordedCPU(self)
+
+    def records(self) -> List[Tuple[int, int, int, int]]:
+        # The workload in its original order, as ProcessTable.from_records takes it
+        order = np.argsort(self.column("input_order"), kind="stable")
+        return list(zip(*(self.column(name)[order].tolist()
+                          for name in ("pid", "arrival_time", "burst_time", "priority"))))
+
+    def close(self):
+        self._mapped.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,282 @@
+# tracing.py
+import struct
+from array import array
+from collections import namedtuple
+from time import perf_counter
+from typing import Dict, Iterator, List
+
+# Event kinds
+ARRIVAL, DISPATCH, PREEMPT, COMPLETE, IDLE, FREQUENCY = range(6)
+EVENT_NAMES = ("arrival", "dispatch", "preempt", "complete", "idle", "frequency")
+
+# value is the elapsed time for dispatch and idle, the remaining time for
+# arrival/preempt/complete and the new frequency for frequency
+TraceEvent = namedtuple("TraceEvent", "kind time pid core value")
+
+BINARY_MAGIC = b"CPUTRACE"
+BINARY_VERSION = 1
+_RECORD = struct.Struct("<BHqqd")
+
+
+class RingBufferSink:
+    """Keeps the most recent ``capacity`` events in preallocated arrays."""
+
+    def __init__(self, capacity: int = 65536):
+        if capacity <= 0:
+            raise ValueError("Ring buffer capacity must be positive")
+        self.capacity = capacity
+        self.count = 0
+        self._kind = array("B", bytes(capacity))
+        self._core = array("H", [0]) * capacity
+        self._time = array("q", [0]) * capacity
+        self._pid = array("q", [0]) * capacity
+        self._value = array("d", [0.0]) * capacity
+
+    def write(self, kind, time, pid, core, value):
+        slot = self.count % self.capacity
+        self._kind[slot] = kind
+        self._time[slot] = time
+        self._pid[slot] = pid
+        self._core[slot] = core
+        self._value[slot] = value
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def events(self) -> List[TraceEvent]:
+        first = max(0, self.count - self.capacity)
+        return [self._event(i % self.capacity) for i in range(first, self.count)]
+
+    def _event(self, slot):
+        return TraceEvent(self._kind[slot], self._time[slot], self._pid[slot], self._core[slot], self._value[slot])
+
+    def close(self):
+        pass
+
+
+class BinaryFileSink:
+    """Fixed-size little-endian records behind a magic/version header."""
+
+    def __init__(self, filepath: str, buffer_events: int = 8192):
+        self.file = open(filepath, "wb")
+        self.file.write(BINARY_MAGIC + struct.pack("<H", BINARY_VERSION))
+        self.buffer_events = buffer_events
+        self._buffer = []
+
+    def write(self, kind, time, pid, core, value):
+        self._buffer.append(_RECORD.pack(kind, core, time, pid, value))
+        if len(self._buffer) >= self.buffer_events:
+            self.flush()
+
+    def flush(self):
+        self.file.write(b"".join(self._buffer))
+        self._buffer.clear()
+
+    def close(self):
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+def read_binary_trace(filepath: str) -> Iterator[TraceEvent]:
+    with open(filepath, "rb") as f:
+        header = f.read(len(BINARY_MAGIC) + 2)
+        if header[:len(BINARY_MAGIC)] != BINARY_MAGIC:
+            raise ValueError(f"Not a binary scheduler trace: {filepath}")
+        version, = struct.unpack("<H", header[len(BINARY_MAGIC):])
+        if version != BINARY_VERSION:
+            raise ValueError(f"Unsupported trace version {version}")
+        while True:
+            chunk = f.read(_RECORD.size * 8192)
+            if not chunk:
+                break
+            for kind, core, time, pid, value in _RECORD.iter_unpack(chunk):
+                yield TraceEvent(kind, time, pid, core, value)
+
+
+class ChromeTraceSink:
+    """Streams Chrome trace-event JSON (chrome://tracing, Perfetto).
+
+    Each core is a thread lane with dispatch and idle spans, arrivals and
+    completions are instant events and frequency is a counter track.
+    ``time_scale`` converts simulation time units to microseconds.
+    """
+
+    def __init__(self, filepath: str, time_scale: float = 1000.0):
+        self.file = open(filepath, "w")
+        self.file.write("[\n")
+        self.time_scale = time_scale
+        self._first = True
+        self._cores = set()
+
+    def _put(self, event: str):
+        # Events are formatted by hand; json.dumps per event dominates big traces
+        if self._first:
+            self._first = False
+            self.file.write(event)
+        else:
+            self.file.write(",\n" + event)
+
+    def write(self, kind, time, pid, core, value):
+        if core not in self._cores:
+            self._cores.add(core)
+            self._put(f'{{"name":"thread_name","ph":"M","pid":0,"tid":{core},"args":{{"name":"core {core}"}}}}')
+        ts = time * self.time_scale
+        if kind == DISPATCH:
+            self._put(f'{{"name":"P{pid}","ph":"X","ts":{ts},"dur":{value * self.time_scale},"pid":0,'
+                      f'"tid":{core},"args":{{"pid":{pid}}}}}')
+        elif kind == IDLE:
+            self._put(f'{{"name":"idle","ph":"X","ts":{ts},"dur":{value * self.time_scale},"pid":0,"tid":{core}}}')
+        elif kind == FREQUENCY:
+            self._put(f'{{"name":"frequency","ph":"C","ts":{ts},"pid":0,"args":{{"core {core}":{value}}}}}')
+        else:
+            self._put(f'{{"name":"{EVENT_NAMES[kind]} P{pid}","ph":"i","s":"t","ts":{ts},"pid":0,'
+                      f'"tid":{core},"args":{{"pid":{pid},"remaining_time":{value}}}}}')
+
+    def close(self):
+        if not self.file.closed:
+            self.file.write("\n]\n")
+            self.file.close()
+
+
+class Tracer:
+    """Fans scheduler events out to sinks and times each engine phase.
+
+    Engines wrap their arrival feed and CPU through traced_feed and
+    traced_cpu, so an untraced run executes exactly the same loop as
+    before. Phase times are wall-clock seconds: ``admit``, ``execute``,
+    ``idle`` and ``complete`` are measured around those calls,
+    ``tracing`` is the time spent in sinks and ``scheduling`` is the rest
+    of the loop (queue operations and bookkeeping).
+    """
+
+    def __init__(self, *sinks):
+        self.sinks = list(sinks)
+        self.seconds: Dict[str, float] = {}
+        self.calls: Dict[str, int] = {}
+        self._started = None
+        self.total = 0.0
+
+    def emit(self, kind: int, time: int, pid: int = -1, core: int = 0, value: float = 0.0):
+        for sink in self.sinks:
+            sink.write(kind, time, pid, core, value)
+
+    def _add(self, phase: str, seconds: float):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def start(self):
+        self._started = perf_counter()
+
+    def stop(self):
+        if self._started is not None:
+            self.total += perf_counter() - self._started
+            self._started = None
+
+    def traced_feed(self, feed):
+        return _TracedFeed(self, feed)
+
+    def traced_cpu(self, cpu, core: int = 0):
+        return _TracedCPU(self, cpu, core)
+
+    def timed(self, phase: str, function):
+        def wrapper(*args):
+            start = perf_counter()
+            try:
+                return function(*args)
+            finally:
+                self._add(phase, perf_counter() - start)
+        return wrapper
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        phases = {name: {"seconds": seconds, "calls": self.calls[name]} for name, seconds in self.seconds.items()}
+        measured = sum(self.seconds.values())
+        phases["scheduling"] = {"seconds": max(0.0, self.total - measured), "calls": 1}
+        phases["total"] = {"seconds": self.total, "calls": 1}
+        return phases
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _TracedFeed:
+    __slots__ = ("_tracer", "_feed")
+
+    def __init__(self, tracer: Tracer, feed):
+        self._tracer = tracer
+        self._feed = feed
+
+    @property
+    def next_time(self):
+        return self._feed.next_time
+
+    def completion_list(self):
+        return self._feed.completion_list()
+
+    def admit(self, now):
+        tracer = self._tracer
+        start = perf_counter()
+        batch = self._feed.admit(now)
+        middle = perf_counter()
+        tracer._add("admit", middle - start)
+        if tracer.sinks:
+            for process in batch:
+                tracer.emit(ARRIVAL, process.arrival_time, process.pid, value=process.remaining_time)
+            tracer._add("tracing", perf_counter() - middle)
+        return batch
+
+
+class _TracedCPU:
+    # Proxy that times and traces execute/idle; everything else passes through
+    __slots__ = ("_tracer", "_cpu", "_core")
+
+    def __init__(self, tracer: Tracer, cpu, core: int):
+        self._tracer = tracer
+        self._cpu = cpu
+        self._core = core
+
+    def __getattr__(self, name):
+        return getattr(self._cpu, name)
+
+    def execute(self, process, time_units, current_time):
+        tracer, cpu = self._tracer, self._cpu
+        frequency = cpu.current_frequency
+        start = perf_counter()
+        elapsed = cpu.execute(process, time_units, current_time)
+        middle = perf_counter()
+        tracer._add("execute", middle - start)
+        if tracer.sinks:
+            core, pid = self._core, process.pid
+            if cpu.current_frequency != frequency:
+                tracer.emit(FREQUENCY, current_time, pid, core, cpu.current_frequency)
+            tracer.emit(DISPATCH, current_time, pid, core, elapsed)
+            kind = PREEMPT if process.remaining_time > 0 else COMPLETE
+            tracer.emit(kind, current_time + elapsed, pid, core, process.remaining_time)
+            tracer._add("tracing", perf_counter() - middle)
+        return elapsed
+
+    def idle(self, time_units, current_time):
+        tracer = self._tracer
+        start = perf_counter()
+        self._cpu.idle(time_units, current_time)
+        middle = perf_counter()
+        tracer._add("idle", middle - start)
+        if tracer.sinks:
+            tracer.emit(IDLE, current_time, -1, self._core, time_units)
+            tracer._add("tracing", perf_counter() - middle)
+
+
+def format_report(report: Dict[str, Dict[str, float]]) -> str:
+    total = report["total"]["seconds"] or 1.0
+    lines = [f"{'phase':<12} {'seconds':>10} {'share':>7} {'calls':>10}"]
+    for name, entry in sorted(report.items(), key=lambda item: (item[0] == "total", -item[1]["seconds"])):
+        lines.append(f"{name:<12} {entry['seconds']:>10.4f} {entry['seconds'] / total:>7.1%} {entry['calls']:>10,}")
+    return "\n".join(lines)
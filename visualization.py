@@ -1,17 +1,237 @@
 #  visualization.py
-import matplotlib.pyplot as plt
 from typing import List
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+from matplotlib.image import AxesImage
+from matplotlib.ticker import FuncFormatter, MaxNLocator
 from scheduler import Process, CPU
+from history import series_arrays, slice_summaries
+
+# Above this many processes the Gantt chart is drawn as a single collection,
+# and above this many visible slices that collection becomes an image
+GANTT_COLLECTION_LIMIT = 200
+GANTT_SLICE_LIMIT = 50_000
+
+
+def decimate_step(times, values, t0: float, t1: float, buckets: int):
+    # Min/max decimation of a step series to the [t0, t1] window: each of
+    # `buckets` time columns keeps its first, min, max and last sample.
+    lo = max(int(np.searchsorted(times, t0, side='right')) - 1, 0)
+    hi = min(int(np.searchsorted(times, t1, side='left')) + 1, len(times))
+    t = times[lo:hi]
+    v = values[lo:hi]
+    if len(t) <= 4 * buckets:
+        return t, v
+
+    edges = np.searchsorted(t, np.linspace(t[0], t[-1], buckets + 1)[:-1], side='left')
+    starts = np.unique(edges)
+    lasts = np.append(starts[1:], len(t)) - 1
+    out_t = np.column_stack((t[starts], t[starts], t[starts], t[lasts])).ravel()
+    out_v = np.column_stack((
+        v[starts],
+        np.minimum.reduceat(v, starts),
+        np.maximum.reduceat(v, starts),
+        v[lasts]
+    )).ravel()
+    return out_t, out_v
+
+
+class DecimatedStep:
+    """Post-step line that is re-decimated to the view whenever x limits change.
+
+    Zooming or panning (e.g. through a navigation toolbar) re-samples the
+    full series for the new window, so detail reappears as the view narrows.
+    """
+
+    def __init__(self, ax, times, values, max_points: int = None, **kwargs):
+        self.ax = ax
+        self.times = np.asarray(times, dtype=float)
+        self.values = np.asarray(values, dtype=float)
+        self.max_points = max_points
+        self.line, = ax.plot(*self._window(self.times[0], self.times[-1]), drawstyle='steps-post', **kwargs)
+        # A plain function keeps this object alive; bound methods are held weakly
+        ax.callbacks.connect('xlim_changed', lambda axes: self.update())
+
+    def _window(self, t0, t1):
+        buckets = self.max_points or max(int(self.ax.bbox.width), 100)
+        return decimate_step(self.times, self.values, t0, t1, buckets)
+
+    def update(self):
+        self.line.set_data(*self._window(*self.ax.get_xlim()))
+        self.ax.figure.canvas.draw_idle()
+
+
+def plot_step(ax, series, **kwargs):
+    times, values = series_arrays(series)
+    if len(times) == 0:
+        return None
+    return DecimatedStep(ax, times, values, **kwargs)
+
+
+def _span_segments(pids, first_start, last_finish, count):
+    # Summary-level runs keep no slices: one bar per process that ran, from
+    # its first start to its last finish
+    rows = np.flatnonzero(count)
+    return pids, rows, first_start[rows], (last_finish - first_start)[rows]
+
+
+def gantt_segments(processes):
+    # (pids, row, start, width) arrays for every execution slice, rows
+    # numbered in the order the processes are given
+    if hasattr(processes, "table"):
+        summaries = processes.table.slice_summary()
+        if summaries is not None:
+            indices = np.array(processes.indices, dtype=np.int64)
+            return _span_segments(processes.table.pid[indices], *(column[indices] for column in summaries))
+    else:
+        summaries = slice_summaries(processes)
+        if summaries is not None:
+            pids = processes.pid if hasattr(processes, "slice_summary") else np.array([p.pid for p in processes])
+            return _span_segments(pids, *summaries)
+
+    if hasattr(processes, "slice_columns"):
+        # tracefile.TraceFile: mapped columns, already sorted by start
+        return processes.slice_columns()
+    if hasattr(processes, "table"):
+        # ProcessTableView: read the shared slice log in one go
+        table = processes.table
+        indices = np.array(processes.indices, dtype=np.int64)
+        rows, starts, ends = table.slices()
+        position = np.full(len(table), -1, dtype=np.int64)
+        position[indices] = np.arange(len(indices))
+        y = position[rows]
+        keep = y >= 0
+        return table.pid[indices], y[keep], starts[keep], (ends - starts)[keep]
+
+    pids, ys, starts, widths = [], [], [], []
+    for row, process in enumerate(processes):
+        pids.append(process.pid)
+        for start, end in process.execution_history:
+            ys.append(row)
+            starts.append(start)
+            widths.append(end - start)
+    return np.array(pids), np.array(ys, dtype=np.int64), np.array(starts), np.array(widths)
+
+
+class DecimatedGantt:
+    """Gantt slices for large charts, rebuilt for the visible x range.
+
+    Up to GANTT_SLICE_LIMIT visible slices are drawn as one PolyCollection;
+    beyond that the view is rasterised into a pixel-sized occupancy image.
+    """
+
+    def __init__(self, ax, rows: int, y, starts, widths, color='skyblue', alpha=None,
+                 presorted: bool = False, max_width: int = None):
+        # Slices already sorted by start (e.g. memory-mapped trace columns)
+        # are used as they are, so only the visible window is ever read
+        if not presorted:
+            order = np.argsort(starts, kind='stable')
+            y, starts, widths = y[order], starts[order], widths[order]
+        self.ax = ax
+        self.rows = rows
+        self.y = y
+        self.starts = starts
+        self.widths = widths
+        if max_width is None:
+            max_width = widths.max() if len(widths) else 0
+        self.max_width = max_width
+        self.rgba = to_rgba(color, alpha)
+
+        self.bars = PolyCollection([], facecolors=color, edgecolors='none', alpha=alpha)
+        ax.add_collection(self.bars)
+        self.image = AxesImage(ax, interpolation='nearest')
+        ax.add_image(self.image)
+        ax.callbacks.connect('xlim_changed', lambda axes: self.update())
+
+    def update(self):
+        t0, t1 = sorted(self.ax.get_xlim())
+        lo = int(np.searchsorted(self.starts, t0 - self.max_width, side='left'))
+        hi = int(np.searchsorted(self.starts, t1, side='right'))
+        y, starts = self.y[lo:hi], self.starts[lo:hi]
+        ends = starts + self.widths[lo:hi]
+
+        if len(starts) <= GANTT_SLICE_LIMIT:
+            self.bars.set_verts(_bar_verts(y, starts, ends))
+            self.bars.set_visible(True)
+            self.image.set_visible(False)
+        else:
+            self.image.set_data(self._occupancy(y, starts, ends, t0, t1))
+            self.image.set_extent((t0, t1, self.rows - 0.5, -0.5))
+            self.image.set_visible(True)
+            self.bars.set_visible(False)
+        self.ax.figure.canvas.draw_idle()
+
+    def _occupancy(self, y, starts, ends, t0, t1):
+        width = max(int(self.ax.bbox.width), 100)
+        height = max(min(self.rows, int(self.ax.bbox.height)), 1)
+        scale = width / (t1 - t0) if t1 > t0 else 0.0
+        first = np.clip(np.floor((starts - t0) * scale), 0, width - 1).astype(np.int64)
+        last = np.clip(np.ceil((ends - t0) * scale), first + 1, width).astype(np.int64)
+        band = y.astype(np.int64) * height // self.rows
+
+        # Mark every covered pixel with a +1/-1 difference array per band
+        marks = np.zeros((height, width + 1), dtype=np.int64)
+        np.add.at(marks, (band, first), 1)
+        np.add.at(marks, (band, last), -1)
+        covered = np.cumsum(marks[:, :-1], axis=1) > 0
+
+        image = np.zeros((height, width, 4))
+        image[covered] = self.rgba
+        return image
+
+
+def _bar_verts(y, starts, ends):
+    verts = np.empty((len(y), 4, 2))
+    verts[:, 0, 0] = verts[:, 1, 0] = starts
+    verts[:, 2, 0] = verts[:, 3, 0] = ends
+    verts[:, 0, 1] = verts[:, 3, 1] = y - 0.4
+    verts[:, 1, 1] = verts[:, 2, 1] = y + 0.4
+    return verts
+
+
+def plot_gantt(ax, processes, color='skyblue', edgecolor='black', alpha=None):
+    pids, y, starts, widths = gantt_segments(processes)
+    span = processes.time_span() if hasattr(processes, "time_span") else None
+    if span:
+        ax.set_xlim(*span)
+    elif len(starts):
+        ax.set_xlim(starts.min(), (starts + widths).max())
+    ax.set_ylim(-0.5, len(pids) - 0.5)
+
+    if len(pids) <= GANTT_COLLECTION_LIMIT:
+        # One PolyCollection per process
+        order = np.argsort(y, kind='stable')
+        bounds = np.searchsorted(y[order], np.arange(len(pids) + 1))
+        for row in range(len(pids)):
+            chosen = order[bounds[row]:bounds[row + 1]]
+            ax.broken_barh(np.column_stack((starts[chosen], widths[chosen])), (row - 0.4, 0.8),
+                           facecolors=color, edgecolors=edgecolor, alpha=alpha)
+        ax.set_yticks(range(len(pids)), [f'P{pid}' for pid in pids])
+        return None
+
+    # Too many rows for an artist each: draw slices in the visible range only
+    if hasattr(processes, "slice_columns") and processes.slice_summary() is None:
+        gantt = DecimatedGantt(ax, len(pids), y, starts, widths, color=color, alpha=alpha,
+                               presorted=True, max_width=processes.max_slice_length)
+    else:
+        gantt = DecimatedGantt(ax, len(pids), y, starts, widths, color=color, alpha=alpha)
+    gantt.update()
+    ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    ax.yaxis.set_major_formatter(FuncFormatter(
+        lambda value, _: f'P{pids[int(value)]}' if 0 <= value < len(pids) else ''
+    ))
+    return gantt
+
 
 def visualize_power_consumption(completed_processes: List[Process], cpu: CPU):
+    import matplotlib.pyplot as plt
     if not cpu.power_history:
         print("No power history data to visualize.")
         return
 
-    times, power = zip(*cpu.power_history)
-    
     plt.figure(figsize=(10, 5))
-    plt.step(times, power, where='post', label='Power (W)')
+    plot_step(plt.gca(), cpu.power_history, label='Power (W)')
     plt.xlabel('Time (units)')
     plt.ylabel('Power (Watts)')
     plt.title('CPU Power Consumption')
@@ -20,22 +240,13 @@ def visualize_power_consumption(completed_processes: List[Process], cpu: CPU):
     plt.show()
 
 def visualize_gantt_chart(completed_processes: List[Process]):
+    import matplotlib.pyplot as plt
     if not completed_processes:
         print("No processes to visualize.")
         return
 
     fig, ax = plt.subplots(figsize=(10, 5))
-    
-    for i, process in enumerate(completed_processes):
-        for start, end in process.execution_history:
-            ax.barh(
-                f'P{process.pid}',
-                end - start,
-                left=start,
-                color='skyblue',
-                edgecolor='black',
-                alpha=0.7
-            )
+    plot_gantt(ax, completed_processes, alpha=0.7)
     
     ax.set_xlabel('Time (units)')
     ax.set_ylabel('Processes')
@@ -45,14 +256,13 @@ def visualize_gantt_chart(completed_processes: List[Process]):
     plt.show()
 
 def visualize_frequency_usage(cpu: CPU):
+    import matplotlib.pyplot as plt
     if not cpu.frequency_history:
         print("No frequency data to visualize.")
         return
 
-    times, freq = zip(*cpu.frequency_history)
-    
     plt.figure(figsize=(10, 5))
-    plt.step(times, freq, where='post', label='Frequency (GHz)', color='orange')
+    plot_step(plt.gca(), cpu.frequency_history, label='Frequency (GHz)', color='orange')
     plt.xlabel('Time (units)')
     plt.ylabel('Frequency (GHz)')
     plt.title('CPU Frequency Scaling')
@@ -0,0 +1,62 @@
+# workload.py
+import csv
+import gzip
+import io
+import json
+from typing import Iterator, List, Sequence, Tuple
+from scheduler import Process
+
+# Field names follow the GUI export format
+FIELDS = ("pid", "arrival", "burst", "priority")
+
+
+def _open_text(filepath: str):
+    if filepath.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(filepath, "rb"), encoding="utf-8", newline="")
+    return open(filepath, "r", encoding="utf-8", newline="")
+
+
+def _trace_format(filepath: str) -> str:
+    name = filepath[:-3] if filepath.endswith(".gz") else filepath
+    for suffix in (".jsonl", ".ndjson", ".csv", ".json"):
+        if name.endswith(suffix):
+            return suffix.lstrip(".").replace("ndjson", "jsonl")
+    raise ValueError(f"Unsupported workload format: {filepath}")
+
+
+def _to_process(record) -> Process:
+    process = Process(int(record["pid"]), int(record["arrival"]), int(record["burst"]), int(record["priority"]))
+    deadline = record.get("deadline")
+    if deadline not in (None, ""):
+        process.deadline = int(deadline)
+    return process
+
+
+def iter_records(filepath: str) -> Iterator[dict]:
+    # Yields raw records from a JSON, JSONL or CSV trace, optionally gzipped.
+    # JSONL and CSV are read line by line; a JSON array is loaded whole.
+    trace_format = _trace_format(filepath)
+    with _open_text(filepath) as f:
+        if trace_format == "json":
+            yield from json.load(f)
+        elif trace_format == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+def iter_processes(filepath: str) -> Iterator[Process]:
+    # Lazy Process stream; a trace sorted by arrival time can be passed
+    # straight to the schedulers, which admit processes as time advances.
+    for record in iter_records(filepath):
+        yield _to_process(record)
+
+
+def load_processes(filepath: str) -> List[Process]:
+    return list(iter_processes(filepath))
+
+
+def process_records(processes: Sequence) -> List[Tuple[int, int, int, int]]:
+    return [(p.pid, p.arrival_time, p.burst_time, p.priority) for p in processes]